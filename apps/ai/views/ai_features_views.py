@@ -14,6 +14,7 @@ from django.db.models import Sum
 from django.utils import timezone
 from PIL import Image
 
+from apps.analytics.models import EventMetrics
 from apps.ai.utils.verification import (
     verify_event_authenticity,
     get_fraud_prevention_tips,
@@ -312,8 +313,9 @@ class OptimizePricingView(LoginRequiredMixin, View):
                     }
                 )
 
+            metrics = EventMetrics.objects.filter(event=event).first()
             demand_signals = {
-                "page_views": 150,
+                "page_views": metrics.page_views if metrics else 0,
                 "wishlist": 12,
                 "abandoned_carts": 5,
                 "shares": 8,
@@ -593,6 +595,8 @@ class EventConciergeView(LoginRequiredMixin, View):
             (attendance_count / tickets_sold * 100) if tickets_sold > 0 else 0
         )
 
+        metrics = EventMetrics.objects.filter(event=event).first()
+
         ticket_types = []
         for tt in event.ticket_types.all():
             sold = Ticket.objects.filter(
@@ -620,7 +624,7 @@ class EventConciergeView(LoginRequiredMixin, View):
                 "tickets_sold": tickets_sold,
                 "revenue": float(revenue),
                 "attendance_rate": round(attendance_rate, 1),
-                "conversion_rate": 0,
+                "conversion_rate": float(metrics.conversion_rate) if metrics else 0,
                 "days_until_event": days_until,
             },
             "ticket_types": ticket_types,
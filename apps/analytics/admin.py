@@ -1,6 +1,18 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
-from .models import DailyMetrics, EventMetrics, PaymentMetrics, OrganizationMetrics
+from .models import (
+    AttendeeIdentity,
+    DailyMetrics,
+    DailyRollup,
+    EventMetrics,
+    EventRevenueRollup,
+    EventSalesBucket,
+    ExchangeRate,
+    HourlyRollup,
+    OrganizationMetrics,
+    OrganizationRetention,
+    PaymentMetrics,
+)
 
 
 @admin.register(DailyMetrics)
@@ -62,3 +74,107 @@ class OrganizationMetricsAdmin(ModelAdmin):
     search_fields = ["organization__name"]
     readonly_fields = ["last_updated"]
     ordering = ["-last_updated"]
+
+
+@admin.register(EventRevenueRollup)
+class EventRevenueRollupAdmin(ModelAdmin):
+    list_display = [
+        "event",
+        "date",
+        "provider",
+        "currency",
+        "gross",
+        "fees",
+        "refunds",
+        "net",
+        "orders_count",
+    ]
+    list_filter = ["date", "provider", "currency"]
+    search_fields = ["event__title", "organization__name"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-date"]
+
+
+@admin.register(EventSalesBucket)
+class EventSalesBucketAdmin(ModelAdmin):
+    list_display = ["event", "ticket_type", "hour", "tickets", "gross", "orders"]
+    list_filter = ["hour"]
+    search_fields = ["event__title", "ticket_type__name"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-hour"]
+
+
+@admin.register(HourlyRollup)
+class HourlyRollupAdmin(ModelAdmin):
+    list_display = [
+        "event",
+        "hour",
+        "provider",
+        "currency",
+        "orders",
+        "tickets_sold",
+        "payments_confirmed",
+        "gross",
+        "fees",
+    ]
+    list_filter = ["hour", "provider", "currency"]
+    search_fields = ["event__title", "organization__name"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-hour"]
+
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(ModelAdmin):
+    list_display = [
+        "event",
+        "date",
+        "provider",
+        "currency",
+        "orders",
+        "tickets_sold",
+        "payments_confirmed",
+        "gross",
+        "fees",
+    ]
+    list_filter = ["date", "provider", "currency"]
+    search_fields = ["event__title", "organization__name"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-date"]
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(ModelAdmin):
+    list_display = ["currency", "rate_to_usd", "effective_date", "created_at"]
+    list_filter = ["currency"]
+    search_fields = ["currency"]
+    readonly_fields = ["created_at"]
+    ordering = ["currency", "-effective_date"]
+
+
+@admin.register(AttendeeIdentity)
+class AttendeeIdentityAdmin(ModelAdmin):
+    list_display = [
+        "key",
+        "user",
+        "organizations_count",
+        "events_attended",
+        "first_seen",
+        "last_seen",
+    ]
+    search_fields = ["key", "email", "phone"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-last_seen"]
+
+
+@admin.register(OrganizationRetention)
+class OrganizationRetentionAdmin(ModelAdmin):
+    list_display = [
+        "organization",
+        "attendees",
+        "repeat_attendees",
+        "repeat_rate",
+        "generated_at",
+    ]
+    search_fields = ["organization__name"]
+    readonly_fields = ["generated_at"]
+    ordering = ["-repeat_rate"]
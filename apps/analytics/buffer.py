@@ -0,0 +1,322 @@
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, F, Max
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError, ResponseError
+
+from .models import (
+    DailyMetrics,
+    DailyRollup,
+    EventMetrics,
+    HourlyRollup,
+    MetricsLedger,
+    OrganizationMetrics,
+)
+from .versions import bump_org_data_version_on_commit
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "analytics:metrics_buffer"
+PROCESSING_PREFIX = "analytics:metrics_buffer:processing:"
+SEQUENCE_KEY = "analytics:metrics_buffer:seq"
+LOCK_KEY = "analytics:metrics_buffer:lock"
+LOCK_TIMEOUT = 60 * 60
+
+METRICS_TOUCH_FIELDS = ("updated_at", "last_updated")
+
+METRIC_SCOPES = {
+    "daily": (DailyMetrics, "date"),
+    "event": (EventMetrics, "event_id"),
+    "org": (OrganizationMetrics, "organization_id"),
+}
+SCOPE_BY_MODEL = {model: scope for scope, (model, _) in METRIC_SCOPES.items()}
+
+ROLLUP_SCOPES = {
+    "hour": (HourlyRollup, "hour"),
+    "day": (DailyRollup, "date"),
+}
+
+
+def _touch_field(model):
+    for field in METRICS_TOUCH_FIELDS:
+        if any(f.name == field for f in model._meta.fields):
+            return field
+    return None
+
+
+def _is_money(model, field):
+    return isinstance(model._meta.get_field(field), DecimalField)
+
+
+def buffer_field(model, key, field):
+    return f"{SCOPE_BY_MODEL[model]}|{key}|{field}"
+
+
+def apply_metrics_delta(model, lookup, deltas):
+    metrics, _ = model.objects.get_or_create(**lookup)
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    touch = _touch_field(model)
+    if touch:
+        updates[touch] = timezone.now()
+    model.objects.filter(pk=metrics.pk).update(**updates)
+
+
+def buffer_metrics(model, lookup, deltas):
+    (key,) = lookup.values()
+    try:
+        pipe = get_redis_connection("analytics").pipeline(transaction=False)
+        for field, value in deltas.items():
+            if _is_money(model, field):
+                value = int(Decimal(value) * 100)
+            pipe.hincrby(BUFFER_KEY, buffer_field(model, key, field), value)
+        pipe.execute()
+    except RedisError:
+        logger.warning(
+            "Metrics buffer unavailable, writing %s directly", SCOPE_BY_MODEL[model]
+        )
+        apply_metrics_delta(model, lookup, deltas)
+
+
+def apply_rollup_deltas(buckets, organization_id, event_id, provider, currency, deltas):
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    now = timezone.now()
+    for grain, bucket in buckets.items():
+        model, bucket_field = ROLLUP_SCOPES[grain]
+        rollup, _ = model.objects.get_or_create(
+            event_id=event_id,
+            provider=provider,
+            currency=currency,
+            defaults={"organization_id": organization_id},
+            **{bucket_field: bucket},
+        )
+        model.objects.filter(pk=rollup.pk).update(**updates, updated_at=now)
+
+
+def buffer_rollups(buckets, organization_id, event_id, provider, currency, deltas):
+    try:
+        pipe = get_redis_connection("analytics").pipeline(transaction=False)
+        for grain, bucket in buckets.items():
+            model, _ = ROLLUP_SCOPES[grain]
+            key = ",".join(
+                str(part)
+                for part in (
+                    bucket.isoformat(),
+                    organization_id,
+                    event_id,
+                    provider,
+                    currency,
+                )
+            )
+            for field, value in deltas.items():
+                if _is_money(model, field):
+                    value = int(Decimal(value) * 100)
+                pipe.hincrby(BUFFER_KEY, f"{grain}|{key}|{field}", value)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Metrics buffer unavailable, writing rollups directly")
+        apply_rollup_deltas(
+            buckets, organization_id, event_id, provider, currency, deltas
+        )
+        bump_org_data_version_on_commit(organization_id)
+
+
+def _parse_rollup_key(bucket_field, key):
+    bucket, organization_id, event_id, provider, currency = key.split(",")
+    parse_bucket = (
+        date.fromisoformat if bucket_field == "date" else datetime.fromisoformat
+    )
+    return (
+        parse_bucket(bucket),
+        int(organization_id),
+        int(event_id),
+        provider,
+        currency,
+    )
+
+
+def _parse(entries):
+    batches = defaultdict(lambda: defaultdict(dict))
+    for name, value in entries.items():
+        scope, key, field = name.decode().split("|")
+        if scope in ROLLUP_SCOPES:
+            model, bucket_field = ROLLUP_SCOPES[scope]
+            key = _parse_rollup_key(bucket_field, key)
+        else:
+            model, key_field = METRIC_SCOPES[scope]
+            key = date.fromisoformat(key) if key_field == "date" else int(key)
+        value = int(value)
+        if _is_money(model, field):
+            value = Decimal(value) / 100
+        batches[scope][key][field] = value
+    return batches
+
+
+def _apply_batch(batch_id, batches):
+    with transaction.atomic():
+        _, claimed = MetricsLedger.objects.get_or_create(
+            source="metrics.flush", object_id=batch_id
+        )
+        if not claimed:
+            return False
+        now = timezone.now()
+        for scope, rows in batches.items():
+            if scope in ROLLUP_SCOPES:
+                _apply_rollup_rows(scope, rows, now)
+                continue
+            model, key_field = METRIC_SCOPES[scope]
+            existing = {
+                getattr(metrics, key_field): metrics
+                for metrics in model.objects.select_for_update().filter(
+                    **{f"{key_field}__in": list(rows)}
+                )
+            }
+            missing = rows.keys() - existing.keys()
+            if missing and key_field != "date":
+                related = model._meta.get_field(key_field[:-3]).related_model
+                missing &= set(
+                    related.objects.filter(pk__in=missing).values_list("pk", flat=True)
+                )
+            for key in missing:
+                metrics, _ = model.objects.get_or_create(**{key_field: key})
+                existing[key] = model.objects.select_for_update().get(pk=metrics.pk)
+
+            fields = set()
+            for key, metrics in existing.items():
+                for field, value in rows[key].items():
+                    setattr(metrics, field, getattr(metrics, field) + value)
+                    fields.add(field)
+            touch = _touch_field(model)
+            if touch:
+                for metrics in existing.values():
+                    setattr(metrics, touch, now)
+                fields.add(touch)
+            model.objects.bulk_update(
+                list(existing.values()), sorted(fields), batch_size=500
+            )
+    return True
+
+
+def _apply_rollup_rows(scope, rows, now):
+    model, bucket_field = ROLLUP_SCOPES[scope]
+    events = set(
+        model._meta.get_field("event")
+        .related_model.objects.filter(pk__in={key[2] for key in rows})
+        .values_list("pk", flat=True)
+    )
+    pks = {}
+    for key in rows:
+        bucket, organization_id, event_id, provider, currency = key
+        if event_id not in events:
+            continue
+        rollup, _ = model.objects.get_or_create(
+            event_id=event_id,
+            provider=provider,
+            currency=currency,
+            defaults={"organization_id": organization_id},
+            **{bucket_field: bucket},
+        )
+        pks[key] = rollup.pk
+
+    existing = model.objects.select_for_update().in_bulk(pks.values())
+    fields = {"updated_at"}
+    for key, pk in pks.items():
+        rollup = existing[pk]
+        for field, value in rows[key].items():
+            setattr(rollup, field, getattr(rollup, field) + value)
+            fields.add(field)
+        rollup.updated_at = now
+    model.objects.bulk_update(list(existing.values()), sorted(fields), batch_size=500)
+    for organization_id in {rollup.organization_id for rollup in existing.values()}:
+        bump_org_data_version_on_commit(organization_id)
+
+
+def _process(connection, processing_key):
+    batch_id = int(processing_key.decode().rsplit(":", 1)[1])
+    entries = connection.hgetall(processing_key)
+    if entries:
+        _apply_batch(batch_id, _parse(entries))
+    connection.delete(processing_key)
+    return len(entries)
+
+
+def _next_batch_id(connection):
+    batch_id = connection.incr(SEQUENCE_KEY)
+    if batch_id == 1:
+        last = MetricsLedger.objects.filter(source="metrics.flush").aggregate(
+            last=Max("object_id")
+        )["last"]
+        if last:
+            batch_id = connection.incrby(SEQUENCE_KEY, last)
+    return batch_id
+
+
+def _discard_buffered(connection, cutoffs, fields):
+    keys = [BUFFER_KEY, *connection.scan_iter(match=f"{PROCESSING_PREFIX}*")]
+    for key in keys:
+        stale = []
+        for name in connection.hgetall(key):
+            scope, bucket_key, field = name.decode().split("|")
+            if scope not in cutoffs:
+                continue
+            if scope in fields and field not in fields[scope]:
+                continue
+            cutoff = cutoffs[scope]
+            if cutoff is None or (
+                _parse_rollup_key(ROLLUP_SCOPES[scope][1], bucket_key)[0] >= cutoff
+            ):
+                stale.append(name)
+        if stale:
+            connection.hdel(key, *stale)
+
+
+@contextmanager
+def rebuilding_from_source(cutoffs, fields=None):
+    if not settings.ANALYTICS_METRICS_BUFFER:
+        yield
+        return
+    connection = get_redis_connection("analytics")
+    lock = connection.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+    try:
+        lock.acquire()
+        _discard_buffered(connection, cutoffs, fields or {})
+    except RedisError:
+        logger.warning("Metrics buffer unavailable, rebuilding without discarding it")
+        lock = None
+    try:
+        yield
+    finally:
+        if lock:
+            lock.release()
+
+
+def flush_metrics_buffer():
+    connection = get_redis_connection("analytics")
+    lock = connection.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        return _flush(connection)
+    finally:
+        lock.release()
+
+
+def _flush(connection):
+    flushed = 0
+    for processing_key in connection.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+        flushed += _process(connection, processing_key)
+
+    if not connection.exists(BUFFER_KEY):
+        return flushed
+    processing_key = f"{PROCESSING_PREFIX}{_next_batch_id(connection)}"
+    try:
+        connection.rename(BUFFER_KEY, processing_key)
+    except ResponseError:
+        return flushed
+    return flushed + _process(connection, processing_key.encode())
@@ -0,0 +1,215 @@
+from decimal import Decimal
+from itertools import batched
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.tickets.models import Booking, Ticket
+from .models import AttendeeIdentity, OrganizationRetention
+from .versions import bump_org_data_version_on_commit
+
+COHORT_CHUNK_SIZE = 50000
+REPEAT_BUCKETS = 5
+
+ATTENDANCE_COLUMNS = {
+    "booking__event__organization_id": "organization_id",
+    "booking__event_id": "event_id",
+    "booking__event__start_at": "start_at",
+    "booking__user_id": "user_id",
+    "attendee_email": "attendee_email",
+    "booking__user__email": "user_email",
+    "booking__guest_email": "guest_email",
+    "booking__guest_phone": "guest_phone",
+    "booking__user__phone_number": "user_phone",
+}
+ATTENDANCE_KEYS = ["organization_id", "event_id", "key"]
+
+
+def _email(series):
+    series = series.astype("string").str.strip().str.lower()
+    return series.mask(series == "")
+
+
+def _phone(series):
+    series = series.astype("string").str.replace(r"\D", "", regex=True)
+    return series.mask(series.str.len() < 6)
+
+
+def _attendance_chunk(rows):
+    frame = pd.DataFrame.from_records(rows, columns=list(ATTENDANCE_COLUMNS.values()))
+    email = (
+        _email(frame["attendee_email"])
+        .fillna(_email(frame["user_email"]))
+        .fillna(_email(frame["guest_email"]))
+    )
+    phone = _phone(frame["guest_phone"]).fillna(_phone(frame["user_phone"]))
+    frame = frame.assign(
+        user_id=frame["user_id"].astype("Int64"),
+        email=email,
+        phone=phone,
+        key=("email:" + email).fillna("phone:" + phone),
+    ).dropna(subset=["key"])
+    return frame[
+        ATTENDANCE_KEYS + ["start_at", "user_id", "email", "phone"]
+    ].drop_duplicates(ATTENDANCE_KEYS)
+
+
+def load_attendance(chunk_size=COHORT_CHUNK_SIZE):
+    rows = (
+        Ticket.objects.filter(
+            booking__status=Booking.Status.CONFIRMED, booking__event__isnull=False
+        )
+        .values_list(*ATTENDANCE_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+    chunks = [_attendance_chunk(batch) for batch in batched(rows, chunk_size)]
+    if not chunks:
+        return pd.DataFrame(columns=ATTENDANCE_KEYS + ["date", "month"])
+    attendance = pd.concat(chunks, ignore_index=True).drop_duplicates(ATTENDANCE_KEYS)
+    local = pd.to_datetime(attendance["start_at"], utc=True).dt.tz_convert(
+        settings.TIME_ZONE
+    )
+    return attendance.assign(
+        date=local.dt.date, month=local.dt.year * 12 + local.dt.month - 1
+    )
+
+
+def _save_identities(attendance, started_at):
+    identities = attendance.groupby("key").agg(
+        email=("email", "first"),
+        phone=("phone", "first"),
+        user_id=("user_id", "max"),
+        organizations=("organization_id", "nunique"),
+        events=("event_id", "nunique"),
+        first_seen=("date", "min"),
+        last_seen=("date", "max"),
+    )
+    for batch in batched(identities.itertuples(), COHORT_CHUNK_SIZE):
+        AttendeeIdentity.objects.bulk_create(
+            [
+                AttendeeIdentity(
+                    key=row.Index,
+                    email=row.email if pd.notna(row.email) else "",
+                    phone=row.phone if pd.notna(row.phone) else "",
+                    user_id=int(row.user_id) if pd.notna(row.user_id) else None,
+                    organizations_count=int(row.organizations),
+                    events_attended=int(row.events),
+                    first_seen=row.first_seen,
+                    last_seen=row.last_seen,
+                )
+                for row in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=[
+                "email",
+                "phone",
+                "user",
+                "organizations_count",
+                "events_attended",
+                "first_seen",
+                "last_seen",
+                "updated_at",
+            ],
+        )
+    AttendeeIdentity.objects.filter(updated_at__lt=started_at).delete()
+    return len(identities)
+
+
+def _month_label(month):
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def _retention(attendance):
+    first_month = attendance.groupby(["organization_id", "key"])["month"].transform(
+        "min"
+    )
+    active = attendance.assign(
+        cohort=first_month, period=attendance["month"] - first_month
+    )
+    counts = active.groupby(["organization_id", "cohort", "period"])["key"].nunique()
+
+    retention = {}
+    for (organization_id, cohort), periods in counts.groupby(level=[0, 1]):
+        periods = periods.droplevel([0, 1])
+        size = int(periods.get(0, 0))
+        span = range(int(periods.index.max()) + 1)
+        retention.setdefault(organization_id, []).append(
+            {
+                "cohort": _month_label(int(cohort)),
+                "size": size,
+                "retention": [
+                    round(periods.get(period, 0) / size * 100, 1) for period in span
+                ],
+            }
+        )
+    return retention
+
+
+def _repeat_distribution(attendance):
+    events = attendance.groupby(["organization_id", "key"])["event_id"].nunique()
+    buckets = events.clip(upper=REPEAT_BUCKETS)
+    return buckets.groupby(level=0).value_counts().sort_index()
+
+
+def _save_retention(attendance, started_at):
+    retention = _retention(attendance)
+    distribution = _repeat_distribution(attendance)
+
+    rows = []
+    for organization_id, cohorts in retention.items():
+        buckets = distribution.loc[organization_id]
+        attendees = int(buckets.sum())
+        repeat = int(buckets[buckets.index > 1].sum())
+        rows.append(
+            OrganizationRetention(
+                organization_id=int(organization_id),
+                attendees=attendees,
+                repeat_attendees=repeat,
+                repeat_rate=(Decimal(repeat) / attendees * 100).quantize(
+                    Decimal("0.01")
+                ),
+                repeat_distribution={
+                    (
+                        f"{REPEAT_BUCKETS}+"
+                        if events == REPEAT_BUCKETS
+                        else str(events)
+                    ): int(count)
+                    for events, count in buckets.items()
+                },
+                cohorts=cohorts,
+                generated_at=started_at,
+            )
+        )
+    OrganizationRetention.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["organization"],
+        update_fields=[
+            "attendees",
+            "repeat_attendees",
+            "repeat_rate",
+            "repeat_distribution",
+            "cohorts",
+            "generated_at",
+        ],
+    )
+    OrganizationRetention.objects.filter(generated_at__lt=started_at).delete()
+    return [row.organization_id for row in rows]
+
+
+def build_attendee_cohorts(chunk_size=COHORT_CHUNK_SIZE):
+    started_at = timezone.now()
+    attendance = load_attendance(chunk_size)
+    if attendance.empty:
+        return {"identities": 0, "organizations": 0}
+
+    with transaction.atomic():
+        identities = _save_identities(attendance, started_at)
+        organization_ids = _save_retention(attendance, started_at)
+        for organization_id in organization_ids:
+            bump_org_data_version_on_commit(organization_id)
+    return {"identities": identities, "organizations": len(organization_ids)}
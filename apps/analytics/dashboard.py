@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.events.models import Event
+from .models import DailyRollup
+from .rollups import daily_series, rollup_totals, usd_totals
+
+DASHBOARD_SNAPSHOT_KEY = "admin_dashboard_snapshot"
+DASHBOARD_SNAPSHOT_TIMEOUT = 15 * 60
+DASHBOARD_REFRESH_KEY = "admin_dashboard_snapshot_refresh"
+DASHBOARD_REFRESH_TIMEOUT = 60
+
+
+def get_plotly_theme():
+    return {
+        "template": "plotly_dark",
+        "paper_bgcolor": "rgba(31, 41, 55, 1)",
+        "plot_bgcolor": "rgba(31, 41, 55, 1)",
+        "font": {"color": "#e5e7eb"},
+        "xaxis": {"gridcolor": "rgba(75, 85, 99, 0.3)"},
+        "yaxis": {"gridcolor": "rgba(75, 85, 99, 0.3)"},
+    }
+
+
+def _chart_layout(x_title, y_title):
+    theme = get_plotly_theme()
+    return {
+        "template": theme["template"],
+        "paper_bgcolor": theme["paper_bgcolor"],
+        "plot_bgcolor": theme["plot_bgcolor"],
+        "font": theme["font"],
+        "height": 300,
+        "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+        "xaxis": {**theme["xaxis"], "title": {"text": x_title}, "automargin": True},
+        "yaxis": {**theme["yaxis"], "title": {"text": y_title}, "automargin": True},
+        "hovermode": "x unified",
+    }
+
+
+def revenue_chart_spec(start_date, end_date):
+    series = daily_series(
+        DailyRollup.objects.filter(date__gte=start_date, date__lte=end_date),
+        "gross",
+        usd=True,
+    )
+    return {
+        "data": [
+            {
+                "type": "scatter",
+                "mode": "lines+markers",
+                "name": "Revenue",
+                "x": [date.isoformat() for date, _ in series],
+                "y": [float(values["gross"]) for _, values in series],
+                "line": {"color": "#a78bfa", "width": 3},
+                "marker": {"size": 8, "color": "#a78bfa"},
+            }
+        ],
+        "layout": _chart_layout("Date", "Revenue ($)"),
+    }
+
+
+def sales_chart_spec(start_date, end_date):
+    series = daily_series(
+        DailyRollup.objects.filter(date__gte=start_date, date__lte=end_date), "orders"
+    )
+    return {
+        "data": [
+            {
+                "type": "bar",
+                "name": "Orders",
+                "x": [date.isoformat() for date, _ in series],
+                "y": [values["orders"] for _, values in series],
+                "marker": {"color": "#a78bfa"},
+            }
+        ],
+        "layout": _chart_layout("Date", "Number of Orders"),
+    }
+
+
+def build_dashboard_snapshot():
+    today = timezone.localdate()
+    last_30_days = today - timedelta(days=30)
+    last_7_days = today - timedelta(days=7)
+
+    last_30 = DailyRollup.objects.filter(date__gte=last_30_days)
+    last_7 = DailyRollup.objects.filter(date__gte=last_7_days)
+
+    total_revenue = usd_totals(last_30, "gross")["gross"]
+    totals = rollup_totals(last_30, "orders", "tickets_sold")
+    revenue_last_7 = usd_totals(last_7, "gross")["gross"]
+    orders_last_7 = rollup_totals(last_7, "orders")["orders"]
+
+    now = timezone.now()
+    active_events = Event.objects.filter(
+        Q(start_at__gte=now) | Q(end_at__gte=now)
+    ).count()
+
+    return {
+        "navigation": [
+            {"title": "Dashboard", "link": "/admin/"},
+            {"title": "Analytics", "link": "/admin/reports/revenue/"},
+        ],
+        "kpi_data": [
+            {
+                "title": "Total Revenue (30d)",
+                "metric": f"${total_revenue:,.2f}",
+                "footer": f"Last 7 days: ${revenue_last_7:,.2f}",
+                "icon": "attach_money",
+            },
+            {
+                "title": "Total Orders (30d)",
+                "metric": str(totals["orders"]),
+                "footer": f"Last 7 days: {orders_last_7}",
+                "icon": "shopping_cart",
+            },
+            {
+                "title": "Tickets Sold (30d)",
+                "metric": str(totals["tickets_sold"]),
+                "footer": f"Active now: {totals['tickets_sold']}",
+                "icon": "confirmation_number",
+            },
+            {
+                "title": "Active Events",
+                "metric": str(active_events),
+                "footer": "Currently running or upcoming",
+                "icon": "event",
+            },
+        ],
+        "charts": [
+            {
+                "id": "revenue_chart",
+                "title": "Revenue Trend",
+                "spec": revenue_chart_spec(last_30_days, today),
+            },
+            {
+                "id": "sales_chart",
+                "title": "Sales Overview",
+                "spec": sales_chart_spec(last_30_days, today),
+            },
+        ],
+        "generated_at": now.isoformat(),
+    }
+
+
+def refresh_dashboard_snapshot():
+    snapshot = build_dashboard_snapshot()
+    cache = caches["analytics"]
+    cache.set(DASHBOARD_SNAPSHOT_KEY, snapshot, DASHBOARD_SNAPSHOT_TIMEOUT)
+    cache.delete(DASHBOARD_REFRESH_KEY)
+    return snapshot
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services import rebuild_metrics
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily, event and organization metrics from source tables"
+
+    def handle(self, *args, **options):
+        counts = rebuild_metrics()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt metrics for {counts['events']} events, "
+                f"{counts['organizations']} organizations and {counts['days']} days"
+            )
+        )
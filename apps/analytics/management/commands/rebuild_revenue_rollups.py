@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services import rebuild_revenue_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild event revenue rollups from confirmed payments and processed refunds"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="event_ids",
+            help="Only rebuild rollups for this event ID (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_revenue_rollups(options["event_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt {created} revenue rollup rows")
+        )
@@ -0,0 +1,30 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly and daily analytics rollups from source tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only rebuild buckets from this date (YYYY-MM-DD) onwards",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError("--since must be a date in YYYY-MM-DD format")
+        counts = rebuild_rollups(since)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt {counts['hour']} hourly and "
+                f"{counts['day']} daily rollup rows"
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services import rebuild_sales_buckets
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly event sales buckets from confirmed bookings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="event_ids",
+            help="Only rebuild buckets for this event ID (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_sales_buckets(options["event_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt {created} sales bucket rows")
+        )
@@ -0,0 +1,557 @@
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.analytics.rollups import rebuild_rollups
+from apps.analytics.services import (
+    rebuild_metrics,
+    rebuild_revenue_rollups,
+    rebuild_sales_buckets,
+)
+from apps.cfp.models import CallForProposals, Proposal, Review, SessionFormat
+from apps.checkin.models import CheckIn
+from apps.events.models import Event
+from apps.events.services.listings import refresh_event_listings
+from apps.messaging.models import MessageCampaign, MessageDelivery, MessageTemplate
+from apps.orgs.models import MemberRole, Membership, Organization
+from apps.payments.models import Payment, PaymentProvider
+from apps.tickets.models import Booking, Ticket, TicketType
+
+User = get_user_model()
+
+CURRENCIES = [("XAF", 70), ("XOF", 12), ("NGN", 8), ("GHS", 4), ("USD", 6)]
+PRICE_RANGES = {
+    "XAF": (2000, 50000, 500),
+    "XOF": (2000, 50000, 500),
+    "NGN": (3000, 80000, 500),
+    "GHS": (50, 1500, 10),
+    "USD": (5, 150, 5),
+}
+PROVIDERS = [
+    (PaymentProvider.MTN_MOMO, 40),
+    (PaymentProvider.ORANGE_MONEY, 25),
+    (PaymentProvider.CAMPAY, 15),
+    (PaymentProvider.PAWAPAY, 10),
+    (PaymentProvider.FLUTTERWAVE, 10),
+]
+OUTCOMES = [
+    ((Payment.Status.CONFIRMED, Booking.Status.CONFIRMED), 80),
+    ((Payment.Status.FAILED, Booking.Status.CANCELLED), 8),
+    ((Payment.Status.EXPIRED, Booking.Status.CANCELLED), 7),
+    ((Payment.Status.PENDING, Booking.Status.PENDING), 3),
+    ((Payment.Status.REFUNDED, Booking.Status.REFUNDED), 2),
+]
+DELIVERY_STATUSES = [
+    (MessageDelivery.Status.DELIVERED, 55),
+    (MessageDelivery.Status.OPENED, 25),
+    (MessageDelivery.Status.CLICKED, 10),
+    (MessageDelivery.Status.BOUNCED, 5),
+    (MessageDelivery.Status.FAILED, 5),
+]
+PROPOSAL_STATUSES = [
+    (Proposal.Status.SUBMITTED, 40),
+    (Proposal.Status.UNDER_REVIEW, 20),
+    (Proposal.Status.ACCEPTED, 15),
+    (Proposal.Status.REJECTED, 20),
+    (Proposal.Status.WAITLISTED, 5),
+]
+TICKETS_PER_ORDER = [(1, 60), (2, 25), (3, 10), (4, 5)]
+TICKET_TIERS = ["Regular", "VIP", "Early Bird", "Student"]
+CITIES = ["Douala", "Yaounde", "Lagos", "Accra", "Abidjan", "Dakar", "Kigali"]
+EVENT_KINDS = ["Summit", "Festival", "Concert", "Meetup", "Conference", "Expo"]
+EVENT_TOPICS = ["Tech", "Afrobeats", "Fintech", "Jazz", "Startup", "Design", "Food"]
+FIRST_NAMES = ["Amina", "Jean", "Chidi", "Fatou", "Kofi", "Marie", "Ibrahim", "Ngozi"]
+LAST_NAMES = ["Ngono", "Mbarga", "Okafor", "Diallo", "Mensah", "Traore", "Abena"]
+
+
+def _timestamp_fields(model):
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+
+@contextmanager
+def backdated(*models):
+    fields = [field for model in models for field in _timestamp_fields(model)]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large deterministic synthetic dataset for load and benchmark "
+        "testing using batched bulk inserts"
+    )
+
+    models = [
+        Organization,
+        Membership,
+        Event,
+        Booking,
+        Ticket,
+        CheckIn,
+        Payment,
+        MessageCampaign,
+        MessageDelivery,
+        CallForProposals,
+        Proposal,
+        Review,
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--organizations", type=int, default=20)
+        parser.add_argument("--events-per-org", type=int, default=10)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument(
+            "--bookings", type=int, default=100000, help="Total number of orders"
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="How far back event dates go"
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--skip-rebuild",
+            action="store_true",
+            help="Do not rebuild analytics rollups and metrics afterwards",
+        )
+
+    def handle(self, *args, **options):
+        self.seed = options["seed"]
+        self.rng = random.Random(self.seed)
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.prefix = f"load-{self.seed}"
+        self.stamps = {
+            model: [field.attname for field in _timestamp_fields(model)]
+            for model in self.models
+        }
+        self.ticket_counter = 0
+
+        if Organization.objects.filter(slug__startswith=f"{self.prefix}-").exists():
+            raise CommandError(
+                f"Load data for seed {self.seed} already exists; use another --seed"
+            )
+
+        with backdated(*self.models):
+            users = self.create_users(options["users"])
+            events = self.create_events(
+                users, options["organizations"], options["events_per_org"], options
+            )
+            counts = self.create_orders(events, users, options["bookings"])
+            counts["proposals"] = self.create_proposals(events, users)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(users)} users, {len(events)} events, "
+                f"{counts['bookings']} bookings, {counts['tickets']} tickets, "
+                f"{counts['deliveries']} deliveries and "
+                f"{counts['proposals']} proposals"
+            )
+        )
+
+        if not options["skip_rebuild"]:
+            self.stdout.write("Rebuilding analytics...")
+            rebuild_rollups()
+            rebuild_metrics()
+            rebuild_revenue_rollups()
+            rebuild_sales_buckets()
+            refresh_event_listings()
+            self.stdout.write(self.style.SUCCESS("Analytics and listings rebuilt"))
+
+    def new(self, model, moment, **values):
+        instance = model(**values)
+        for attname in self.stamps.get(model, ()):
+            setattr(instance, attname, moment)
+        return instance
+
+    def pick(self, weighted):
+        values, weights = zip(*weighted)
+        return self.rng.choices(values, weights)[0]
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def moment_between(self, start, end):
+        span = max((end - start).total_seconds(), 0)
+        return start + timedelta(seconds=self.rng.uniform(0, span))
+
+    def person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def bulk_create(self, model, objects):
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def create_users(self, count):
+        password = make_password(None)
+        users = []
+        for index in range(count):
+            first_name, last_name = self.person()
+            users.append(
+                User(
+                    username=f"{self.prefix}-user{index}",
+                    email=f"user{index}.seed{self.seed}@load.test",
+                    first_name=first_name,
+                    last_name=last_name,
+                    password=password,
+                    date_joined=self.now - timedelta(days=self.rng.randint(0, 720)),
+                )
+            )
+        return self.bulk_create(User, users)
+
+    def create_events(self, users, org_count, events_per_org, options):
+        owners = self.rng.sample(users, min(org_count, len(users)))
+        organizations = []
+        for index, owner in enumerate(owners):
+            created_at = self.now - timedelta(days=options["days"] + 30)
+            organizations.append(
+                self.new(
+                    Organization,
+                    created_at,
+                    name=f"{owner.last_name} Events {index}",
+                    slug=f"{self.prefix}-org-{index}",
+                    currency=self.pick(CURRENCIES),
+                    owner=owner,
+                )
+            )
+        organizations = self.bulk_create(Organization, organizations)
+        self.bulk_create(
+            Membership,
+            [
+                self.new(
+                    Membership,
+                    organization.created_at,
+                    organization=organization,
+                    user=organization.owner,
+                    role=MemberRole.OWNER,
+                )
+                for organization in organizations
+            ],
+        )
+
+        events = []
+        for organization in organizations:
+            for index in range(events_per_org):
+                start_at = self.now - timedelta(
+                    days=self.rng.uniform(-60, options["days"])
+                )
+                created_at = min(
+                    start_at - timedelta(days=self.rng.randint(30, 120)),
+                    self.now - timedelta(days=1),
+                )
+                title = (
+                    f"{self.rng.choice(EVENT_TOPICS)} "
+                    f"{self.rng.choice(EVENT_KINDS)} {start_at:%Y}"
+                )
+                events.append(
+                    self.new(
+                        Event,
+                        created_at,
+                        organization=organization,
+                        title=title,
+                        slug=f"{slugify(title)}-{self.uuid().hex[:8]}",
+                        description=f"{title} organised by {organization.name}.",
+                        start_at=start_at,
+                        end_at=start_at + timedelta(hours=self.rng.randint(2, 48)),
+                        city=self.rng.choice(CITIES),
+                        state=(
+                            Event.State.CLOSED
+                            if start_at < self.now
+                            else Event.State.PUBLISHED
+                        ),
+                        is_public=True,
+                        capacity=0,
+                    )
+                )
+        events = self.bulk_create(Event, events)
+
+        ticket_types = []
+        for event in events:
+            low, high, step = PRICE_RANGES[event.organization.currency]
+            for name in TICKET_TIERS[: self.rng.randint(1, len(TICKET_TIERS))]:
+                ticket_types.append(
+                    TicketType(
+                        event=event,
+                        name=name,
+                        price=Decimal(self.rng.randrange(low, high + 1, step)),
+                        quantity=self.rng.randint(100, 5000),
+                    )
+                )
+        ticket_types = self.bulk_create(TicketType, ticket_types)
+        for event in events:
+            event.seed_ticket_types = []
+        by_event = {event.id: event for event in events}
+        for ticket_type in ticket_types:
+            by_event[ticket_type.event_id].seed_ticket_types.append(ticket_type)
+
+        campaigns = [
+            self.new(
+                MessageCampaign,
+                min(event.start_at - timedelta(days=1), self.now),
+                reference=self.uuid(),
+                organization=event.organization,
+                event=event,
+                name=f"Reminder: {event.title}",
+                message_type=MessageTemplate.Type.EMAIL,
+                subject=f"{event.title} is coming up",
+                body="See you there!",
+                status=MessageCampaign.Status.COMPLETED,
+                sent_at=min(event.start_at - timedelta(days=1), self.now),
+                created_by=event.organization.owner,
+            )
+            for event in events
+            if event.start_at < self.now and self.rng.random() < 0.5
+        ]
+        for campaign in self.bulk_create(MessageCampaign, campaigns):
+            campaign.event.seed_campaign = campaign
+
+        self.stdout.write(
+            f"Created {len(organizations)} organizations and {len(events)} events"
+        )
+        return events
+
+    def create_orders(self, events, users, total):
+        weights = [self.rng.paretovariate(1.5) for _ in events]
+        scale = total / sum(weights) if weights else 0
+        counts = {"bookings": 0, "tickets": 0, "deliveries": 0}
+        pending = []
+        for event, weight in zip(events, weights):
+            window_end = min(event.start_at, self.now)
+            for _ in range(round(weight * scale)):
+                pending.append(
+                    (event, self.moment_between(event.created_at, window_end))
+                )
+                if len(pending) >= self.batch_size:
+                    self.flush_orders(pending, users, counts)
+                    pending = []
+        if pending:
+            self.flush_orders(pending, users, counts)
+        return counts
+
+    @transaction.atomic
+    def flush_orders(self, pending, users, counts):
+        bookings = []
+        orders = []
+        for event, created_at in pending:
+            payment_status, booking_status = self.pick(OUTCOMES)
+            lines = [
+                self.rng.choice(event.seed_ticket_types)
+                for _ in range(self.pick(TICKETS_PER_ORDER))
+            ]
+            user = self.rng.choice(users) if self.rng.random() < 0.7 else None
+            first_name, last_name = (
+                (user.first_name, user.last_name) if user else self.person()
+            )
+            email = (
+                user.email
+                if user
+                else f"guest{self.rng.getrandbits(40)}.seed{self.seed}@load.test"
+            )
+            bookings.append(
+                self.new(
+                    Booking,
+                    created_at,
+                    reference=self.uuid(),
+                    event=event,
+                    user=user,
+                    guest_email=email,
+                    guest_name=f"{first_name} {last_name}",
+                    guest_phone=f"+2376{self.rng.randint(10000000, 99999999)}",
+                    status=booking_status,
+                    total_amount=sum(line.price for line in lines),
+                )
+            )
+            orders.append((event, payment_status, lines))
+        bookings = self.bulk_create(Booking, bookings)
+
+        payments = []
+        tickets = []
+        for booking, (event, status, lines) in zip(bookings, orders):
+            created_at = booking.created_at
+            currency = event.organization.currency
+            payments.append(
+                self.new(
+                    Payment,
+                    created_at,
+                    booking=booking,
+                    reference=self.uuid(),
+                    amount=booking.total_amount,
+                    service_fee=(booking.total_amount * Decimal("0.03")).quantize(
+                        Decimal("0.01")
+                    ),
+                    currency=currency,
+                    provider=self.pick(PROVIDERS),
+                    phone_number=booking.guest_phone,
+                    customer_email=booking.guest_email,
+                    status=status,
+                    confirmed_at=(
+                        created_at + timedelta(seconds=self.rng.randint(20, 600))
+                        if status in (Payment.Status.CONFIRMED, Payment.Status.REFUNDED)
+                        else None
+                    ),
+                    expires_at=created_at + timedelta(minutes=30),
+                )
+            )
+            if status != Payment.Status.CONFIRMED:
+                continue
+            attended = event.end_at < self.now
+            for ticket_type in lines:
+                self.ticket_counter += 1
+                checked_in = attended and self.rng.random() < 0.75
+                tickets.append(
+                    self.new(
+                        Ticket,
+                        created_at,
+                        booking=booking,
+                        ticket_type=ticket_type,
+                        code=f"LD{self.seed % 10000:04d}{self.ticket_counter:010d}",
+                        attendee_name=booking.guest_name,
+                        attendee_email=booking.guest_email,
+                        is_checked_in=checked_in,
+                        checked_in_at=(
+                            self.moment_between(event.start_at, event.end_at)
+                            if checked_in
+                            else None
+                        ),
+                    )
+                )
+        self.bulk_create(Payment, payments)
+        tickets = self.bulk_create(Ticket, tickets)
+        self.bulk_create(
+            CheckIn,
+            [
+                self.new(
+                    CheckIn,
+                    ticket.checked_in_at,
+                    reference=self.uuid(),
+                    ticket=ticket,
+                    checked_in_by_id=ticket.booking.event.organization.owner_id,
+                )
+                for ticket in tickets
+                if ticket.is_checked_in
+            ],
+        )
+
+        deliveries = []
+        for ticket in tickets:
+            campaign = getattr(ticket.ticket_type.event, "seed_campaign", None)
+            if campaign is None or self.rng.random() > 0.6:
+                continue
+            status = self.pick(DELIVERY_STATUSES)
+            sent_at = campaign.sent_at
+            delivered = status not in (
+                MessageDelivery.Status.BOUNCED,
+                MessageDelivery.Status.FAILED,
+            )
+            deliveries.append(
+                self.new(
+                    MessageDelivery,
+                    sent_at,
+                    campaign=campaign,
+                    ticket=ticket,
+                    recipient_email=ticket.attendee_email,
+                    status=status,
+                    tracking_id=self.uuid(),
+                    sent_at=sent_at,
+                    delivered_at=sent_at if delivered else None,
+                    opened_at=(
+                        sent_at + timedelta(hours=1)
+                        if status
+                        in (
+                            MessageDelivery.Status.OPENED,
+                            MessageDelivery.Status.CLICKED,
+                        )
+                        else None
+                    ),
+                    clicked_at=(
+                        sent_at + timedelta(hours=2)
+                        if status == MessageDelivery.Status.CLICKED
+                        else None
+                    ),
+                )
+            )
+        self.bulk_create(MessageDelivery, deliveries)
+
+        counts["bookings"] += len(bookings)
+        counts["tickets"] += len(tickets)
+        counts["deliveries"] += len(deliveries)
+        self.stdout.write(f"  {counts['bookings']} bookings written")
+
+    @transaction.atomic
+    def create_proposals(self, events, users):
+        events = [event for event in events if self.rng.random() < 0.2]
+        cfps = []
+        formats = []
+        for event in events:
+            opens_at = event.created_at
+            cfps.append(
+                self.new(
+                    CallForProposals,
+                    opens_at,
+                    event=event,
+                    status=(
+                        CallForProposals.Status.DECIDED
+                        if event.start_at < self.now
+                        else CallForProposals.Status.OPEN
+                    ),
+                    opens_at=opens_at,
+                    closes_at=event.start_at - timedelta(days=14),
+                )
+            )
+            formats.append(SessionFormat(event=event, name="Talk", duration_minutes=30))
+        cfps = self.bulk_create(CallForProposals, cfps)
+        formats = self.bulk_create(SessionFormat, formats)
+
+        proposals = []
+        for cfp, session_format in zip(cfps, formats):
+            for speaker in self.rng.sample(
+                users, min(self.rng.randint(5, 40), len(users))
+            ):
+                submitted_at = self.moment_between(cfp.opens_at, cfp.closes_at)
+                proposals.append(
+                    self.new(
+                        Proposal,
+                        submitted_at,
+                        cfp=cfp,
+                        speaker=speaker,
+                        title=f"{self.rng.choice(EVENT_TOPICS)} in practice",
+                        abstract="A practical look at what worked for us.",
+                        description="Case studies, lessons learned and Q&A.",
+                        session_format=session_format,
+                        status=self.pick(PROPOSAL_STATUSES),
+                        submitted_at=submitted_at,
+                    )
+                )
+        proposals = self.bulk_create(Proposal, proposals)
+        self.bulk_create(
+            Review,
+            [
+                self.new(
+                    Review,
+                    proposal.submitted_at + timedelta(days=self.rng.randint(1, 10)),
+                    proposal=proposal,
+                    reviewer=proposal.cfp.event.organization.owner,
+                    rating=self.rng.randint(1, 5),
+                )
+                for proposal in proposals
+                if proposal.speaker_id != proposal.cfp.event.organization.owner_id
+            ],
+        )
+        return len(proposals)
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:13
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_remove_dailymetrics_payment_processing_fees_and_more'),
+        ('events', '0019_alter_event_cover_image'),
+        ('orgs', '0009_alter_invitation_email_alter_organization_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('provider', models.CharField(max_length=20)),
+                ('currency', models.CharField(default='XAF', max_length=3)),
+                ('gross', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('fees', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('refunds', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('net', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('orders_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='events.event')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='orgs.organization')),
+            ],
+            options={
+                'verbose_name': 'Event Revenue Rollup',
+                'verbose_name_plural': 'Event Revenue Rollups',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['event', 'date'], name='analytics_e_event_i_8edfe1_idx'), models.Index(fields=['organization', 'date'], name='analytics_e_organiz_bd79a6_idx'), models.Index(fields=['date'], name='analytics_e_date_8c3891_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'date', 'provider', 'currency'), name='unique_event_revenue_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:28
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_event_revenue_rollup'),
+        ('events', '0019_alter_event_cover_image'),
+        ('tickets', '0007_booking_delivery_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSalesBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('tickets', models.IntegerField(default=0)),
+                ('gross', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('orders', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_buckets', to='events.event')),
+                ('ticket_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_buckets', to='tickets.tickettype')),
+            ],
+            options={
+                'verbose_name': 'Event Sales Bucket',
+                'verbose_name_plural': 'Event Sales Buckets',
+                'ordering': ['-hour'],
+                'indexes': [models.Index(fields=['event', 'hour'], name='analytics_e_event_i_1ac0ef_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'ticket_type', 'hour'), name='unique_event_sales_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_event_sales_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricsLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=40)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Metrics Ledger Entry',
+                'verbose_name_plural': 'Metrics Ledger',
+                'constraints': [models.UniqueConstraint(fields=('source', 'object_id'), name='unique_metrics_ledger_entry')],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:39
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_metrics_ledger'),
+        ('events', '0019_alter_event_cover_image'),
+        ('orgs', '0009_alter_invitation_email_alter_organization_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(blank=True, default='', max_length=20)),
+                ('currency', models.CharField(blank=True, default='', max_length=3)),
+                ('orders', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('tickets_checked_in', models.IntegerField(default=0)),
+                ('payments_pending', models.IntegerField(default=0)),
+                ('payments_confirmed', models.IntegerField(default=0)),
+                ('payments_failed', models.IntegerField(default=0)),
+                ('payments_expired', models.IntegerField(default=0)),
+                ('payments_refunded', models.IntegerField(default=0)),
+                ('gross', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('fees', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('failed_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.event')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='orgs.organization')),
+            ],
+            options={
+                'verbose_name': 'Daily Rollup',
+                'verbose_name_plural': 'Daily Rollups',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='analytics_d_date_38bd00_idx'), models.Index(fields=['organization', 'date'], name='analytics_d_organiz_e37a16_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'event', 'provider', 'currency'), name='unique_daily_rollup_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(blank=True, default='', max_length=20)),
+                ('currency', models.CharField(blank=True, default='', max_length=3)),
+                ('orders', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('tickets_checked_in', models.IntegerField(default=0)),
+                ('payments_pending', models.IntegerField(default=0)),
+                ('payments_confirmed', models.IntegerField(default=0)),
+                ('payments_failed', models.IntegerField(default=0)),
+                ('payments_expired', models.IntegerField(default=0)),
+                ('payments_refunded', models.IntegerField(default=0)),
+                ('gross', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('fees', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('failed_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('hour', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.event')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='orgs.organization')),
+            ],
+            options={
+                'verbose_name': 'Hourly Rollup',
+                'verbose_name_plural': 'Hourly Rollups',
+                'ordering': ['-hour'],
+                'indexes': [models.Index(fields=['hour'], name='analytics_h_hour_b213b6_idx'), models.Index(fields=['organization', 'hour'], name='analytics_h_organiz_fb0ce2_idx')],
+                'constraints': [models.UniqueConstraint(fields=('hour', 'event', 'provider', 'currency'), name='unique_hourly_rollup_bucket')],
+            },
+        ),
+    ]
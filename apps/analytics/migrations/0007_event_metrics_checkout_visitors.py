@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_hourly_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmetrics',
+            name='checkout_visitors',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:50
+
+import datetime
+from decimal import Decimal
+from django.db import migrations, models
+
+INITIAL_RATES = {
+    "XAF": "0.00167",
+    "XOF": "0.00167",
+    "USD": "1.00",
+    "EUR": "1.08",
+    "GBP": "1.27",
+    "NGN": "0.0013",
+    "GHS": "0.083",
+    "UGX": "0.00027",
+}
+
+
+def seed_exchange_rates(apps, schema_editor):
+    ExchangeRate = apps.get_model("analytics", "ExchangeRate")
+    ExchangeRate.objects.bulk_create(
+        [
+            ExchangeRate(
+                currency=currency,
+                rate_to_usd=Decimal(rate),
+                effective_date=datetime.date(2000, 1, 1),
+            )
+            for currency, rate in INITIAL_RATES.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_event_metrics_checkout_visitors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='failed_amount_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='fees_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='gross_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='pending_amount_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='failed_amount_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='fees_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='gross_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='pending_amount_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('rate_to_usd', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('effective_date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Exchange Rate',
+                'verbose_name_plural': 'Exchange Rates',
+                'ordering': ['currency', '-effective_date'],
+                'constraints': [models.UniqueConstraint(fields=('currency', 'effective_date'), name='unique_exchange_rate_per_day')],
+            },
+        ),
+        migrations.RunPython(seed_exchange_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0008_exchange_rates"),
+        ("orgs", "0009_alter_invitation_email_alter_organization_logo"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendeeIdentity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, unique=True)),
+                ("email", models.EmailField(blank=True, max_length=254)),
+                ("phone", models.CharField(blank=True, max_length=20)),
+                ("organizations_count", models.IntegerField(default=0)),
+                ("events_attended", models.IntegerField(default=0)),
+                ("first_seen", models.DateField()),
+                ("last_seen", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="attendee_identities",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Attendee Identity",
+                "verbose_name_plural": "Attendee Identities",
+                "ordering": ["-last_seen"],
+            },
+        ),
+        migrations.CreateModel(
+            name="OrganizationRetention",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("attendees", models.IntegerField(default=0)),
+                ("repeat_attendees", models.IntegerField(default=0)),
+                (
+                    "repeat_rate",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=5
+                    ),
+                ),
+                ("repeat_distribution", models.JSONField(default=dict)),
+                ("cohorts", models.JSONField(default=list)),
+                ("generated_at", models.DateTimeField()),
+                (
+                    "organization",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="retention",
+                        to="orgs.organization",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Organization Retention",
+                "verbose_name_plural": "Organization Retention",
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0.1 on 2026-10-19 08:26
+
+from datetime import timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncHour
+
+
+def backfill_tickets_confirmed(apps, schema_editor):
+    Ticket = apps.get_model("tickets", "Ticket")
+    confirmed = Ticket.objects.filter(
+        booking__event__isnull=False, booking__status="CONFIRMED"
+    )
+    grains = (
+        (
+            "HourlyRollup",
+            "hour",
+            TruncHour("booking__created_at", tzinfo=dt_timezone.utc),
+        ),
+        ("DailyRollup", "date", TruncDate("booking__created_at")),
+    )
+    for model_name, bucket_field, truncate in grains:
+        Rollup = apps.get_model("analytics", model_name)
+        rows = (
+            confirmed.annotate(bucket=truncate)
+            .values("bucket", "booking__event_id")
+            .annotate(tickets=Count("id"))
+            .order_by()
+        )
+        for row in rows.iterator():
+            Rollup.objects.filter(
+                event_id=row["booking__event_id"],
+                provider="",
+                currency="",
+                **{bucket_field: row["bucket"]},
+            ).update(tickets_confirmed=row["tickets"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_attendee_identity_retention'),
+        ('tickets', '0007_booking_delivery_method'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='tickets_confirmed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='tickets_confirmed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_tickets_confirmed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:12
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_revenue_usd(apps, schema_editor):
+    EventRevenueRollup = apps.get_model("analytics", "EventRevenueRollup")
+    ExchangeRate = apps.get_model("analytics", "ExchangeRate")
+    buckets = (
+        EventRevenueRollup.objects.values_list("currency", "date")
+        .order_by()
+        .distinct()
+    )
+    for currency, day in buckets.iterator():
+        rate = (
+            ExchangeRate.objects.filter(currency=currency, effective_date__lte=day)
+            .order_by("-effective_date")
+            .values_list("rate_to_usd", flat=True)
+            .first()
+        ) or Decimal("1.00")
+        EventRevenueRollup.objects.filter(currency=currency, date=day).update(
+            gross_usd=F("gross") * rate,
+            fees_usd=F("fees") * rate,
+            refunds_usd=F("refunds") * rate,
+            net_usd=F("net") * rate,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_rollup_tickets_confirmed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='refunds',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='refunds_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='refunds',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='hourlyrollup',
+            name='refunds_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='eventrevenuerollup',
+            name='fees_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='eventrevenuerollup',
+            name='gross_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='eventrevenuerollup',
+            name='net_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='eventrevenuerollup',
+            name='refunds_usd',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.RunPython(backfill_revenue_usd, migrations.RunPython.noop),
+    ]
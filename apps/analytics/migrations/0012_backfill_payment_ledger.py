@@ -0,0 +1,28 @@
+from django.db import migrations
+
+REVENUE_PAYMENT_STATUSES = ["CONFIRMED", "REFUNDED"]
+
+
+def backfill_payment_ledger(apps, schema_editor):
+    MetricsLedger = apps.get_model("analytics", "MetricsLedger")
+    Payment = apps.get_model("payments", "Payment")
+    payments = Payment.objects.filter(booking__event__isnull=False)
+    rows = []
+    for pk, status in payments.values_list("pk", "status").iterator():
+        rows.append(MetricsLedger(source=f"rollup.payment.{status}", object_id=pk))
+        if status in REVENUE_PAYMENT_STATUSES:
+            rows.append(MetricsLedger(source="revenue.payment", object_id=pk))
+            rows.append(MetricsLedger(source="funnel.confirmed", object_id=pk))
+    MetricsLedger.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0011_rollup_refunds_revenue_usd'),
+        ('payments', '0010_payment_idempotency_key_alter_invoice_pdf_file_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_payment_ledger, migrations.RunPython.noop),
+    ]
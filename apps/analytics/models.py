@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from decimal import Decimal
 
@@ -51,6 +52,7 @@ class EventMetrics(models.Model):
     )
     page_views = models.IntegerField(default=0)
     unique_visitors = models.IntegerField(default=0)
+    checkout_visitors = models.IntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -128,3 +130,267 @@ class OrganizationMetrics(models.Model):
 
     def __str__(self):
         return f"Metrics for {self.organization.name}"
+
+
+class EventRevenueRollup(models.Model):
+    event = models.ForeignKey(
+        "events.Event", on_delete=models.CASCADE, related_name="revenue_rollups"
+    )
+    organization = models.ForeignKey(
+        "orgs.Organization", on_delete=models.CASCADE, related_name="revenue_rollups"
+    )
+    date = models.DateField()
+    provider = models.CharField(max_length=20)
+    currency = models.CharField(max_length=3, default="XAF")
+    gross = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    fees = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    refunds = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    net = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    gross_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    fees_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    refunds_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    net_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    orders_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Event Revenue Rollup"
+        verbose_name_plural = "Event Revenue Rollups"
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "date", "provider", "currency"],
+                name="unique_event_revenue_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["event", "date"]),
+            models.Index(fields=["organization", "date"]),
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"Revenue for event #{self.event_id} on {self.date} ({self.provider})"
+
+
+class EventSalesBucket(models.Model):
+    event = models.ForeignKey(
+        "events.Event", on_delete=models.CASCADE, related_name="sales_buckets"
+    )
+    ticket_type = models.ForeignKey(
+        "tickets.TicketType", on_delete=models.CASCADE, related_name="sales_buckets"
+    )
+    hour = models.DateTimeField()
+    tickets = models.IntegerField(default=0)
+    gross = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    orders = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Event Sales Bucket"
+        verbose_name_plural = "Event Sales Buckets"
+        ordering = ["-hour"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "ticket_type", "hour"],
+                name="unique_event_sales_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["event", "hour"]),
+        ]
+
+    def __str__(self):
+        return f"Sales for event #{self.event_id} at {self.hour}"
+
+
+class MetricsLedger(models.Model):
+    source = models.CharField(max_length=40)
+    object_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Metrics Ledger Entry"
+        verbose_name_plural = "Metrics Ledger"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "object_id"], name="unique_metrics_ledger_entry"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source} #{self.object_id}"
+
+
+class ExchangeRate(models.Model):
+    currency = models.CharField(max_length=3)
+    rate_to_usd = models.DecimalField(max_digits=18, decimal_places=8)
+    effective_date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Exchange Rate"
+        verbose_name_plural = "Exchange Rates"
+        ordering = ["currency", "-effective_date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency", "effective_date"],
+                name="unique_exchange_rate_per_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"1 {self.currency} = {self.rate_to_usd} USD from {self.effective_date}"
+
+
+class AnalyticsRollup(models.Model):
+    organization = models.ForeignKey("orgs.Organization", on_delete=models.CASCADE)
+    event = models.ForeignKey("events.Event", on_delete=models.CASCADE)
+    provider = models.CharField(max_length=20, blank=True, default="")
+    currency = models.CharField(max_length=3, blank=True, default="")
+    orders = models.IntegerField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+    tickets_confirmed = models.IntegerField(default=0)
+    tickets_checked_in = models.IntegerField(default=0)
+    payments_pending = models.IntegerField(default=0)
+    payments_confirmed = models.IntegerField(default=0)
+    payments_failed = models.IntegerField(default=0)
+    payments_expired = models.IntegerField(default=0)
+    payments_refunded = models.IntegerField(default=0)
+    gross = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    fees = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    pending_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    failed_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    refunds = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    gross_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    fees_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    pending_amount_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    failed_amount_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    refunds_usd = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class HourlyRollup(AnalyticsRollup):
+    hour = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Hourly Rollup"
+        verbose_name_plural = "Hourly Rollups"
+        ordering = ["-hour"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "event", "provider", "currency"],
+                name="unique_hourly_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["hour"]),
+            models.Index(fields=["organization", "hour"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup for event #{self.event_id} at {self.hour}"
+
+
+class DailyRollup(AnalyticsRollup):
+    date = models.DateField()
+
+    class Meta:
+        verbose_name = "Daily Rollup"
+        verbose_name_plural = "Daily Rollups"
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "event", "provider", "currency"],
+                name="unique_daily_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"]),
+            models.Index(fields=["organization", "date"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup for event #{self.event_id} on {self.date}"
+
+
+class AttendeeIdentity(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    email = models.EmailField(blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="attendee_identities",
+    )
+    organizations_count = models.IntegerField(default=0)
+    events_attended = models.IntegerField(default=0)
+    first_seen = models.DateField()
+    last_seen = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Attendee Identity"
+        verbose_name_plural = "Attendee Identities"
+        ordering = ["-last_seen"]
+
+    def __str__(self):
+        return self.key
+
+
+class OrganizationRetention(models.Model):
+    organization = models.OneToOneField(
+        "orgs.Organization", on_delete=models.CASCADE, related_name="retention"
+    )
+    attendees = models.IntegerField(default=0)
+    repeat_attendees = models.IntegerField(default=0)
+    repeat_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, default=Decimal("0.00")
+    )
+    repeat_distribution = models.JSONField(default=dict)
+    cohorts = models.JSONField(default=list)
+    generated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Organization Retention"
+        verbose_name_plural = "Organization Retention"
+
+    def __str__(self):
+        return f"Retention for {self.organization.name}"
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .models import DailyRollup, OrganizationMetrics, OrganizationRetention
+from .rollups import daily_series
+from .versions import org_data_version
+
+ORG_ANALYTICS_KEY = "org_analytics:2:{}:{}:{}:{}"
+ORG_ANALYTICS_TIMEOUT = 6 * 3600
+ORG_ANALYTICS_PERIODS = (7, 30, 90, 365)
+TOP_EVENTS_LIMIT = 5
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def _delta(current, previous):
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 1)
+
+
+def _periods(days):
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    return start, start - timedelta(days=days)
+
+
+def build_org_analytics(organization, days=30):
+    start, previous_start = _periods(days)
+    rollups = DailyRollup.objects.filter(organization=organization)
+    current = Q(date__gte=start)
+    previous = Q(date__gte=previous_start, date__lt=start)
+    native = Q(currency=organization.currency)
+
+    totals = rollups.aggregate(
+        revenue=Sum("gross", filter=native),
+        revenue_usd=Sum("gross_usd"),
+        tickets=Sum("tickets_confirmed"),
+        checkins=Sum("tickets_checked_in"),
+        period_revenue=Sum("gross", filter=native & current),
+        previous_revenue=Sum("gross", filter=native & previous),
+        period_tickets=Sum("tickets_confirmed", filter=current),
+        previous_tickets=Sum("tickets_confirmed", filter=previous),
+        period_orders=Sum("orders", filter=current),
+        previous_orders=Sum("orders", filter=previous),
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+
+    top_events = (
+        rollups.values("event_id", title=F("event__title"), slug=F("event__slug"))
+        .annotate(
+            revenue=Sum("gross", filter=native),
+            revenue_usd=Sum("gross_usd"),
+            tickets=Sum("tickets_confirmed"),
+            checkins=Sum("tickets_checked_in"),
+        )
+        .order_by(F("revenue").desc(nulls_last=True), "event_id")[:TOP_EVENTS_LIMIT]
+    )
+
+    trend = daily_series(
+        rollups.filter(current), "gross", "tickets_confirmed", "orders"
+    )
+    metrics = OrganizationMetrics.objects.filter(organization=organization).first()
+    retention = OrganizationRetention.objects.filter(organization=organization).first()
+
+    return {
+        "organization": organization.slug,
+        "currency": organization.currency,
+        "days": days,
+        "revenue": {
+            "total": float(totals["revenue"]),
+            "total_usd": float(totals["revenue_usd"]),
+            "period": float(totals["period_revenue"]),
+            "previous": float(totals["previous_revenue"]),
+            "delta": _delta(totals["period_revenue"], totals["previous_revenue"]),
+        },
+        "tickets": {
+            "sold": totals["tickets"],
+            "checked_in": totals["checkins"],
+            "check_in_rate": _rate(totals["checkins"], totals["tickets"]),
+            "period": totals["period_tickets"],
+            "previous": totals["previous_tickets"],
+            "delta": _delta(totals["period_tickets"], totals["previous_tickets"]),
+        },
+        "orders": {
+            "period": totals["period_orders"],
+            "previous": totals["previous_orders"],
+            "delta": _delta(totals["period_orders"], totals["previous_orders"]),
+        },
+        "events": {
+            "total": metrics.total_events if metrics else 0,
+            "active": metrics.active_events if metrics else 0,
+            "completed": metrics.completed_events if metrics else 0,
+        },
+        "retention": {
+            "attendees": retention.attendees if retention else 0,
+            "repeat_attendees": retention.repeat_attendees if retention else 0,
+            "repeat_rate": float(retention.repeat_rate) if retention else 0.0,
+            "repeat_distribution": retention.repeat_distribution if retention else {},
+            "cohorts": retention.cohorts if retention else [],
+        },
+        "top_events": [
+            {
+                "id": row["event_id"],
+                "title": row["title"],
+                "slug": row["slug"],
+                "revenue": float(row["revenue"] or 0),
+                "revenue_usd": float(row["revenue_usd"] or 0),
+                "tickets_sold": row["tickets"],
+                "checked_in": row["checkins"],
+                "check_in_rate": _rate(row["checkins"], row["tickets"]),
+            }
+            for row in top_events
+        ],
+        "trend": [
+            {
+                "date": date.isoformat(),
+                "revenue": float(values["gross"]),
+                "tickets_sold": values["tickets_confirmed"],
+                "orders": values["orders"],
+            }
+            for date, values in trend
+        ],
+        "generated_at": timezone.now().isoformat(),
+    }
+
+
+def get_org_analytics(organization, days=30):
+    cache = caches["analytics"]
+    key = ORG_ANALYTICS_KEY.format(
+        organization.pk,
+        org_data_version(organization.pk),
+        days,
+        timezone.localdate().isoformat(),
+    )
+    data = cache.get(key)
+    if data is None:
+        data = build_org_analytics(organization, days)
+        cache.set(key, data, ORG_ANALYTICS_TIMEOUT)
+    return data
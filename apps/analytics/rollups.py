@@ -0,0 +1,443 @@
+from collections import defaultdict
+from datetime import datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate, TruncHour
+from django.utils import timezone
+
+from apps.payments.models import Payment, Refund
+from apps.tickets.models import Booking, Ticket
+from .buffer import apply_rollup_deltas, buffer_rollups, rebuilding_from_source
+from .models import DailyRollup, HourlyRollup, MetricsLedger
+from .services import (
+    REVENUE_PAYMENT_STATUSES,
+    claim_metrics_source,
+    release_metrics_source,
+    sync_metrics_sources,
+)
+from .utils import convert_to_usd, usd_amount
+from .versions import bump_org_data_version_on_commit
+
+ZERO = Decimal("0.00")
+
+ROLLUP_COUNTS = (
+    "orders",
+    "tickets_sold",
+    "tickets_confirmed",
+    "tickets_checked_in",
+    "payments_pending",
+    "payments_confirmed",
+    "payments_failed",
+    "payments_expired",
+    "payments_refunded",
+)
+ROLLUP_AMOUNTS = (
+    "gross",
+    "fees",
+    "pending_amount",
+    "failed_amount",
+    "refunds",
+    "gross_usd",
+    "fees_usd",
+    "pending_amount_usd",
+    "failed_amount_usd",
+    "refunds_usd",
+)
+ROLLUP_MEASURES = ROLLUP_COUNTS + ROLLUP_AMOUNTS
+
+
+def _measure_alias(field):
+    return f"m_{field}"
+
+
+PAYMENT_STATUS_MEASURES = {
+    Payment.Status.PENDING: ("payments_pending", "pending_amount"),
+    Payment.Status.CONFIRMED: ("payments_confirmed", "gross"),
+    Payment.Status.FAILED: ("payments_failed", "failed_amount"),
+    Payment.Status.EXPIRED: ("payments_expired", None),
+    Payment.Status.REFUNDED: ("payments_refunded", "gross"),
+}
+
+
+def _rollup_hour(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+ROLLUP_GRAINS = {
+    "hour": (
+        HourlyRollup,
+        "hour",
+        _rollup_hour,
+        TruncHour,
+        {"tzinfo": dt_timezone.utc},
+    ),
+    "day": (DailyRollup, "date", timezone.localdate, TruncDate, {}),
+}
+
+
+def apply_rollup_delta(
+    moment, organization_id, event_id, provider="", currency="", **deltas
+):
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    buckets = {
+        grain: bucket(moment) for grain, (_, _, bucket, _, _) in ROLLUP_GRAINS.items()
+    }
+    args = (buckets, organization_id, event_id, provider, currency, deltas)
+    if settings.ANALYTICS_METRICS_BUFFER:
+        transaction.on_commit(lambda: buffer_rollups(*args))
+    else:
+        apply_rollup_deltas(*args)
+        bump_org_data_version_on_commit(organization_id)
+
+
+def _payment_moment(payment, status):
+    if status in REVENUE_PAYMENT_STATUSES:
+        return payment.confirmed_at or payment.created_at
+    return payment.created_at
+
+
+def _payment_deltas(payment, status, sign, moment):
+    count_field, amount_field = PAYMENT_STATUS_MEASURES[status]
+    deltas = {count_field: sign}
+    amounts = {}
+    if amount_field:
+        amounts[amount_field] = payment.amount
+    if status in REVENUE_PAYMENT_STATUSES:
+        amounts["fees"] = payment.service_fee or ZERO
+    day = timezone.localdate(moment)
+    for field, amount in amounts.items():
+        deltas[field] = sign * amount
+        deltas[f"{field}_usd"] = sign * convert_to_usd(amount, payment.currency, day)
+    return deltas
+
+
+def _payment_status_source(status):
+    return f"rollup.payment.{status}"
+
+
+def record_payment_rollup(payment, old_status=None):
+    event = payment.booking.event
+    if not event or payment.status == old_status:
+        return
+    buckets = defaultdict(dict)
+    for status, sign, moved in (
+        (payment.status, 1, claim_metrics_source),
+        (old_status, -1, release_metrics_source),
+    ):
+        if not status or not moved(_payment_status_source(status), payment.pk):
+            continue
+        moment = _payment_moment(payment, status)
+        deltas = buckets[moment]
+        for field, value in _payment_deltas(payment, status, sign, moment).items():
+            deltas[field] = deltas.get(field, 0) + value
+    for moment, deltas in buckets.items():
+        apply_rollup_delta(
+            moment,
+            event.organization_id,
+            event.id,
+            provider=payment.provider,
+            currency=payment.currency,
+            **deltas,
+        )
+
+
+def record_refund_rollup(refund):
+    payment = refund.payment
+    event = payment.booking.event
+    if not event:
+        return
+    moment = refund.processed_at or refund.updated_at
+    apply_rollup_delta(
+        moment,
+        event.organization_id,
+        event.id,
+        provider=payment.provider,
+        currency=payment.currency,
+        refunds=refund.amount,
+        refunds_usd=convert_to_usd(
+            refund.amount, payment.currency, timezone.localdate(moment)
+        ),
+    )
+
+
+def record_booking_rollup(booking):
+    if booking.event_id:
+        apply_rollup_delta(
+            booking.created_at,
+            booking.event.organization_id,
+            booking.event_id,
+            orders=1,
+        )
+
+
+def record_ticket_rollup(ticket):
+    booking = ticket.booking
+    if booking.event_id:
+        apply_rollup_delta(
+            booking.created_at,
+            booking.event.organization_id,
+            booking.event_id,
+            tickets_sold=1,
+            tickets_confirmed=int(booking.status == Booking.Status.CONFIRMED),
+        )
+
+
+def record_booking_status_rollup(booking, old_status):
+    is_confirmed = booking.status == Booking.Status.CONFIRMED
+    was_confirmed = old_status == Booking.Status.CONFIRMED
+    if not booking.event_id or is_confirmed == was_confirmed:
+        return
+    tickets = booking.tickets.count()
+    apply_rollup_delta(
+        booking.created_at,
+        booking.event.organization_id,
+        booking.event_id,
+        tickets_confirmed=tickets if is_confirmed else -tickets,
+    )
+
+
+def record_checkin_rollup(ticket):
+    booking = ticket.booking
+    if not booking.event_id:
+        return
+    if claim_metrics_source("rollup.checked_in", ticket.pk):
+        apply_rollup_delta(
+            ticket.checked_in_at,
+            booking.event.organization_id,
+            booking.event_id,
+            tickets_checked_in=1,
+        )
+
+
+def _fact_sources():
+    payment_measures = {
+        count_field: Case(When(status=status, then=Value(1)), default=Value(0))
+        for status, (count_field, _) in PAYMENT_STATUS_MEASURES.items()
+    }
+    amounts = defaultdict(list)
+    for status, (_, amount_field) in PAYMENT_STATUS_MEASURES.items():
+        if amount_field:
+            amounts[amount_field, "amount"].append(status)
+    amounts["fees", "service_fee"] = REVENUE_PAYMENT_STATUSES
+    for (field, source), statuses in amounts.items():
+        payment_measures[field] = Case(
+            When(status__in=statuses, then=F(source)), default=Value(ZERO)
+        )
+        payment_measures[f"{field}_usd"] = Case(
+            When(
+                status__in=statuses,
+                then=usd_amount(source, on="rollup_moment"),
+            ),
+            default=Value(ZERO),
+        )
+    payment_moment = Case(
+        When(
+            status__in=REVENUE_PAYMENT_STATUSES,
+            then=Coalesce("confirmed_at", "created_at"),
+        ),
+        default=F("created_at"),
+    )
+    return [
+        (
+            Booking.objects.filter(event__isnull=False),
+            "created_at",
+            "event",
+            None,
+            {"orders": Value(1)},
+        ),
+        (
+            Ticket.objects.filter(booking__event__isnull=False),
+            "booking__created_at",
+            "booking__event",
+            None,
+            {
+                "tickets_sold": Value(1),
+                "tickets_confirmed": Case(
+                    When(booking__status=Booking.Status.CONFIRMED, then=Value(1)),
+                    default=Value(0),
+                ),
+            },
+        ),
+        (
+            Ticket.objects.filter(
+                booking__event__isnull=False, checked_in_at__isnull=False
+            ),
+            "checked_in_at",
+            "booking__event",
+            None,
+            {"tickets_checked_in": Value(1)},
+        ),
+        (
+            Payment.objects.filter(booking__event__isnull=False).annotate(
+                rollup_moment=payment_moment
+            ),
+            "rollup_moment",
+            "booking__event",
+            ("provider", "currency"),
+            payment_measures,
+        ),
+        (
+            Refund.objects.filter(
+                status=Refund.Status.PROCESSED,
+                payment__booking__event__isnull=False,
+            ).annotate(rollup_moment=Coalesce("processed_at", "updated_at")),
+            "rollup_moment",
+            "payment__booking__event",
+            ("payment__provider", "payment__currency"),
+            {
+                "refunds": F("amount"),
+                "refunds_usd": usd_amount(
+                    currency="payment__currency", on="rollup_moment"
+                ),
+            },
+        ),
+    ]
+
+
+def _facts_sql(truncate, truncate_options, since):
+    money = DecimalField(max_digits=14, decimal_places=2)
+    columns = [
+        "bucket",
+        "rollup_organization",
+        "rollup_event",
+        "rollup_provider",
+        "rollup_currency",
+        *map(_measure_alias, ROLLUP_MEASURES),
+    ]
+    querysets = []
+    for queryset, moment, event, payment_fields, measures in _fact_sources():
+        if since:
+            queryset = queryset.filter(**{f"{moment}__gte": since})
+        provider, currency = (
+            [F(field) for field in payment_fields]
+            if payment_fields
+            else [Value("")] * 2
+        )
+        annotations = {
+            "bucket": truncate(moment, **truncate_options),
+            "rollup_organization": F(f"{event}__organization_id"),
+            "rollup_event": F(f"{event}_id"),
+            "rollup_provider": provider,
+            "rollup_currency": currency,
+        }
+        for field in ROLLUP_MEASURES:
+            if field in measures:
+                annotations[_measure_alias(field)] = measures[field]
+            elif field in ROLLUP_AMOUNTS:
+                annotations[_measure_alias(field)] = Value(ZERO, output_field=money)
+            else:
+                annotations[_measure_alias(field)] = Value(0)
+        querysets.append(queryset.annotate(**annotations).order_by().values(*columns))
+    facts = querysets[0].union(*querysets[1:], all=True)
+    return facts.query.sql_with_params()
+
+
+def _insert_rollups(model, bucket_field, truncate, truncate_options, since):
+    qn = connection.ops.quote_name
+    facts_sql, params = _facts_sql(truncate, truncate_options, since)
+    group = [
+        "bucket",
+        "rollup_organization",
+        "rollup_event",
+        "rollup_provider",
+        "rollup_currency",
+    ]
+    target = [
+        bucket_field,
+        "organization_id",
+        "event_id",
+        "provider",
+        "currency",
+        *ROLLUP_MEASURES,
+        "updated_at",
+    ]
+    group_sql = ", ".join(qn(column) for column in group)
+    sums_sql = ", ".join(
+        f"SUM({qn(_measure_alias(field))})" for field in ROLLUP_MEASURES
+    )
+    sql = (
+        f"INSERT INTO {qn(model._meta.db_table)} "
+        f"({', '.join(qn(column) for column in target)}) "
+        f"SELECT {group_sql}, {sums_sql}, %s "
+        f"FROM ({facts_sql}) facts GROUP BY {group_sql}"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (now, *params))
+        return cursor.rowcount
+
+
+def rebuild_rollups(since=None):
+    start = None
+    if since:
+        start = timezone.make_aware(datetime.combine(since, time.min))
+    with rebuilding_from_source({"hour": start, "day": since}):
+        return _rebuild_rollups(since, start)
+
+
+def _rebuild_rollups(since, start):
+    checked_in = Ticket.objects.filter(
+        booking__event__isnull=False, checked_in_at__isnull=False
+    )
+    if start:
+        checked_in = checked_in.filter(checked_in_at__gte=start)
+    ledger = [
+        MetricsLedger(source="rollup.checked_in", object_id=pk)
+        for pk in checked_in.values_list("pk", flat=True).iterator()
+    ]
+    counts = {}
+    with transaction.atomic():
+        for grain, (model, bucket_field, _, truncate, options) in ROLLUP_GRAINS.items():
+            existing = model.objects.all()
+            if since:
+                lookup = since if bucket_field == "date" else start
+                existing = existing.filter(**{f"{bucket_field}__gte": lookup})
+            existing.delete()
+            counts[grain] = _insert_rollups(
+                model, bucket_field, truncate, options, start
+            )
+        MetricsLedger.objects.bulk_create(
+            ledger, batch_size=1000, ignore_conflicts=True
+        )
+        for status in Payment.Status.values:
+            sync_metrics_sources(
+                _payment_status_source(status),
+                Payment.objects.filter(status=status, booking__event__isnull=False),
+            )
+        for organization_id in (
+            DailyRollup.objects.values_list("organization_id", flat=True)
+            .order_by()
+            .distinct()
+        ):
+            bump_org_data_version_on_commit(organization_id)
+    return counts
+
+
+def rollup_totals(rollups, *fields):
+    totals = rollups.aggregate(**{f"total_{field}": Sum(field) for field in fields})
+    return {field: totals[f"total_{field}"] or 0 for field in fields}
+
+
+def usd_totals(rollups, *fields):
+    totals = rollup_totals(rollups, *(f"{field}_usd" for field in fields))
+    return {field: totals[f"{field}_usd"] or ZERO for field in fields}
+
+
+def daily_series(rollups, *fields, usd=False):
+    columns = {field: f"{field}_usd" if usd else field for field in fields}
+    rows = (
+        rollups.values("date")
+        .annotate(
+            **{f"total_{field}": Sum(column) for field, column in columns.items()}
+        )
+        .order_by("date")
+    )
+    return [
+        (row["date"], {field: row[f"total_{field}"] or 0 for field in fields})
+        for row in rows
+    ]
@@ -0,0 +1,774 @@
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import (
+    Coalesce,
+    TruncDate,
+    TruncDay,
+    TruncHour,
+    TruncWeek,
+)
+from django.utils import timezone
+
+from apps.payments.models import Payment, Refund
+from apps.tickets.models import Booking, Ticket
+from apps.events.models import Event
+from .buffer import (
+    METRIC_SCOPES,
+    apply_metrics_delta,
+    buffer_metrics,
+    rebuilding_from_source,
+)
+from .models import (
+    DailyMetrics,
+    EventMetrics,
+    EventRevenueRollup,
+    EventSalesBucket,
+    MetricsLedger,
+    OrganizationMetrics,
+    PaymentMetrics,
+)
+from .utils import convert_to_usd
+
+REVENUE_PAYMENT_STATUSES = [Payment.Status.CONFIRMED, Payment.Status.REFUNDED]
+COMPLETED_EVENT_STATES = [Event.State.CLOSED, Event.State.ARCHIVED]
+
+ZERO = Decimal("0.00")
+
+REBUILT_METRIC_FIELDS = {
+    "event": [
+        "total_revenue",
+        "platform_fees",
+        "net_revenue",
+        "tickets_sold",
+        "tickets_checked_in",
+        "orders_count",
+    ],
+    "org": [
+        "total_revenue",
+        "total_fees_paid",
+        "net_revenue",
+        "total_tickets_sold",
+        "total_events",
+        "active_events",
+        "completed_events",
+    ],
+    "daily": [
+        "total_revenue",
+        "platform_fees",
+        "net_revenue",
+        "tickets_sold",
+        "orders_count",
+        "events_created",
+    ],
+}
+
+SALES_ZOOMS = {"hour": TruncHour, "day": TruncDay, "week": TruncWeek}
+
+
+def _revenue_day(*moments):
+    for moment in moments:
+        if moment:
+            return timezone.localdate(moment)
+    return timezone.localdate()
+
+
+def apply_revenue_delta(
+    event_id,
+    organization_id,
+    day,
+    provider,
+    currency,
+    gross=ZERO,
+    fees=ZERO,
+    refunds=ZERO,
+    orders=0,
+):
+    rollup, _ = EventRevenueRollup.objects.get_or_create(
+        event_id=event_id,
+        date=day,
+        provider=provider,
+        currency=currency,
+        defaults={"organization_id": organization_id},
+    )
+    usd = {
+        field: convert_to_usd(amount, currency, day)
+        for field, amount in (("gross", gross), ("fees", fees), ("refunds", refunds))
+    }
+    EventRevenueRollup.objects.filter(pk=rollup.pk).update(
+        gross=F("gross") + gross,
+        fees=F("fees") + fees,
+        refunds=F("refunds") + refunds,
+        net=F("net") + (gross - fees - refunds),
+        gross_usd=F("gross_usd") + usd["gross"],
+        fees_usd=F("fees_usd") + usd["fees"],
+        refunds_usd=F("refunds_usd") + usd["refunds"],
+        net_usd=F("net_usd") + (usd["gross"] - usd["fees"] - usd["refunds"]),
+        orders_count=F("orders_count") + orders,
+        updated_at=timezone.now(),
+    )
+
+
+def record_payment_revenue(payment, sign=1):
+    event = payment.booking.event
+    moved = claim_metrics_source if sign > 0 else release_metrics_source
+    if not event or not moved("revenue.payment", payment.pk):
+        return
+    apply_revenue_delta(
+        event_id=event.id,
+        organization_id=event.organization_id,
+        day=_revenue_day(payment.confirmed_at, payment.created_at),
+        provider=payment.provider,
+        currency=payment.currency,
+        gross=sign * payment.amount,
+        fees=sign * (payment.service_fee or ZERO),
+        orders=sign,
+    )
+
+
+def record_refund_revenue(refund):
+    payment = refund.payment
+    event = payment.booking.event
+    if not event:
+        return
+    apply_revenue_delta(
+        event_id=event.id,
+        organization_id=event.organization_id,
+        day=_revenue_day(refund.processed_at, refund.updated_at),
+        provider=payment.provider,
+        currency=payment.currency,
+        refunds=refund.amount,
+    )
+
+
+def rebuild_revenue_rollups(event_ids=None):
+    payments = Payment.objects.filter(
+        status__in=REVENUE_PAYMENT_STATUSES, booking__event__isnull=False
+    )
+    refunds = Refund.objects.filter(
+        status=Refund.Status.PROCESSED, payment__booking__event__isnull=False
+    )
+    existing = EventRevenueRollup.objects.all()
+    scope = None
+    if event_ids is not None:
+        payments = payments.filter(booking__event_id__in=event_ids)
+        refunds = refunds.filter(payment__booking__event_id__in=event_ids)
+        existing = existing.filter(event_id__in=event_ids)
+        scope = Payment.objects.filter(booking__event_id__in=event_ids)
+
+    buckets = defaultdict(
+        lambda: {"gross": ZERO, "fees": ZERO, "refunds": ZERO, "orders_count": 0}
+    )
+    organizations = {}
+
+    payment_rows = (
+        payments.annotate(day=TruncDate(Coalesce("confirmed_at", "created_at")))
+        .values(
+            "booking__event_id",
+            "booking__event__organization_id",
+            "day",
+            "provider",
+            "currency",
+        )
+        .annotate(gross=Sum("amount"), fees=Sum("service_fee"), orders=Count("id"))
+        .order_by()
+    )
+    for row in payment_rows:
+        key = (
+            row["booking__event_id"],
+            row["day"],
+            row["provider"],
+            row["currency"],
+        )
+        organizations[row["booking__event_id"]] = row["booking__event__organization_id"]
+        buckets[key]["gross"] += row["gross"] or ZERO
+        buckets[key]["fees"] += row["fees"] or ZERO
+        buckets[key]["orders_count"] += row["orders"]
+
+    refund_rows = (
+        refunds.annotate(day=TruncDate(Coalesce("processed_at", "updated_at")))
+        .values(
+            "payment__booking__event_id",
+            "payment__booking__event__organization_id",
+            "day",
+            "payment__provider",
+            "payment__currency",
+        )
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for row in refund_rows:
+        key = (
+            row["payment__booking__event_id"],
+            row["day"],
+            row["payment__provider"],
+            row["payment__currency"],
+        )
+        organizations[row["payment__booking__event_id"]] = row[
+            "payment__booking__event__organization_id"
+        ]
+        buckets[key]["refunds"] += row["total"] or ZERO
+
+    rollups = []
+    for (event_id, day, provider, currency), values in buckets.items():
+        usd = {
+            field: convert_to_usd(values[field], currency, day)
+            for field in ("gross", "fees", "refunds")
+        }
+        rollups.append(
+            EventRevenueRollup(
+                event_id=event_id,
+                organization_id=organizations[event_id],
+                date=day,
+                provider=provider,
+                currency=currency,
+                gross=values["gross"],
+                fees=values["fees"],
+                refunds=values["refunds"],
+                net=values["gross"] - values["fees"] - values["refunds"],
+                gross_usd=usd["gross"],
+                fees_usd=usd["fees"],
+                refunds_usd=usd["refunds"],
+                net_usd=usd["gross"] - usd["fees"] - usd["refunds"],
+                orders_count=values["orders_count"],
+            )
+        )
+
+    with transaction.atomic():
+        existing.delete()
+        EventRevenueRollup.objects.bulk_create(rollups, batch_size=1000)
+        sync_metrics_sources("revenue.payment", payments, scope)
+    return len(rollups)
+
+
+def _revenue_totals(rollups):
+    totals = rollups.aggregate(
+        gross=Sum("gross"),
+        fees=Sum("fees"),
+        refunds=Sum("refunds"),
+        net=Sum("net"),
+        orders_count=Sum("orders_count"),
+    )
+    return {
+        "gross": totals["gross"] or ZERO,
+        "fees": totals["fees"] or ZERO,
+        "refunds": totals["refunds"] or ZERO,
+        "net": totals["net"] or ZERO,
+        "orders_count": totals["orders_count"] or 0,
+    }
+
+
+def get_event_revenue(event_id, start_date=None, end_date=None):
+    rollups = EventRevenueRollup.objects.filter(event_id=event_id)
+    if start_date:
+        rollups = rollups.filter(date__gte=start_date)
+    if end_date:
+        rollups = rollups.filter(date__lte=end_date)
+    return _revenue_totals(rollups)
+
+
+def get_organization_revenue(organization_ids, start_date=None, end_date=None):
+    rollups = EventRevenueRollup.objects.filter(organization_id__in=organization_ids)
+    if start_date:
+        rollups = rollups.filter(date__gte=start_date)
+    if end_date:
+        rollups = rollups.filter(date__lte=end_date)
+    return _revenue_totals(rollups)
+
+
+def get_event_revenue_by_provider(event_id):
+    return list(
+        EventRevenueRollup.objects.filter(event_id=event_id)
+        .values("provider")
+        .annotate(count=Sum("orders_count"), total=Sum("gross"))
+        .order_by("-total")
+    )
+
+
+def event_revenue_subquery(field="gross"):
+    return Subquery(
+        EventRevenueRollup.objects.filter(event_id=OuterRef("pk"))
+        .values("event_id")
+        .annotate(total=Sum(field))
+        .values("total")[:1]
+    )
+
+
+def _sales_hour(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _booking_sales_lines(booking_ids):
+    lines = defaultdict(list)
+    rows = (
+        Ticket.objects.filter(booking_id__in=booking_ids)
+        .values("booking_id", "ticket_type_id")
+        .annotate(
+            tickets=Count("id"), listed=Sum("ticket_type__price"), first=Min("id")
+        )
+        .order_by("booking_id", "first")
+    )
+    for row in rows:
+        lines[row["booking_id"]].append(row)
+    return lines
+
+
+def _booking_sales_deltas(total_amount, refunded, lines):
+    listed = sum((line["listed"] or ZERO for line in lines), ZERO)
+    adjustment = total_amount - refunded - listed
+    return [
+        (
+            line["ticket_type_id"],
+            line["tickets"],
+            (line["listed"] or ZERO) + (adjustment if index == 0 else ZERO),
+            1 if index == 0 else 0,
+        )
+        for index, line in enumerate(lines)
+    ]
+
+
+def _partial_refunds(bookings):
+    return dict(
+        Refund.objects.filter(
+            payment__booking__in=bookings,
+            status=Refund.Status.PROCESSED,
+            refund_type=Refund.Type.PARTIAL,
+        )
+        .values("payment__booking_id")
+        .annotate(total=Sum("amount"))
+        .values_list("payment__booking_id", "total")
+    )
+
+
+def apply_sales_delta(event_id, ticket_type_id, hour, tickets=0, gross=ZERO, orders=0):
+    bucket, _ = EventSalesBucket.objects.get_or_create(
+        event_id=event_id, ticket_type_id=ticket_type_id, hour=hour
+    )
+    EventSalesBucket.objects.filter(pk=bucket.pk).update(
+        tickets=F("tickets") + tickets,
+        gross=F("gross") + gross,
+        orders=F("orders") + orders,
+        updated_at=timezone.now(),
+    )
+
+
+def record_booking_sales(booking, sign=1):
+    if not booking.event_id:
+        return
+    lines = _booking_sales_lines([booking.id])[booking.id]
+    refunded = _partial_refunds([booking.id]).get(booking.id, ZERO)
+    hour = _sales_hour(booking.created_at)
+    for ticket_type_id, tickets, gross, orders in _booking_sales_deltas(
+        booking.total_amount, refunded, lines
+    ):
+        apply_sales_delta(
+            booking.event_id,
+            ticket_type_id,
+            hour,
+            tickets=sign * tickets,
+            gross=sign * gross,
+            orders=sign * orders,
+        )
+
+
+def record_partial_refund_sales(refund):
+    booking = refund.payment.booking
+    if not booking.event_id or booking.status != Booking.Status.CONFIRMED:
+        return
+    lines = _booking_sales_lines([booking.id])[booking.id]
+    if not lines:
+        return
+    apply_sales_delta(
+        booking.event_id,
+        lines[0]["ticket_type_id"],
+        _sales_hour(booking.created_at),
+        gross=-refund.amount,
+    )
+
+
+def rebuild_sales_buckets(event_ids=None, batch_size=1000):
+    bookings = Booking.objects.filter(
+        status=Booking.Status.CONFIRMED, event__isnull=False
+    )
+    existing = EventSalesBucket.objects.all()
+    if event_ids is not None:
+        bookings = bookings.filter(event_id__in=event_ids)
+        existing = existing.filter(event_id__in=event_ids)
+
+    refunded = _partial_refunds(bookings)
+    buckets = defaultdict(lambda: {"tickets": 0, "gross": ZERO, "orders": 0})
+    rows = bookings.order_by("id").values_list(
+        "id", "event_id", "created_at", "total_amount"
+    )
+
+    def flush(batch):
+        lines = _booking_sales_lines([row[0] for row in batch])
+        for booking_id, event_id, created_at, total_amount in batch:
+            hour = _sales_hour(created_at)
+            for ticket_type_id, tickets, gross, orders in _booking_sales_deltas(
+                total_amount, refunded.get(booking_id, ZERO), lines[booking_id]
+            ):
+                bucket = buckets[(event_id, ticket_type_id, hour)]
+                bucket["tickets"] += tickets
+                bucket["gross"] += gross
+                bucket["orders"] += orders
+
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) == batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    sales_buckets = [
+        EventSalesBucket(
+            event_id=event_id, ticket_type_id=ticket_type_id, hour=hour, **values
+        )
+        for (event_id, ticket_type_id, hour), values in buckets.items()
+    ]
+
+    with transaction.atomic():
+        existing.delete()
+        EventSalesBucket.objects.bulk_create(sales_buckets, batch_size=1000)
+    return len(sales_buckets)
+
+
+def get_sales_timeline(event_id, zoom="day", start=None, end=None, ticket_type_id=None):
+    buckets = EventSalesBucket.objects.filter(event_id=event_id)
+    if start:
+        buckets = buckets.filter(hour__gte=start)
+    if end:
+        buckets = buckets.filter(hour__lt=end)
+    if ticket_type_id:
+        buckets = buckets.filter(ticket_type_id=ticket_type_id)
+    return list(
+        buckets.annotate(period=SALES_ZOOMS.get(zoom, TruncDay)("hour"))
+        .values("period")
+        .annotate(tickets=Sum("tickets"), gross=Sum("gross"), orders=Sum("orders"))
+        .order_by("period")
+    )
+
+
+def claim_metrics_source(source, object_id):
+    _, created = MetricsLedger.objects.get_or_create(source=source, object_id=object_id)
+    return created
+
+
+def bump_metrics(model, lookup, **deltas):
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    if settings.ANALYTICS_METRICS_BUFFER:
+        transaction.on_commit(lambda: buffer_metrics(model, lookup, deltas))
+    else:
+        apply_metrics_delta(model, lookup, deltas)
+
+
+def release_metrics_source(source, object_id):
+    deleted, _ = MetricsLedger.objects.filter(
+        source=source, object_id=object_id
+    ).delete()
+    return bool(deleted)
+
+
+def sync_metrics_sources(source, queryset, scope=None):
+    stale = MetricsLedger.objects.filter(source=source)
+    if scope is not None:
+        stale = stale.filter(object_id__in=scope.values("pk"))
+    stale.delete()
+    MetricsLedger.objects.bulk_create(
+        [
+            MetricsLedger(source=source, object_id=pk)
+            for pk in queryset.values_list("pk", flat=True).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+def _bump_payment_revenue(payment, sign):
+    amount = payment.amount * sign
+    fee = (payment.service_fee or ZERO) * sign
+    day = _revenue_day(payment.confirmed_at, payment.created_at)
+    bump_metrics(
+        DailyMetrics,
+        {"date": day},
+        total_revenue=amount,
+        platform_fees=fee,
+        net_revenue=amount - fee,
+    )
+    event = payment.booking.event
+    if event:
+        bump_metrics(
+            EventMetrics,
+            {"event_id": event.id},
+            total_revenue=amount,
+            platform_fees=fee,
+            net_revenue=amount - fee,
+        )
+        bump_metrics(
+            OrganizationMetrics,
+            {"organization_id": event.organization_id},
+            total_revenue=amount,
+            total_fees_paid=fee,
+            net_revenue=amount - fee,
+        )
+
+
+def record_payment_metrics(payment):
+    if not claim_metrics_source("payment.confirmed", payment.pk):
+        return
+    _bump_payment_revenue(payment, 1)
+    fee = payment.service_fee or ZERO
+    PaymentMetrics.objects.get_or_create(
+        payment=payment,
+        defaults={
+            "gateway_fee": ZERO,
+            "platform_fee": fee,
+            "net_amount_to_organizer": payment.amount - fee,
+        },
+    )
+
+
+def record_payment_reversal_metrics(payment):
+    if release_metrics_source("payment.confirmed", payment.pk):
+        _bump_payment_revenue(payment, -1)
+
+
+def record_ticket_created_metrics(ticket, event):
+    if not claim_metrics_source("ticket.created", ticket.pk):
+        return
+    bump_metrics(DailyMetrics, {"date": timezone.localdate()}, tickets_sold=1)
+    if event:
+        bump_metrics(EventMetrics, {"event_id": event.id}, tickets_sold=1)
+        bump_metrics(
+            OrganizationMetrics,
+            {"organization_id": event.organization_id},
+            total_tickets_sold=1,
+        )
+
+
+def record_ticket_checkin_metrics(ticket, event):
+    if event and claim_metrics_source("ticket.checked_in", ticket.pk):
+        bump_metrics(EventMetrics, {"event_id": event.id}, tickets_checked_in=1)
+
+
+def record_booking_created_metrics(booking):
+    if not claim_metrics_source("booking.created", booking.pk):
+        return
+    bump_metrics(DailyMetrics, {"date": timezone.localdate()}, orders_count=1)
+    if booking.event_id:
+        bump_metrics(EventMetrics, {"event_id": booking.event_id}, orders_count=1)
+
+
+def _event_state_counts(state):
+    return {
+        "active_events": int(state == Event.State.PUBLISHED),
+        "completed_events": int(state in COMPLETED_EVENT_STATES),
+    }
+
+
+def record_event_created_metrics(event):
+    bump_metrics(DailyMetrics, {"date": timezone.localdate()}, events_created=1)
+    bump_metrics(
+        OrganizationMetrics,
+        {"organization_id": event.organization_id},
+        total_events=1,
+        **_event_state_counts(event.state),
+    )
+
+
+def record_event_state_metrics(event, old_state):
+    new, old = _event_state_counts(event.state), _event_state_counts(old_state)
+    bump_metrics(
+        OrganizationMetrics,
+        {"organization_id": event.organization_id},
+        **{field: new[field] - old[field] for field in new},
+    )
+
+
+def _grouped(queryset, key, **aggregates):
+    return {
+        row[key]: row
+        for row in queryset.values(key).annotate(**aggregates).order_by()
+    }
+
+
+def rebuild_metrics():
+    with rebuilding_from_source(
+        dict.fromkeys(METRIC_SCOPES), fields=REBUILT_METRIC_FIELDS
+    ):
+        return _rebuild_metrics()
+
+
+def _rebuild_metrics():
+    confirmed = Payment.objects.filter(status=Payment.Status.CONFIRMED)
+
+    payments_by_event = _grouped(
+        confirmed.filter(booking__event__isnull=False),
+        "booking__event_id",
+        revenue=Sum("amount"),
+        fees=Sum("service_fee"),
+    )
+    tickets_by_event = _grouped(
+        Ticket.objects.filter(booking__event__isnull=False),
+        "booking__event_id",
+        sold=Count("id"),
+        checked_in=Count("id", filter=Q(checked_in_at__isnull=False)),
+    )
+    orders_by_event = _grouped(
+        Booking.objects.filter(event__isnull=False), "event_id", orders=Count("id")
+    )
+
+    event_rows = []
+    for event_id in Event.objects.values_list("id", flat=True).iterator():
+        payments = payments_by_event.get(event_id, {})
+        tickets = tickets_by_event.get(event_id, {})
+        revenue = payments.get("revenue") or ZERO
+        fees = payments.get("fees") or ZERO
+        event_rows.append(
+            EventMetrics(
+                event_id=event_id,
+                total_revenue=revenue,
+                platform_fees=fees,
+                net_revenue=revenue - fees,
+                tickets_sold=tickets.get("sold", 0),
+                tickets_checked_in=tickets.get("checked_in", 0),
+                orders_count=orders_by_event.get(event_id, {}).get("orders", 0),
+            )
+        )
+
+    payments_by_org = _grouped(
+        confirmed.filter(booking__event__isnull=False),
+        "booking__event__organization_id",
+        revenue=Sum("amount"),
+        fees=Sum("service_fee"),
+    )
+    tickets_by_org = _grouped(
+        Ticket.objects.filter(booking__event__isnull=False),
+        "booking__event__organization_id",
+        sold=Count("id"),
+    )
+    events_by_org = _grouped(
+        Event.objects.all(),
+        "organization_id",
+        total=Count("id"),
+        active=Count("id", filter=Q(state=Event.State.PUBLISHED)),
+        completed=Count("id", filter=Q(state__in=COMPLETED_EVENT_STATES)),
+    )
+
+    org_rows = []
+    for org_id in set(events_by_org) | set(payments_by_org) | set(tickets_by_org):
+        payments = payments_by_org.get(org_id, {})
+        events = events_by_org.get(org_id, {})
+        revenue = payments.get("revenue") or ZERO
+        fees = payments.get("fees") or ZERO
+        org_rows.append(
+            OrganizationMetrics(
+                organization_id=org_id,
+                total_revenue=revenue,
+                total_fees_paid=fees,
+                net_revenue=revenue - fees,
+                total_tickets_sold=tickets_by_org.get(org_id, {}).get("sold", 0),
+                total_events=events.get("total", 0),
+                active_events=events.get("active", 0),
+                completed_events=events.get("completed", 0),
+            )
+        )
+
+    daily = defaultdict(
+        lambda: {
+            "total_revenue": ZERO,
+            "platform_fees": ZERO,
+            "net_revenue": ZERO,
+            "tickets_sold": 0,
+            "orders_count": 0,
+            "events_created": 0,
+        }
+    )
+    for row in (
+        confirmed.annotate(day=TruncDate(Coalesce("confirmed_at", "created_at")))
+        .values("day")
+        .annotate(revenue=Sum("amount"), fees=Sum("service_fee"))
+        .order_by()
+    ):
+        revenue = row["revenue"] or ZERO
+        fees = row["fees"] or ZERO
+        daily[row["day"]].update(
+            total_revenue=revenue, platform_fees=fees, net_revenue=revenue - fees
+        )
+    for model, created_at, field in (
+        (Ticket, "booking__created_at", "tickets_sold"),
+        (Booking, "created_at", "orders_count"),
+        (Event, "created_at", "events_created"),
+    ):
+        for row in (
+            model.objects.annotate(day=TruncDate(created_at))
+            .values("day")
+            .annotate(total=Count("id"))
+            .order_by()
+        ):
+            daily[row["day"]][field] = row["total"]
+
+    daily_rows = [DailyMetrics(date=day, **values) for day, values in daily.items()]
+    daily_fields = REBUILT_METRIC_FIELDS["daily"]
+
+    ledger = [
+        MetricsLedger(source="payment.confirmed", object_id=pk)
+        for pk in confirmed.values_list("pk", flat=True).iterator()
+    ] + [
+        MetricsLedger(source="ticket.checked_in", object_id=pk)
+        for pk in Ticket.objects.filter(checked_in_at__isnull=False)
+        .values_list("pk", flat=True)
+        .iterator()
+    ]
+    ledger += [
+        MetricsLedger(source="ticket.created", object_id=pk)
+        for pk in Ticket.objects.values_list("pk", flat=True).iterator()
+    ] + [
+        MetricsLedger(source="booking.created", object_id=pk)
+        for pk in Booking.objects.values_list("pk", flat=True).iterator()
+    ]
+
+    with transaction.atomic():
+        EventMetrics.objects.bulk_create(
+            event_rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["event"],
+            update_fields=REBUILT_METRIC_FIELDS["event"],
+        )
+        OrganizationMetrics.objects.bulk_create(
+            org_rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["organization"],
+            update_fields=REBUILT_METRIC_FIELDS["org"],
+        )
+        DailyMetrics.objects.update(**{field: 0 for field in daily_fields})
+        DailyMetrics.objects.bulk_create(
+            daily_rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["date"],
+            update_fields=daily_fields,
+        )
+        MetricsLedger.objects.filter(
+            source__in=[
+                "payment.confirmed",
+                "ticket.checked_in",
+                "ticket.created",
+                "booking.created",
+            ]
+        ).delete()
+        MetricsLedger.objects.bulk_create(ledger, batch_size=1000)
+    return {
+        "events": len(event_rows),
+        "organizations": len(org_rows),
+        "days": len(daily_rows),
+    }
@@ -1,138 +1,159 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.db.models import Sum
-from decimal import Decimal
-from datetime import date
 
-from apps.payments.models import Payment
+from apps.payments.models import Payment, Refund
 from apps.tickets.models import Booking, Ticket
 from apps.events.models import Event
-from .models import DailyMetrics, EventMetrics, PaymentMetrics, OrganizationMetrics
+from .models import ExchangeRate
+from .rollups import (
+    record_booking_rollup,
+    record_booking_status_rollup,
+    record_checkin_rollup,
+    record_payment_rollup,
+    record_refund_rollup,
+    record_ticket_rollup,
+)
+from .services import (
+    REVENUE_PAYMENT_STATUSES,
+    claim_metrics_source,
+    record_booking_created_metrics,
+    record_booking_sales,
+    record_event_created_metrics,
+    record_event_state_metrics,
+    record_partial_refund_sales,
+    record_payment_metrics,
+    record_payment_revenue,
+    record_payment_reversal_metrics,
+    record_refund_revenue,
+    record_ticket_checkin_metrics,
+    record_ticket_created_metrics,
+)
+from .tracking import emit_funnel_event
+from .utils import clear_exchange_rates_cache
+from .versions import bump_org_data_version_on_commit
+
+
+@receiver(post_save, sender=Payment)
+def update_revenue_rollup(sender, instance, created, **kwargs):
+    old_status = instance.previous("status")
+    was_confirmed = old_status == Payment.Status.CONFIRMED
+    if instance.status == Payment.Status.CONFIRMED and not was_confirmed:
+        record_payment_revenue(instance)
+    elif was_confirmed and instance.status not in REVENUE_PAYMENT_STATUSES:
+        record_payment_revenue(instance, sign=-1)
+
+
+@receiver(post_save, sender=Refund)
+def update_refund_revenue_rollup(sender, instance, created, **kwargs):
+    old_status = instance.previous("status")
+    if (
+        instance.status == Refund.Status.PROCESSED
+        and old_status != Refund.Status.PROCESSED
+    ):
+        record_refund_revenue(instance)
+        record_refund_rollup(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_sales_buckets(sender, instance, created, **kwargs):
+    old_status = instance.previous("status")
+    was_confirmed = old_status == Booking.Status.CONFIRMED
+    is_confirmed = instance.status == Booking.Status.CONFIRMED
+    if is_confirmed != was_confirmed:
+        sign = 1 if is_confirmed else -1
+        transaction.on_commit(lambda: record_booking_sales(instance, sign=sign))
+
+
+@receiver(post_save, sender=Refund)
+def update_refund_sales_buckets(sender, instance, created, **kwargs):
+    old_status = instance.previous("status")
+    if (
+        instance.refund_type == Refund.Type.PARTIAL
+        and instance.status == Refund.Status.PROCESSED
+        and old_status != Refund.Status.PROCESSED
+    ):
+        record_partial_refund_sales(instance)
 
 
 @receiver(post_save, sender=Payment)
 def update_payment_metrics(sender, instance, created, **kwargs):
-    if instance.status == "CONFIRMED":
-        today = date.today()
-        daily_metrics, _ = DailyMetrics.objects.get_or_create(date=today)
-
-        if created:
-            daily_metrics.total_revenue += instance.amount
-            daily_metrics.platform_fees += instance.service_fee or Decimal("0.00")
-            daily_metrics.net_revenue = (
-                daily_metrics.total_revenue - daily_metrics.platform_fees
-            )
-            daily_metrics.orders_count += 1
-            daily_metrics.save()
-
-        if hasattr(instance, "booking") and instance.booking and instance.booking.event:
-            event_metrics, _ = EventMetrics.objects.get_or_create(
-                event=instance.booking.event
-            )
-            event_metrics.total_revenue = Payment.objects.filter(
-                booking__event=instance.booking.event, status="CONFIRMED"
-            ).aggregate(Sum("amount"))["amount__sum"] or Decimal("0.00")
-            event_metrics.platform_fees = Payment.objects.filter(
-                booking__event=instance.booking.event, status="CONFIRMED"
-            ).aggregate(Sum("service_fee"))["service_fee__sum"] or Decimal("0.00")
-            event_metrics.net_revenue = (
-                event_metrics.total_revenue - event_metrics.platform_fees
-            )
-            event_metrics.save()
-
-            org_metrics, _ = OrganizationMetrics.objects.get_or_create(
-                organization=instance.booking.event.organization
-            )
-            org_metrics.total_revenue = Payment.objects.filter(
-                booking__event__organization=instance.booking.event.organization,
-                status="CONFIRMED",
-            ).aggregate(Sum("amount"))["amount__sum"] or Decimal("0.00")
-            org_metrics.total_fees_paid = Payment.objects.filter(
-                booking__event__organization=instance.booking.event.organization,
-                status="CONFIRMED",
-            ).aggregate(Sum("service_fee"))["service_fee__sum"] or Decimal("0.00")
-            org_metrics.net_revenue = (
-                org_metrics.total_revenue - org_metrics.total_fees_paid
-            )
-            org_metrics.save()
-
-        if created:
-            PaymentMetrics.objects.create(
-                payment=instance,
-                gateway_fee=Decimal("0.00"),
-                platform_fee=instance.service_fee or Decimal("0.00"),
-                net_amount_to_organizer=instance.amount
-                - (instance.service_fee or Decimal("0.00")),
-            )
+    old_status = instance.previous("status")
+    if (
+        instance.status == Payment.Status.CONFIRMED
+        and old_status != Payment.Status.CONFIRMED
+    ):
+        record_payment_metrics(instance)
+    elif (
+        old_status == Payment.Status.CONFIRMED
+        and instance.status != Payment.Status.CONFIRMED
+    ):
+        record_payment_reversal_metrics(instance)
 
 
 @receiver(post_save, sender=Ticket)
 def update_ticket_metrics(sender, instance, created, **kwargs):
+    event = instance.booking.event
     if created:
-        today = date.today()
-        daily_metrics, _ = DailyMetrics.objects.get_or_create(date=today)
-        daily_metrics.tickets_sold += 1
-        daily_metrics.save()
-
-        if instance.booking and instance.booking.event:
-            event_metrics, _ = EventMetrics.objects.get_or_create(
-                event=instance.booking.event
-            )
-            event_metrics.tickets_sold = Ticket.objects.filter(
-                booking__event=instance.booking.event
-            ).count()
-            event_metrics.save()
-
-            org_metrics, _ = OrganizationMetrics.objects.get_or_create(
-                organization=instance.booking.event.organization
-            )
-            org_metrics.total_tickets_sold = Ticket.objects.filter(
-                booking__event__organization=instance.booking.event.organization
-            ).count()
-            org_metrics.save()
-
+        record_ticket_created_metrics(instance, event)
     if instance.checked_in_at:
-        if instance.booking and instance.booking.event:
-            event_metrics, _ = EventMetrics.objects.get_or_create(
-                event=instance.booking.event
-            )
-            event_metrics.tickets_checked_in = Ticket.objects.filter(
-                booking__event=instance.booking.event, checked_in_at__isnull=False
-            ).count()
-            event_metrics.save()
+        record_ticket_checkin_metrics(instance, event)
 
 
 @receiver(post_save, sender=Booking)
 def update_booking_metrics(sender, instance, created, **kwargs):
     if created:
-        today = date.today()
-        daily_metrics, _ = DailyMetrics.objects.get_or_create(date=today)
-        daily_metrics.orders_count += 1
-        daily_metrics.save()
-
-        if instance.event:
-            event_metrics, _ = EventMetrics.objects.get_or_create(event=instance.event)
-            event_metrics.orders_count = Booking.objects.filter(
-                event=instance.event
-            ).count()
-            event_metrics.save()
+        record_booking_created_metrics(instance)
 
 
 @receiver(post_save, sender=Event)
-def update_event_creation_metrics(sender, instance, created, **kwargs):
+def update_event_metrics(sender, instance, created, **kwargs):
     if created:
-        today = date.today()
-        daily_metrics, _ = DailyMetrics.objects.get_or_create(date=today)
-        daily_metrics.events_created += 1
-        daily_metrics.save()
+        record_event_created_metrics(instance)
+    elif instance.has_changed("state"):
+        record_event_state_metrics(instance, instance.previous("state"))
+
+
+@receiver(post_save, sender=Event)
+def invalidate_organization_analytics(sender, instance, **kwargs):
+    bump_org_data_version_on_commit(instance.organization_id)
+
+
+@receiver(post_save, sender=Payment)
+def update_payment_rollups(sender, instance, created, **kwargs):
+    record_payment_rollup(instance, instance.previous("status"))
 
-        org_metrics, _ = OrganizationMetrics.objects.get_or_create(
-            organization=instance.organization
+
+@receiver(post_save, sender=Payment)
+def track_payment_funnel(sender, instance, created, **kwargs):
+    if instance.status != Payment.Status.CONFIRMED:
+        return
+    if instance.previous("status") == Payment.Status.CONFIRMED:
+        return
+    event_id = instance.booking.event_id
+    if event_id and claim_metrics_source("funnel.confirmed", instance.pk):
+        transaction.on_commit(
+            lambda: emit_funnel_event(event_id, "confirmed"), robust=True
         )
-        org_metrics.total_events = Event.objects.filter(
-            organization=instance.organization
-        ).count()
-        org_metrics.active_events = Event.objects.filter(
-            organization=instance.organization, state="PUBLISHED"
-        ).count()
-        org_metrics.save()
+
+
+@receiver(post_save, sender=Booking)
+def update_booking_rollups(sender, instance, created, **kwargs):
+    if created:
+        record_booking_rollup(instance)
+    else:
+        record_booking_status_rollup(instance, instance.previous("status"))
+
+
+@receiver(post_save, sender=Ticket)
+def update_ticket_rollups(sender, instance, created, **kwargs):
+    if created:
+        record_ticket_rollup(instance)
+    if instance.checked_in_at:
+        record_checkin_rollup(instance)
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def reset_exchange_rates(sender, instance, **kwargs):
+    clear_exchange_rates_cache()
@@ -0,0 +1,47 @@
+import logging
+
+from celery import shared_task
+
+from apps.analytics.buffer import flush_metrics_buffer
+from apps.analytics.cohorts import build_attendee_cohorts
+from apps.analytics.dashboard import refresh_dashboard_snapshot
+from apps.analytics.tracking import consume_funnel_events, fold_visitor_counts
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_metrics_buffer_task():
+    flushed = flush_metrics_buffer()
+    if flushed:
+        logger.info(f"Flushed {flushed} buffered metric counters")
+    return flushed
+
+
+@shared_task
+def refresh_dashboard_snapshot_task():
+    snapshot = refresh_dashboard_snapshot()
+    return snapshot["generated_at"]
+
+
+@shared_task
+def fold_visitor_counts_task():
+    folded = fold_visitor_counts()
+    if folded:
+        logger.info(f"Folded visitor counts for {folded} events")
+    return folded
+
+
+@shared_task
+def consume_funnel_events_task():
+    return consume_funnel_events()
+
+
+@shared_task
+def build_attendee_cohorts_task():
+    counts = build_attendee_cohorts()
+    logger.info(
+        f"Built {counts['identities']} attendee identities and retention for "
+        f"{counts['organizations']} organizations"
+    )
+    return counts
@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime
+from django.utils import timezone
+from apps.analytics.cohorts import build_attendee_cohorts
+from apps.analytics.models import AttendeeIdentity, OrganizationRetention
+from apps.events.models import Event
+from apps.tickets.models import Booking, Ticket, TicketType
+
+
+def _event(organization, year, month):
+    start_at = timezone.make_aware(datetime(year, month, 15, 18))
+    event = Event.objects.create(
+        organization=organization,
+        title=f"Event {year}-{month}",
+        description="Monthly meetup",
+        start_at=start_at,
+        end_at=start_at + timezone.timedelta(hours=3),
+    )
+    ticket_type = TicketType.objects.create(
+        event=event, name="Regular", price=1000, quantity=100
+    )
+    return event, ticket_type
+
+
+def _attend(event, ticket_type, attendee_email="", guest_email="", guest_phone=""):
+    booking = Booking.objects.create(
+        event=event,
+        guest_email=guest_email,
+        guest_phone=guest_phone,
+        status=Booking.Status.CONFIRMED,
+    )
+    Ticket.objects.create(
+        booking=booking, ticket_type=ticket_type, attendee_email=attendee_email
+    )
+
+
+@pytest.mark.django_db
+class TestAttendeeCohorts:
+    def test_builds_identities_and_retention_matrix(self, organization, user):
+        january = _event(organization, 2025, 1)
+        february = _event(organization, 2025, 2)
+        march = _event(organization, 2025, 3)
+
+        _attend(*january, attendee_email=" Ada@Example.com")
+        _attend(*january, guest_email="bob@example.com")
+        _attend(*january, guest_phone="+237 650 000 001")
+        _attend(*february, guest_email="ADA@example.com")
+        _attend(*february, guest_email="carol@example.com")
+        _attend(*march, attendee_email="ada@example.com")
+        _attend(*march, guest_phone="237650000001")
+        pending = Booking.objects.create(event=march[0], guest_email="dan@example.com")
+        Ticket.objects.create(booking=pending, ticket_type=march[1])
+
+        assert build_attendee_cohorts(chunk_size=2) == {
+            "identities": 4,
+            "organizations": 1,
+        }
+
+        ada = AttendeeIdentity.objects.get(key="email:ada@example.com")
+        assert ada.events_attended == 3
+        assert ada.first_seen.month == 1 and ada.last_seen.month == 3
+        assert AttendeeIdentity.objects.filter(key="phone:237650000001").exists()
+
+        retention = OrganizationRetention.objects.get(organization=organization)
+        assert retention.attendees == 4
+        assert retention.repeat_attendees == 2
+        assert str(retention.repeat_rate) == "50.00"
+        assert retention.repeat_distribution == {"1": 2, "2": 1, "3": 1}
+        assert retention.cohorts == [
+            {"cohort": "2025-01", "size": 3, "retention": [100.0, 33.3, 66.7]},
+            {"cohort": "2025-02", "size": 1, "retention": [100.0]},
+        ]
@@ -0,0 +1,52 @@
+import json
+import pytest
+from decimal import Decimal
+from apps.analytics import dashboard, views
+from apps.analytics.models import DailyRollup
+from apps.analytics.tasks import refresh_dashboard_snapshot_task
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestDashboardSnapshot:
+    def test_task_stores_json_snapshot(self, locmem_cache, event):
+        DailyRollup.objects.create(
+            event=event,
+            organization=event.organization,
+            date=timezone.localdate(),
+            provider="CAMPAY",
+            currency="USD",
+            gross=Decimal("120.00"),
+            gross_usd=Decimal("120.00"),
+        )
+
+        refresh_dashboard_snapshot_task()
+
+        snapshot = locmem_cache["analytics"].get(dashboard.DASHBOARD_SNAPSHOT_KEY)
+        assert json.loads(json.dumps(snapshot)) == snapshot
+        assert snapshot["kpi_data"][0]["metric"] == "$120.00"
+        revenue = snapshot["charts"][0]["spec"]["data"][0]
+        assert revenue["x"] == [timezone.localdate().isoformat()]
+        assert revenue["y"] == [120.0]
+
+    def test_callback_serves_cached_snapshot(self, locmem_cache, monkeypatch, rf):
+        locmem_cache["analytics"].set(
+            dashboard.DASHBOARD_SNAPSHOT_KEY, {"kpi_data": ["cached"]}
+        )
+        monkeypatch.setattr(views.refresh_dashboard_snapshot_task, "delay", pytest.fail)
+
+        context = views.dashboard_callback(rf.get("/admin/"), {})
+
+        assert context["kpi_data"] == ["cached"]
+
+    def test_callback_queues_refresh_on_miss(self, locmem_cache, monkeypatch, rf):
+        queued = []
+        monkeypatch.setattr(
+            views.refresh_dashboard_snapshot_task, "delay", lambda: queued.append(1)
+        )
+
+        first = views.dashboard_callback(rf.get("/admin/"), {})
+        second = views.dashboard_callback(rf.get("/admin/"), {})
+
+        assert first["dashboard_pending"] and second["dashboard_pending"]
+        assert len(queued) == 1
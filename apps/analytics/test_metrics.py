@@ -0,0 +1,140 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.utils import timezone
+from apps.analytics.models import DailyMetrics, EventMetrics, OrganizationMetrics
+from apps.events.models import Event
+from apps.payments import signals as payment_signals
+from apps.payments.models import Payment
+from apps.tickets.models import Booking, Ticket
+
+
+@pytest.fixture(autouse=True)
+def no_task_dispatch(monkeypatch):
+    for task in (
+        payment_signals.send_ticket_confirmation_task,
+        payment_signals.send_admin_sale_notifications_task,
+        payment_signals.send_refund_notification_task,
+    ):
+        monkeypatch.setattr(task, "delay", lambda *args, **kwargs: None)
+
+
+@pytest.fixture(autouse=True)
+def unbuffered_metrics(settings):
+    settings.ANALYTICS_METRICS_BUFFER = False
+
+
+@pytest.fixture
+def payment(event, user, ticket_type):
+    booking = Booking.objects.create(event=event, user=user, total_amount=Decimal("5000"))
+    Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+    return Payment.objects.create(
+        booking=booking,
+        amount=Decimal("5000"),
+        service_fee=Decimal("250"),
+        currency="XAF",
+        provider="CAMPAY",
+    )
+
+
+def _metrics(event):
+    return (
+        EventMetrics.objects.get(event=event),
+        OrganizationMetrics.objects.get(organization=event.organization),
+        DailyMetrics.objects.get(date=timezone.localdate()),
+    )
+
+
+def _snapshot(event):
+    event_metrics, org_metrics, daily = _metrics(event)
+    return (
+        event_metrics.total_revenue,
+        event_metrics.tickets_sold,
+        event_metrics.orders_count,
+        org_metrics.total_revenue,
+        org_metrics.total_tickets_sold,
+        org_metrics.total_events,
+        org_metrics.active_events,
+        org_metrics.completed_events,
+        daily.total_revenue,
+        daily.tickets_sold,
+        daily.orders_count,
+        daily.events_created,
+    )
+
+
+@pytest.mark.django_db
+class TestIncrementalMetrics:
+    def test_confirmation_is_applied_once(self, event, payment):
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        payment._old_status = None
+        Payment.objects.get(pk=payment.pk).save()
+        payment.save()
+
+        event_metrics, org_metrics, daily = _metrics(event)
+        assert event_metrics.total_revenue == Decimal("5000")
+        assert event_metrics.net_revenue == Decimal("4750")
+        assert org_metrics.total_fees_paid == Decimal("250")
+        assert daily.total_revenue == Decimal("5000")
+        assert event_metrics.tickets_sold == 1
+        assert event_metrics.orders_count == 1
+
+    def test_checkin_counted_once(self, event, payment):
+        ticket = payment.booking.tickets.get()
+        ticket.is_checked_in = True
+        ticket.checked_in_at = timezone.now()
+        ticket.save()
+        ticket.save()
+
+        assert EventMetrics.objects.get(event=event).tickets_checked_in == 1
+
+    def test_event_state_transitions_move_counts(self, event):
+        def counts():
+            metrics = OrganizationMetrics.objects.get(organization=event.organization)
+            return metrics.total_events, metrics.active_events, metrics.completed_events
+
+        assert counts() == (1, 0, 0)
+        event.state = Event.State.PUBLISHED
+        event.save()
+        event.save()
+        assert counts() == (1, 1, 0)
+        event.state = Event.State.CLOSED
+        event.save()
+        assert counts() == (1, 0, 1)
+
+    def test_rebuild_matches_incremental(self, event, payment):
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        before = _snapshot(event)
+        EventMetrics.objects.update(total_revenue=0, tickets_sold=0)
+        DailyMetrics.objects.update(orders_count=7)
+
+        call_command("rebuild_metrics", stdout=StringIO())
+
+        assert _snapshot(event) == before
+
+    def test_refund_matches_rebuild(self, event, payment):
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        payment.status = Payment.Status.REFUNDED
+        payment.save()
+        payment.save()
+        before = _snapshot(event)
+
+        call_command("rebuild_metrics", stdout=StringIO())
+
+        assert _snapshot(event) == before
+        assert EventMetrics.objects.get(event=event).total_revenue == 0
+
+    def test_retried_created_signals_count_once(self, event, payment):
+        booking = payment.booking
+        ticket = booking.tickets.get()
+        for instance in (booking, ticket):
+            post_save.send(type(instance), instance=instance, created=True)
+
+        metrics = EventMetrics.objects.get(event=event)
+        assert metrics.orders_count == 1
+        assert metrics.tickets_sold == 1
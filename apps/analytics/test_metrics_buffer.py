@@ -0,0 +1,211 @@
+import pytest
+from collections import defaultdict
+from decimal import Decimal
+from apps.analytics import buffer
+from django.utils import timezone
+from apps.analytics.models import DailyRollup, EventMetrics, HourlyRollup, MetricsLedger
+from apps.analytics.rollups import apply_rollup_delta, rebuild_rollups
+from apps.analytics.services import bump_metrics, rebuild_metrics
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def hincrby(self, *args):
+        self.calls.append(args)
+
+    def execute(self):
+        for args in self.calls:
+            self.redis.hincrby(*args)
+
+
+class FakeLock:
+    def __init__(self, redis):
+        self.redis = redis
+
+    def acquire(self, blocking=True):
+        if self.redis.locked:
+            return False
+        self.redis.locked = True
+        return True
+
+    def release(self):
+        self.redis.locked = False
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.counter = 0
+        self.locked = False
+
+    def lock(self, name, timeout=None):
+        return FakeLock(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hincrby(self, key, field, amount):
+        hash_ = self.data.setdefault(key, defaultdict(int))
+        hash_[field.encode()] += amount
+
+    def exists(self, key):
+        return key in self.data
+
+    def incr(self, key):
+        self.counter += 1
+        return self.counter
+
+    def incrby(self, key, amount):
+        self.counter += amount
+        return self.counter
+
+    def rename(self, source, target):
+        self.data[target] = self.data.pop(source)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [key.encode() for key in list(self.data) if key.startswith(prefix)]
+
+    def hgetall(self, key):
+        key = key.decode() if isinstance(key, bytes) else key
+        return {k: str(v).encode() for k, v in self.data.get(key, {}).items()}
+
+    def hdel(self, key, *fields):
+        key = key.decode() if isinstance(key, bytes) else key
+        for field in fields:
+            self.data[key].pop(field, None)
+
+    def delete(self, key):
+        self.data.pop(key.decode(), None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(buffer, "get_redis_connection", lambda alias: redis)
+    return redis
+
+
+@pytest.mark.django_db
+class TestMetricsBuffer:
+    def test_deltas_are_buffered_until_flush(
+        self, event, fake_redis, settings, django_capture_on_commit_callbacks
+    ):
+        settings.ANALYTICS_METRICS_BUFFER = True
+        EventMetrics.objects.filter(event=event).delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_metrics(EventMetrics, {"event_id": event.id}, tickets_sold=2)
+            bump_metrics(
+                EventMetrics, {"event_id": event.id}, total_revenue=Decimal("1500.50")
+            )
+        assert not EventMetrics.objects.filter(event=event).exists()
+
+        assert buffer.flush_metrics_buffer() == 2
+        metrics = EventMetrics.objects.get(event=event)
+        assert metrics.tickets_sold == 2
+        assert metrics.total_revenue == Decimal("1500.50")
+        assert fake_redis.data == {}
+
+    def test_claimed_batch_is_not_applied_twice(self, event, fake_redis):
+        EventMetrics.objects.filter(event=event).delete()
+        buffer.buffer_metrics(EventMetrics, {"event_id": event.id}, {"tickets_sold": 3})
+        fake_redis.rename(buffer.BUFFER_KEY, f"{buffer.PROCESSING_PREFIX}7")
+        MetricsLedger.objects.create(source="metrics.flush", object_id=7)
+
+        buffer.flush_metrics_buffer()
+
+        assert not EventMetrics.objects.filter(event=event).exists()
+        assert fake_redis.data == {}
+
+    def test_batch_ids_continue_after_sequence_reset(self, event, fake_redis):
+        MetricsLedger.objects.create(source="metrics.flush", object_id=41)
+        buffer.buffer_metrics(EventMetrics, {"event_id": event.id}, {"tickets_sold": 1})
+
+        buffer.flush_metrics_buffer()
+
+        assert MetricsLedger.objects.filter(source="metrics.flush", object_id=42).exists()
+
+    def test_rollup_deltas_are_summed_at_flush(
+        self, event, fake_redis, settings, django_capture_on_commit_callbacks
+    ):
+        settings.ANALYTICS_METRICS_BUFFER = True
+        now = timezone.now()
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(10):
+                apply_rollup_delta(now, event.organization_id, event.id, tickets_sold=1)
+            apply_rollup_delta(
+                now,
+                event.organization_id,
+                event.id,
+                provider="CAMPAY",
+                currency="XAF",
+                gross=Decimal("5000.50"),
+            )
+        assert not DailyRollup.objects.exists()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            buffer.flush_metrics_buffer()
+
+        daily = DailyRollup.objects.get(event=event, provider="")
+        assert daily.tickets_sold == 10
+        assert daily.date == timezone.localdate(now)
+        assert HourlyRollup.objects.get(event=event, provider="").tickets_sold == 10
+        assert DailyRollup.objects.get(provider="CAMPAY").gross == Decimal("5000.50")
+        assert fake_redis.data == {}
+
+    def test_rebuild_discards_deltas_it_recomputes(
+        self, event, fake_redis, settings, django_capture_on_commit_callbacks
+    ):
+        settings.ANALYTICS_METRICS_BUFFER = True
+        now = timezone.now()
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_metrics(EventMetrics, {"event_id": event.id}, tickets_sold=2)
+            apply_rollup_delta(now, event.organization_id, event.id, orders=1)
+            apply_rollup_delta(
+                now - timezone.timedelta(days=10),
+                event.organization_id,
+                event.id,
+                orders=1,
+            )
+        fake_redis.rename(buffer.BUFFER_KEY, f"{buffer.PROCESSING_PREFIX}3")
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_metrics(EventMetrics, {"event_id": event.id}, orders_count=1)
+
+        rebuild_metrics()
+        rebuild_rollups(since=timezone.localdate(now))
+        with django_capture_on_commit_callbacks(execute=True):
+            buffer.flush_metrics_buffer()
+
+        metrics = EventMetrics.objects.get(event=event)
+        assert metrics.tickets_sold == 0
+        assert metrics.orders_count == 0
+        assert not DailyRollup.objects.filter(date=timezone.localdate(now)).exists()
+        old = timezone.localdate(now - timezone.timedelta(days=10))
+        assert DailyRollup.objects.get(date=old).orders == 1
+
+    def test_rebuild_keeps_buffered_page_views(
+        self, event, fake_redis, settings, django_capture_on_commit_callbacks
+    ):
+        settings.ANALYTICS_METRICS_BUFFER = True
+        fake_redis.hincrby(
+            buffer.BUFFER_KEY,
+            buffer.buffer_field(EventMetrics, event.id, "page_views"),
+            1,
+        )
+
+        rebuild_metrics()
+        with django_capture_on_commit_callbacks(execute=True):
+            buffer.flush_metrics_buffer()
+
+        assert EventMetrics.objects.get(event=event).page_views == 1
+
+    def test_flush_skips_while_a_rebuild_holds_the_lock(self, event, fake_redis):
+        buffer.buffer_metrics(EventMetrics, {"event_id": event.id}, {"tickets_sold": 1})
+        fake_redis.locked = True
+
+        assert buffer.flush_metrics_buffer() == 0
+        assert buffer.BUFFER_KEY in fake_redis.data
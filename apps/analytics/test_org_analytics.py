@@ -0,0 +1,111 @@
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from apps.analytics.organization import build_org_analytics, get_org_analytics
+from apps.orgs.models import Organization
+from apps.payments import signals as payment_signals
+from apps.payments.models import Payment
+from apps.tickets.models import Booking, Ticket
+
+
+@pytest.fixture(autouse=True)
+def no_task_dispatch(monkeypatch):
+    for task in (
+        payment_signals.send_ticket_confirmation_task,
+        payment_signals.send_admin_sale_notifications_task,
+        payment_signals.send_refund_notification_task,
+    ):
+        monkeypatch.setattr(task, "delay", lambda *args, **kwargs: None)
+
+
+def _confirmed_sale(event, user, ticket_type, amount):
+    booking = Booking.objects.create(event=event, user=user, total_amount=amount)
+    Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+    payment = Payment.objects.create(
+        booking=booking,
+        amount=amount,
+        currency="XAF",
+        provider="CAMPAY",
+    )
+    payment.status = Payment.Status.CONFIRMED
+    payment.save()
+
+
+@pytest.mark.django_db
+class TestOrganizationAnalytics:
+    def test_cached_until_data_version_bump(
+        self,
+        locmem_cache,
+        organization,
+        event,
+        user,
+        ticket_type,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            _confirmed_sale(event, user, ticket_type, Decimal("5000"))
+
+        data = get_org_analytics(organization)
+        assert data["revenue"]["total"] == 5000.0
+        assert data["revenue"]["period"] == 5000.0
+        assert data["tickets"]["sold"] == 1
+        assert data["top_events"][0]["id"] == event.id
+        with django_assert_num_queries(0):
+            assert get_org_analytics(organization) == data
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _confirmed_sale(event, user, ticket_type, Decimal("2500"))
+
+        data = get_org_analytics(organization)
+        assert data["revenue"]["total"] == 7500.0
+        assert data["tickets"]["sold"] == 2
+
+    def test_only_confirmed_tickets_are_counted(
+        self, locmem_cache, organization, event, user, ticket_type
+    ):
+        booking = Booking.objects.create(
+            event=event, user=user, total_amount=Decimal("5000")
+        )
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+        assert build_org_analytics(organization)["tickets"]["sold"] == 0
+
+        booking.status = Booking.Status.CONFIRMED
+        booking.save()
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+        Ticket.objects.filter(pk=booking.tickets.first().pk).update(
+            checked_in_at=timezone.now()
+        )
+        data = build_org_analytics(organization)
+        assert data["tickets"]["sold"] == 3
+        assert data["top_events"][0]["tickets_sold"] == 3
+
+        booking.status = Booking.Status.CANCELLED
+        booking.save()
+        assert build_org_analytics(organization)["tickets"]["sold"] == 0
+
+        call_command("rebuild_rollups", stdout=StringIO())
+        assert build_org_analytics(organization)["tickets"]["sold"] == 0
+
+    def test_api_is_scoped_to_member_organizations(
+        self, locmem_cache, authenticated_client, organization, user, admin_user
+    ):
+        user.active_mode = "ORGANIZER"
+        user.save(update_fields=["active_mode"])
+        response = authenticated_client.get(
+            reverse("reports:org_analytics_api", args=[organization.slug]),
+            {"days": 7},
+        )
+        assert response.status_code == 200
+        assert response.json()["days"] == 7
+        assert response.json()["organization"] == organization.slug
+
+        other = Organization.objects.create(name="Other Org", owner=admin_user)
+        response = authenticated_client.get(
+            reverse("reports:org_analytics_api", args=[other.slug])
+        )
+        assert response.status_code == 404
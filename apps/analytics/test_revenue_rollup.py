@@ -0,0 +1,99 @@
+import pytest
+from decimal import Decimal
+from django.utils import timezone
+from apps.analytics.models import DailyRollup, EventMetrics, EventRevenueRollup
+from apps.analytics.services import get_event_revenue, rebuild_revenue_rollups
+from apps.payments import signals as payment_signals
+from apps.payments.models import Payment, Refund
+from apps.reports.queries import get_event_summary, get_payment_data
+from apps.tickets.models import Booking, Ticket
+
+
+@pytest.fixture(autouse=True)
+def no_task_dispatch(monkeypatch):
+    for task in (
+        payment_signals.send_ticket_confirmation_task,
+        payment_signals.send_admin_sale_notifications_task,
+        payment_signals.send_refund_notification_task,
+    ):
+        monkeypatch.setattr(task, "delay", lambda *args, **kwargs: None)
+
+
+@pytest.fixture
+def multi_ticket_payment(event, user, ticket_type):
+    booking = Booking.objects.create(
+        event=event,
+        user=user,
+        total_amount=Decimal("15000"),
+        status=Booking.Status.PENDING,
+    )
+    for _ in range(3):
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+    return Payment.objects.create(
+        booking=booking,
+        amount=Decimal("15000"),
+        service_fee=Decimal("500"),
+        currency="XAF",
+        provider="CAMPAY",
+    )
+
+
+@pytest.mark.django_db
+class TestEventRevenueRollup:
+    def test_confirmation_counts_payment_once(self, event, multi_ticket_payment):
+        multi_ticket_payment.status = Payment.Status.CONFIRMED
+        multi_ticket_payment.confirmed_at = timezone.now()
+        multi_ticket_payment.save()
+
+        summary = get_event_summary(event.id)
+        assert summary["total_tickets"] == 3
+        assert summary["total_revenue"] == Decimal("15000")
+        assert len(get_payment_data(event.id)) == 1
+
+    def test_pending_payment_has_no_revenue(self, event, multi_ticket_payment):
+        assert get_event_revenue(event.id)["gross"] == Decimal("0.00")
+        assert not EventRevenueRollup.objects.filter(event=event).exists()
+
+    def test_processed_refund_reduces_net(self, event, multi_ticket_payment):
+        multi_ticket_payment.status = Payment.Status.CONFIRMED
+        multi_ticket_payment.save()
+        refund = Refund.objects.create(
+            payment=multi_ticket_payment,
+            amount=Decimal("5000"),
+            refund_type=Refund.Type.PARTIAL,
+            status=Refund.Status.APPROVED,
+        )
+        refund.process()
+
+        revenue = get_event_revenue(event.id)
+        assert revenue["gross"] == Decimal("15000")
+        assert revenue["fees"] == Decimal("500")
+        assert revenue["refunds"] == Decimal("5000")
+        assert revenue["net"] == Decimal("9500")
+        assert revenue["orders_count"] == 1
+
+    def test_rebuild_matches_incremental(self, event, multi_ticket_payment):
+        multi_ticket_payment.status = Payment.Status.CONFIRMED
+        multi_ticket_payment.save()
+        incremental = get_event_revenue(event.id)
+
+        rebuild_revenue_rollups([event.id])
+
+        assert get_event_revenue(event.id) == incremental
+
+    def test_stale_copies_count_confirmation_once(
+        self, locmem_cache, event, multi_ticket_payment
+    ):
+        first = Payment.objects.get(pk=multi_ticket_payment.pk)
+        second = Payment.objects.get(pk=multi_ticket_payment.pk)
+        for copy in (first, second):
+            copy.status = Payment.Status.CONFIRMED
+            copy.confirmed_at = timezone.now()
+            copy.save()
+
+        assert get_event_revenue(event.id)["gross"] == Decimal("15000")
+        assert EventMetrics.objects.get(event=event).total_revenue == Decimal("15000")
+        rollup = DailyRollup.objects.get(event=event, provider="CAMPAY")
+        assert rollup.payments_confirmed == 1
+        assert rollup.payments_pending == 0
+        assert rollup.gross == Decimal("15000")
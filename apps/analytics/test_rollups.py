@@ -0,0 +1,231 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.utils import timezone
+from apps.analytics import views
+from apps.analytics.models import (
+    DailyRollup,
+    EventRevenueRollup,
+    ExchangeRate,
+    HourlyRollup,
+)
+from apps.analytics.rollups import usd_totals
+from apps.analytics.utils import convert_to_usd
+from apps.payments import signals as payment_signals
+from apps.payments.models import Payment, Refund
+from apps.tickets.models import Booking, Ticket
+
+
+@pytest.fixture(autouse=True)
+def no_task_dispatch(monkeypatch):
+    for task in (
+        payment_signals.send_ticket_confirmation_task,
+        payment_signals.send_admin_sale_notifications_task,
+        payment_signals.send_refund_notification_task,
+    ):
+        monkeypatch.setattr(task, "delay", lambda *args, **kwargs: None)
+
+
+@pytest.fixture(autouse=True)
+def unbuffered_metrics(settings):
+    settings.ANALYTICS_METRICS_BUFFER = False
+
+
+def _sale(event, user, ticket_type, amount, status=Payment.Status.PENDING):
+    booking = Booking.objects.create(event=event, user=user, total_amount=amount)
+    ticket = Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+    payment = Payment.objects.create(
+        booking=booking,
+        amount=amount,
+        service_fee=Decimal("100"),
+        currency="XAF",
+        provider="CAMPAY",
+        status=status,
+    )
+    return ticket, payment
+
+
+def _snapshot(model):
+    return sorted(
+        model.objects.values_list(
+            "event_id",
+            "provider",
+            "currency",
+            "orders",
+            "tickets_sold",
+            "tickets_checked_in",
+            "payments_pending",
+            "payments_confirmed",
+            "payments_failed",
+            "gross",
+            "fees",
+            "pending_amount",
+            "failed_amount",
+            "refunds",
+            "gross_usd",
+            "fees_usd",
+            "failed_amount_usd",
+            "refunds_usd",
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestAnalyticsRollups:
+    def test_status_changes_move_between_measures(self, event, user, ticket_type):
+        _, payment = _sale(event, user, ticket_type, Decimal("5000"))
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        payment.save()
+
+        rollup = DailyRollup.objects.get(event=event, provider="CAMPAY")
+        assert rollup.payments_pending == 0
+        assert rollup.pending_amount == 0
+        assert rollup.payments_confirmed == 1
+        assert rollup.gross == Decimal("5000")
+        assert rollup.fees == Decimal("100")
+
+        orders = DailyRollup.objects.get(event=event, provider="")
+        assert orders.orders == 1
+        assert orders.tickets_sold == 1
+        assert HourlyRollup.objects.get(event=event, provider="").orders == 1
+
+    def test_rebuild_matches_incremental(self, event, user, ticket_type):
+        ticket, payment = _sale(event, user, ticket_type, Decimal("5000"))
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        _sale(event, user, ticket_type, Decimal("2000"), Payment.Status.FAILED)
+        ticket.checked_in_at = timezone.now()
+        ticket.save()
+        daily, hourly = _snapshot(DailyRollup), _snapshot(HourlyRollup)
+        DailyRollup.objects.update(gross=0, orders=9)
+        HourlyRollup.objects.all().delete()
+
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        assert _snapshot(DailyRollup) == daily
+        assert _snapshot(HourlyRollup) == hourly
+        ticket.save()
+        assert DailyRollup.objects.get(event=event, provider="").tickets_checked_in == 1
+
+    def test_revenue_matches_event_revenue_rollup(self, event, user, ticket_type):
+        _, payment = _sale(event, user, ticket_type, Decimal("5000"))
+        Payment.objects.filter(pk=payment.pk).update(
+            created_at=timezone.now() - timezone.timedelta(days=2)
+        )
+        payment.refresh_from_db()
+        payment.status = Payment.Status.CONFIRMED
+        payment.confirmed_at = timezone.now()
+        payment.save()
+        refund = Refund.objects.create(
+            payment=payment,
+            amount=Decimal("1500"),
+            refund_type=Refund.Type.PARTIAL,
+            status=Refund.Status.APPROVED,
+        )
+        refund.process()
+        payment.status = Payment.Status.REFUNDED
+        payment.save()
+
+        def by_day(model):
+            return sorted(
+                model.objects.filter(event=event)
+                .exclude(gross=0, refunds=0)
+                .values_list("date", "gross", "fees", "refunds", "gross_usd")
+            )
+
+        revenue = by_day(EventRevenueRollup)
+        assert revenue == [
+            (
+                timezone.localdate(),
+                Decimal("5000"),
+                Decimal("100"),
+                Decimal("1500"),
+                convert_to_usd(Decimal("5000"), "XAF"),
+            )
+        ]
+        assert by_day(DailyRollup) == revenue
+
+        call_command("rebuild_rollups", stdout=StringIO())
+        assert by_day(DailyRollup) == revenue
+
+    def test_rebuild_since_keeps_older_buckets(self, event, user, ticket_type):
+        _sale(event, user, ticket_type, Decimal("5000"))
+        old = DailyRollup.objects.create(
+            event=event,
+            organization=event.organization,
+            date=timezone.localdate() - timezone.timedelta(days=10),
+            orders=3,
+        )
+
+        call_command(
+            "rebuild_rollups",
+            since=str(timezone.localdate() - timezone.timedelta(days=1)),
+            stdout=StringIO(),
+        )
+
+        assert DailyRollup.objects.get(pk=old.pk).orders == 3
+        today = DailyRollup.objects.get(date=timezone.localdate(), provider="")
+        assert today.orders == 1
+
+    def test_admin_charts_read_rollups(
+        self, rf, admin_user, monkeypatch, event, user, ticket_type
+    ):
+        _, payment = _sale(event, user, ticket_type, Decimal("6000"))
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        _sale(event, user, ticket_type, Decimal("2000"), Payment.Status.FAILED)
+        contexts = {}
+        monkeypatch.setattr(
+            views,
+            "render",
+            lambda request, template, context: contexts.update(context)
+            or HttpResponse(),
+        )
+        request = rf.get("/")
+        request.user = admin_user
+
+        views.payment_analytics(request)
+        assert contexts["total_volume"] == convert_to_usd(Decimal("6000"), "XAF")
+        assert contexts["service_fees"] == convert_to_usd(Decimal("100"), "XAF")
+
+        views.revenue_analytics(request)
+        assert contexts["total_revenue"] == convert_to_usd(Decimal("6000"), "XAF")
+
+        views.ticket_analytics(request)
+        assert contexts["total_tickets"] == 2
+        assert contexts["not_checked_in"] == 2
+
+        views.event_analytics(request)
+        assert contexts["events"][0]["bookings_count"] == 2
+
+    def test_amounts_are_normalised_at_the_rate_in_effect(
+        self, event, user, ticket_type
+    ):
+        ExchangeRate.objects.create(
+            currency="XAF",
+            rate_to_usd=Decimal("0.002"),
+            effective_date=timezone.localdate() - timezone.timedelta(days=1),
+        )
+        ExchangeRate.objects.create(
+            currency="XAF",
+            rate_to_usd=Decimal("0.5"),
+            effective_date=timezone.localdate() + timezone.timedelta(days=1),
+        )
+        _, payment = _sale(event, user, ticket_type, Decimal("5000"))
+        payment.status = Payment.Status.CONFIRMED
+        payment.save()
+        _, usd_payment = _sale(event, user, ticket_type, Decimal("40"))
+        Payment.objects.filter(pk=usd_payment.pk).update(currency="USD")
+        usd_payment.refresh_from_db()
+        usd_payment.status = Payment.Status.CONFIRMED
+        usd_payment.save()
+
+        totals = usd_totals(DailyRollup.objects.all(), "gross", "fees")
+        assert totals == {"gross": Decimal("50.00"), "fees": Decimal("100.20")}
+
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        assert usd_totals(DailyRollup.objects.all(), "gross", "fees") == totals
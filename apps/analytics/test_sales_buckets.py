@@ -0,0 +1,125 @@
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from apps.analytics.models import EventSalesBucket
+from apps.analytics.services import get_sales_timeline, rebuild_sales_buckets
+from apps.events.models import Event
+from apps.payments import signals as payment_signals
+from apps.payments.models import Payment, Refund
+from apps.tickets.models import Booking, Ticket, TicketType
+
+
+@pytest.fixture(autouse=True)
+def no_task_dispatch(monkeypatch):
+    for task in (
+        payment_signals.send_ticket_confirmation_task,
+        payment_signals.send_admin_sale_notifications_task,
+        payment_signals.send_refund_notification_task,
+    ):
+        monkeypatch.setattr(task, "delay", lambda *args, **kwargs: None)
+
+
+@pytest.fixture
+def vip_type(event):
+    return TicketType.objects.create(
+        event=event, name="VIP", price=Decimal("10000"), quantity=10
+    )
+
+
+@pytest.fixture
+def booking(event, user, ticket_type, vip_type):
+    booking = Booking.objects.create(event=event, user=user, total_amount=Decimal("12000"))
+    Ticket.objects.create(booking=booking, ticket_type=vip_type)
+    for _ in range(2):
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+    return booking
+
+
+def _confirm(booking, capture):
+    with capture(execute=True):
+        booking.status = Booking.Status.CONFIRMED
+        booking.save()
+
+
+@pytest.mark.django_db
+class TestEventSalesBuckets:
+    def test_confirmation_fills_buckets(
+        self, event, booking, django_capture_on_commit_callbacks
+    ):
+        _confirm(booking, django_capture_on_commit_callbacks)
+
+        totals = get_sales_timeline(event.id, zoom="week")
+        assert len(totals) == 1
+        assert totals[0]["tickets"] == 3
+        assert totals[0]["gross"] == Decimal("12000")
+        assert totals[0]["orders"] == 1
+        assert EventSalesBucket.objects.filter(event=event).count() == 2
+
+    def test_refunds_are_reversed(
+        self, event, booking, django_capture_on_commit_callbacks
+    ):
+        _confirm(booking, django_capture_on_commit_callbacks)
+        payment = Payment.objects.create(
+            booking=booking, amount=Decimal("12000"), currency="XAF", provider="CAMPAY"
+        )
+        Refund.objects.create(
+            payment=payment,
+            amount=Decimal("2000"),
+            refund_type=Refund.Type.PARTIAL,
+            status=Refund.Status.APPROVED,
+        ).process()
+        hourly = get_sales_timeline(event.id, zoom="hour")
+        assert hourly[0]["gross"] == Decimal("10000")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.status = Booking.Status.REFUNDED
+            booking.save()
+
+        totals = get_sales_timeline(event.id, zoom="day")[0]
+        assert totals["tickets"] == 0
+        assert totals["gross"] == Decimal("0")
+        assert totals["orders"] == 0
+
+    def test_rebuild_matches_incremental(
+        self, event, booking, django_capture_on_commit_callbacks
+    ):
+        _confirm(booking, django_capture_on_commit_callbacks)
+        incremental = get_sales_timeline(event.id, zoom="hour")
+
+        rebuild_sales_buckets([event.id])
+
+        assert get_sales_timeline(event.id, zoom="hour") == incremental
+
+    def test_timeline_view_rejects_bad_filters(
+        self, locmem_cache, authenticated_client, user, event, vip_type
+    ):
+        user.active_mode = "ORGANIZER"
+        user.save(update_fields=["active_mode"])
+        other = TicketType.objects.create(
+            event=Event.objects.create(
+                organization=event.organization,
+                title="Other",
+                start_at=event.start_at,
+                end_at=event.end_at,
+            ),
+            name="Other",
+            price=Decimal("500"),
+            quantity=5,
+        )
+        url = reverse(
+            "reports:sales_timeline_data",
+            args=[event.organization.slug, event.slug],
+        )
+
+        for params in (
+            {"ticket_type": "abc"},
+            {"ticket_type": other.id},
+            {"start": "2025-13-45T00:00"},
+            {"start": "abc"},
+            {"end": "tomorrow"},
+        ):
+            assert authenticated_client.get(url, params).status_code == 400
+        response = authenticated_client.get(url, {"ticket_type": vip_type.id})
+        assert response.status_code == 200
+        response = authenticated_client.get(url, {"start": "", "end": ""})
+        assert response.status_code == 200
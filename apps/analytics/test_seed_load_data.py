@@ -0,0 +1,102 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.utils import timezone
+from apps.analytics.models import (
+    DailyRollup,
+    EventRevenueRollup,
+    OrganizationMetrics,
+)
+from apps.checkin.models import CheckIn
+from apps.events.models import EventListing
+from apps.orgs.models import Organization
+from apps.payments.models import Payment
+from apps.tickets.models import Booking, Ticket
+
+
+def _seed(**options):
+    call_command(
+        "seed_load_data",
+        users=30,
+        organizations=2,
+        events_per_org=3,
+        bookings=120,
+        batch_size=50,
+        stdout=StringIO(),
+        **options,
+    )
+
+
+def _tickets():
+    return list(
+        Ticket.objects.order_by("code").values_list("code", "ticket_type__name")
+    )
+
+
+@pytest.mark.django_db
+class TestSeedLoadData:
+    def test_generates_backdated_orders_and_rebuilds_rollups(self):
+        _seed()
+
+        assert Booking.objects.count() == Payment.objects.count()
+        assert 100 <= Booking.objects.count() <= 140
+        assert Booking.objects.filter(
+            created_at__lt=timezone.now() - timedelta(days=1)
+        ).exists()
+        totals = DailyRollup.objects.aggregate(
+            sold=Sum("tickets_sold"), confirmed=Sum("payments_confirmed")
+        )
+        assert totals["sold"] == Ticket.objects.count()
+        assert (
+            totals["confirmed"]
+            == Payment.objects.filter(status=Payment.Status.CONFIRMED).count()
+        )
+        checked_in = Ticket.objects.filter(is_checked_in=True)
+        assert CheckIn.objects.count() == checked_in.count()
+        assert not checked_in.filter(checkin_record__isnull=True).exists()
+
+    def test_rebuilt_read_models_agree(self):
+        output = StringIO()
+        call_command(
+            "seed_load_data",
+            users=20,
+            organizations=2,
+            events_per_org=2,
+            bookings=80,
+            batch_size=40,
+            stdout=output,
+        )
+        assert "Analytics and listings rebuilt" in output.getvalue()
+
+        def revenue(model):
+            return sorted(
+                model.objects.values("event_id", "date", "currency")
+                .annotate(gross=Sum("gross"), refunds=Sum("refunds"))
+                .exclude(gross=0, refunds=0)
+                .values_list("event_id", "date", "currency", "gross", "refunds")
+            )
+
+        assert revenue(DailyRollup)
+        assert revenue(DailyRollup) == revenue(EventRevenueRollup)
+        assert (
+            OrganizationMetrics.objects.aggregate(sold=Sum("total_tickets_sold"))["sold"]
+            == Ticket.objects.count()
+        )
+        assert EventListing.objects.exists()
+
+    def test_same_seed_is_deterministic_and_not_duplicated(self):
+        _seed(skip_rebuild=True)
+        first = _tickets()
+
+        with pytest.raises(CommandError):
+            _seed(skip_rebuild=True)
+
+        Organization.objects.all().delete()
+        get_user_model().objects.all().delete()
+        _seed(skip_rebuild=True)
+
+        assert _tickets() == first
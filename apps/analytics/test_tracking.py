@@ -0,0 +1,173 @@
+import pytest
+from collections import defaultdict
+from decimal import Decimal
+from django.test import RequestFactory
+from django.utils import timezone
+from redis.exceptions import ResponseError
+from apps.analytics import buffer, tracking
+from apps.analytics.models import DailyRollup, EventMetrics
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sets = defaultdict(set)
+        self.hashes = defaultdict(lambda: defaultdict(int))
+        self.stream = []
+        self.groups = set()
+        self.delivered = 0
+        self.pending = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pfadd(self, key, value):
+        self.sets[key].add(value)
+
+    def pfcount(self, key):
+        return len(self.sets.get(key, ()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def sadd(self, key, value):
+        self.sets[key].add(str(value).encode())
+
+    def spop(self, key, count):
+        members = list(self.sets.pop(key, ()))
+        return members[:count]
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] += amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        entry_id = f"{len(self.stream) + 1}-0".encode()
+        encoded = {k.encode(): str(v).encode() for k, v in fields.items()}
+        self.stream.append((entry_id, encoded))
+        return entry_id
+
+    def xgroup_create(self, key, group, id="0", mkstream=False):
+        if group in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups.add(group)
+
+    def xreadgroup(self, group, consumer, streams, count=None):
+        ((key, cursor),) = streams.items()
+        if cursor == ">":
+            entries = self.stream[self.delivered : self.delivered + count]
+            self.delivered += len(entries)
+            self.pending.update(entries)
+        else:
+            entries = list(self.pending.items())[:count]
+        return [[key.encode(), entries]] if entries else []
+
+    def xack(self, key, group, *entry_ids):
+        for entry_id in entry_ids:
+            self.pending.pop(entry_id, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(tracking, "get_redis_connection", lambda alias: redis)
+    return redis
+
+
+def _request(ip, user_agent="Mozilla/5.0"):
+    return RequestFactory().get("/", REMOTE_ADDR=ip, HTTP_USER_AGENT=user_agent)
+
+
+@pytest.mark.django_db
+class TestVisitorTracking:
+    def test_fold_sets_unique_visitors_and_conversion(self, event, fake_redis):
+        for ip in ("10.0.0.1", "10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"):
+            tracking.track_event_visit(_request(ip), event.id)
+        tracking.track_event_visit(_request("10.0.0.2"), event.id, stage="checkout")
+        EventMetrics.objects.update_or_create(event=event, defaults={"orders_count": 3})
+        DailyRollup.objects.create(
+            event=event,
+            organization=event.organization,
+            date=timezone.localdate(),
+            provider="CAMPAY",
+            currency="XAF",
+            orders=3,
+            payments_confirmed=1,
+        )
+
+        assert tracking.fold_visitor_counts() == 1
+
+        metrics = EventMetrics.objects.get(event=event)
+        assert metrics.unique_visitors == 4
+        assert metrics.checkout_visitors == 1
+        assert metrics.conversion_rate == Decimal("25.00")
+        funnel = tracking.get_event_funnel(event.id)
+        assert funnel["conversion_rate"] == metrics.conversion_rate
+        page_views = fake_redis.hashes[buffer.BUFFER_KEY]
+        assert page_views[f"event|{event.id}|page_views"] == 5
+        assert tracking.fold_visitor_counts() == 0
+
+    def test_deleted_event_is_skipped(self, event, fake_redis):
+        tracking.track_event_visit(_request("10.0.0.1"), event.id)
+        event.delete()
+
+        assert tracking.fold_visitor_counts() == 0
+
+    def test_buffer_flush_skips_deleted_event(self, event):
+        batches = buffer._parse({f"event|{event.id + 1000}|page_views".encode(): b"3"})
+
+        assert buffer._apply_batch(1, batches)
+        assert not EventMetrics.objects.filter(event_id=event.id + 1000).exists()
+
+
+@pytest.mark.django_db
+class TestLiveFunnel:
+    def test_stream_events_are_counted_per_minute(self, event, fake_redis):
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"):
+            tracking.track_event_visit(_request(ip), event.id)
+        tracking.track_event_visit(_request("10.0.0.1"), event.id, stage="checkout")
+        tracking.track_event_visit(_request("10.0.0.2"), event.id, stage="checkout")
+        tracking.emit_funnel_event(event.id, "payment_started")
+        tracking.emit_funnel_event(event.id, "confirmed")
+
+        assert tracking.consume_funnel_events(count=3) == 8
+        assert tracking.consume_funnel_events() == 0
+        assert not fake_redis.pending
+
+        funnel = tracking.get_live_funnel(event.id, minutes=5)
+        assert funnel["totals"] == {
+            "view": 4,
+            "checkout": 2,
+            "payment_started": 1,
+            "confirmed": 1,
+        }
+        assert len(funnel["counts"]["view"]) == 5
+        assert funnel["conversion"]["checkout"] == 50.0
+        assert funnel["conversion"]["overall"] == 25.0
+
+    def test_unacked_entries_are_recounted_once(self, event, fake_redis):
+        tracking.emit_funnel_event(event.id, "view")
+        tracking.consume_funnel_events()
+        tracking.emit_funnel_event(event.id, "view")
+        fake_redis.xreadgroup(
+            tracking.FUNNEL_GROUP, "counters", {tracking.FUNNEL_STREAM: ">"}, count=10
+        )
+
+        assert tracking.consume_funnel_events() == 1
+        assert tracking.get_live_funnel(event.id, minutes=1)["totals"]["view"] == 2
@@ -0,0 +1,238 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError, ResponseError
+
+from apps.events.models import Event
+from .buffer import BUFFER_KEY, buffer_field
+from .models import DailyRollup, EventMetrics
+
+logger = logging.getLogger(__name__)
+
+FUNNEL_STAGES = ("view", "checkout")
+DIRTY_KEY = "analytics:visitors:dirty"
+DAY_TTL = 8 * 24 * 3600
+LIFETIME_TTL = 400 * 24 * 3600
+
+LIVE_FUNNEL_STAGES = ("view", "checkout", "payment_started", "confirmed")
+FUNNEL_STREAM = "analytics:funnel"
+FUNNEL_GROUP = "funnel-counters"
+FUNNEL_STREAM_MAXLEN = 200000
+FUNNEL_RETENTION = 48 * 3600
+FUNNEL_MAX_MINUTES = 24 * 60
+
+
+def visitor_hash(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        identity = f"user:{user.pk}"
+    else:
+        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+        if x_forwarded_for:
+            ip = x_forwarded_for.split(",")[0].strip()
+        else:
+            ip = request.META.get("REMOTE_ADDR", "")
+        identity = f"{ip}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.blake2b(identity.encode(), digest_size=8).hexdigest()
+
+
+def visitors_key(event_id, stage, day=None):
+    if day:
+        return f"analytics:visitors:{stage}:{event_id}:{day:%Y%m%d}"
+    return f"analytics:visitors:{stage}:{event_id}"
+
+
+def funnel_key(event_id, minute):
+    return f"analytics:funnel:{event_id}:{minute}"
+
+
+def _add_funnel_event(pipe, event_id, stage):
+    pipe.xadd(
+        FUNNEL_STREAM,
+        {"event": event_id, "stage": stage, "ts": int(time.time())},
+        maxlen=FUNNEL_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+def emit_funnel_event(event_id, stage):
+    try:
+        pipe = get_redis_connection("analytics").pipeline(transaction=False)
+        _add_funnel_event(pipe, event_id, stage)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Funnel tracking unavailable for event %s", event_id)
+
+
+def track_event_visit(request, event_id, stage="view"):
+    visitor = visitor_hash(request)
+    day_key = visitors_key(event_id, stage, timezone.localdate())
+    lifetime_key = visitors_key(event_id, stage)
+    try:
+        pipe = get_redis_connection("analytics").pipeline(transaction=False)
+        pipe.pfadd(day_key, visitor)
+        pipe.expire(day_key, DAY_TTL)
+        pipe.pfadd(lifetime_key, visitor)
+        pipe.expire(lifetime_key, LIFETIME_TTL)
+        pipe.sadd(DIRTY_KEY, event_id)
+        _add_funnel_event(pipe, event_id, stage)
+        if stage == "view":
+            pipe.hincrby(
+                BUFFER_KEY, buffer_field(EventMetrics, event_id, "page_views"), 1
+            )
+        pipe.execute()
+    except RedisError:
+        logger.warning("Visitor tracking unavailable for event %s", event_id)
+
+
+def _conversion_rate(paid, visitors):
+    if not visitors:
+        return Decimal("0.00")
+    return min(Decimal(paid) / Decimal(visitors) * 100, Decimal("999.99")).quantize(
+        Decimal("0.01")
+    )
+
+
+def fold_visitor_counts(batch_size=500):
+    connection = get_redis_connection("analytics")
+    event_ids = [int(event_id) for event_id in connection.spop(DIRTY_KEY, batch_size)]
+    if not event_ids:
+        return 0
+
+    pipe = connection.pipeline(transaction=False)
+    for event_id in event_ids:
+        for stage in FUNNEL_STAGES:
+            pipe.pfcount(visitors_key(event_id, stage))
+    counts = iter(pipe.execute())
+    visitors = {event_id: dict(zip(FUNNEL_STAGES, counts)) for event_id in event_ids}
+    paid = dict(
+        DailyRollup.objects.filter(event_id__in=event_ids)
+        .order_by()
+        .values("event_id")
+        .annotate(total=Sum("payments_confirmed"))
+        .values_list("event_id", "total")
+    )
+
+    with transaction.atomic():
+        for event_id in Event.objects.filter(id__in=event_ids).values_list(
+            "id", flat=True
+        ):
+            EventMetrics.objects.get_or_create(event_id=event_id)
+        metrics = list(
+            EventMetrics.objects.select_for_update().filter(event_id__in=event_ids)
+        )
+        now = timezone.now()
+        for row in metrics:
+            stages = visitors[row.event_id]
+            row.unique_visitors = stages["view"]
+            row.checkout_visitors = stages["checkout"]
+            row.conversion_rate = _conversion_rate(
+                paid.get(row.event_id, 0), row.unique_visitors
+            )
+            row.last_updated = now
+        EventMetrics.objects.bulk_update(
+            metrics,
+            ["unique_visitors", "checkout_visitors", "conversion_rate", "last_updated"],
+        )
+    return len(metrics)
+
+
+def get_event_funnel(event_id, day=None):
+    if day:
+        connection = get_redis_connection("analytics")
+        pipe = connection.pipeline(transaction=False)
+        for stage in FUNNEL_STAGES:
+            pipe.pfcount(visitors_key(event_id, stage, day))
+        visitors, checkout = pipe.execute()
+        paid = DailyRollup.objects.filter(event_id=event_id, date=day)
+    else:
+        metrics = EventMetrics.objects.filter(event_id=event_id).first()
+        visitors = metrics.unique_visitors if metrics else 0
+        checkout = metrics.checkout_visitors if metrics else 0
+        paid = DailyRollup.objects.filter(event_id=event_id)
+    paid = paid.aggregate(total=Sum("payments_confirmed"))["total"] or 0
+    return {
+        "visitors": visitors,
+        "checkout": checkout,
+        "paid": paid,
+        "conversion_rate": _conversion_rate(paid, visitors),
+    }
+
+
+def _ensure_funnel_group(connection):
+    try:
+        connection.xgroup_create(FUNNEL_STREAM, FUNNEL_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def consume_funnel_events(consumer="counters", count=1000, limit=50000):
+    connection = get_redis_connection("analytics")
+    _ensure_funnel_group(connection)
+    processed = 0
+    cursor = "0"
+    while processed < limit:
+        response = connection.xreadgroup(
+            FUNNEL_GROUP, consumer, {FUNNEL_STREAM: cursor}, count=count
+        )
+        entries = response[0][1] if response else []
+        if not entries:
+            if cursor == ">":
+                break
+            cursor = ">"
+            continue
+
+        pipe = connection.pipeline(transaction=True)
+        for _, fields in entries:
+            if not fields:
+                continue
+            key = funnel_key(int(fields[b"event"]), int(fields[b"ts"]) // 60)
+            pipe.hincrby(key, fields[b"stage"], 1)
+            pipe.expire(key, FUNNEL_RETENTION)
+        pipe.xack(FUNNEL_STREAM, FUNNEL_GROUP, *(entry_id for entry_id, _ in entries))
+        pipe.execute()
+        processed += len(entries)
+    return processed
+
+
+def _funnel_rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def get_live_funnel(event_id, minutes=60):
+    minutes = max(1, min(minutes, FUNNEL_MAX_MINUTES))
+    last = int(time.time()) // 60
+    window = range(last - minutes + 1, last + 1)
+    pipe = get_redis_connection("analytics").pipeline(transaction=False)
+    for minute in window:
+        pipe.hgetall(funnel_key(event_id, minute))
+    buckets = pipe.execute()
+
+    counts = {
+        stage: [int(bucket.get(stage.encode(), 0)) for bucket in buckets]
+        for stage in LIVE_FUNNEL_STAGES
+    }
+    totals = {stage: sum(values) for stage, values in counts.items()}
+    return {
+        "event_id": event_id,
+        "start": datetime.fromtimestamp(window[0] * 60, dt_timezone.utc).isoformat(),
+        "minutes": minutes,
+        "counts": counts,
+        "totals": totals,
+        "conversion": {
+            "checkout": _funnel_rate(totals["checkout"], totals["view"]),
+            "payment_started": _funnel_rate(
+                totals["payment_started"], totals["checkout"]
+            ),
+            "confirmed": _funnel_rate(totals["confirmed"], totals["payment_started"]),
+            "overall": _funnel_rate(totals["confirmed"], totals["view"]),
+        },
+    }
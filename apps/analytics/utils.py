@@ -1,27 +1,87 @@
+import time
+from bisect import bisect_right
 from decimal import Decimal
 
-EXCHANGE_RATES = {
-    "XAF": Decimal("0.00167"),
-    "XOF": Decimal("0.00167"),
-    "USD": Decimal("1.00"),
-    "EUR": Decimal("1.08"),
-    "GBP": Decimal("1.27"),
-    "NGN": Decimal("0.0013"),
-    "GHS": Decimal("0.083"),
-    "UGX": Decimal("0.00027"),
-}
+from django.db.models import (
+    DateTimeField,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
 
+from .models import ExchangeRate
 
-def convert_to_usd(amount, currency="XAF"):
+EXCHANGE_RATES_TTL = 300
+
+RATE_FIELD = DecimalField(max_digits=18, decimal_places=8)
+
+_exchange_rates = {"loaded_at": None, "rates": {}}
+
+
+def clear_exchange_rates_cache():
+    _exchange_rates["loaded_at"] = None
+
+
+def _rate_history():
+    loaded_at = _exchange_rates["loaded_at"]
+    if loaded_at is None or time.monotonic() - loaded_at > EXCHANGE_RATES_TTL:
+        rates = {}
+        for currency, effective_date, rate in ExchangeRate.objects.order_by(
+            "currency", "effective_date"
+        ).values_list("currency", "effective_date", "rate_to_usd"):
+            dates, values = rates.setdefault(currency, ([], []))
+            dates.append(effective_date)
+            values.append(rate)
+        _exchange_rates.update(loaded_at=time.monotonic(), rates=rates)
+    return _exchange_rates["rates"]
+
+
+def get_usd_rate(currency, on=None):
+    dates, values = _rate_history().get(currency, ((), ()))
+    index = bisect_right(dates, on or timezone.localdate())
+    return values[index - 1] if index else Decimal("1.00")
+
+
+def convert_to_usd(amount, currency="XAF", on=None):
     if not amount:
         return Decimal("0.00")
 
     amount = Decimal(str(amount))
-    rate = EXCHANGE_RATES.get(currency, Decimal("1.00"))
+    rate = get_usd_rate(currency, on)
 
     return (amount * rate).quantize(Decimal("0.01"))
 
 
+def usd_rate(currency="currency", on="created_at"):
+    rate = (
+        ExchangeRate.objects.filter(
+            currency=OuterRef(currency),
+            effective_date__lte=TruncDate(
+                ExpressionWrapper(OuterRef(on), output_field=DateTimeField())
+            ),
+        )
+        .order_by("-effective_date")
+        .values("rate_to_usd")[:1]
+    )
+    return Coalesce(
+        Subquery(rate, output_field=RATE_FIELD),
+        Value(Decimal("1.00")),
+        output_field=RATE_FIELD,
+    )
+
+
+def usd_amount(amount="amount", currency="currency", on="created_at"):
+    return ExpressionWrapper(
+        F(amount) * usd_rate(currency, on),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
 def format_currency_usd(amount):
     if not amount:
         return "$0.00"
@@ -0,0 +1,26 @@
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+ORG_VERSION_KEY = "org_version:{}"
+
+
+def org_data_version(organization_id):
+    cache = caches["analytics"]
+    key = ORG_VERSION_KEY.format(organization_id)
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def bump_org_data_version(organization_id):
+    cache = caches["analytics"]
+    key = ORG_VERSION_KEY.format(organization_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_org_data_version_on_commit(organization_id):
+    transaction.on_commit(lambda: bump_org_data_version(organization_id), robust=True)
@@ -2,35 +2,24 @@ from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import admin
 from django.core.cache import caches
-from django.db.models import Sum, Count, Q
-from django.db.models.functions import TruncDate
+from django.db.models import F, Sum
 from django.utils import timezone
 from datetime import timedelta
-from decimal import Decimal
-from plotly.subplots import make_subplots
 
-import plotly.graph_objects as go
-
-from apps.payments.models import Payment
-from apps.tickets.models import Booking, Ticket
-from apps.events.models import Event
 from django.contrib.auth import get_user_model
-from .utils import convert_to_usd
+from .dashboard import (
+    DASHBOARD_REFRESH_KEY,
+    DASHBOARD_REFRESH_TIMEOUT,
+    DASHBOARD_SNAPSHOT_KEY,
+    get_plotly_theme,
+)
+from .models import DailyRollup
+from .rollups import PAYMENT_STATUS_MEASURES, daily_series, rollup_totals, usd_totals
+from .tasks import refresh_dashboard_snapshot_task
 
 User = get_user_model()
 
 
-def get_plotly_theme():
-    return {
-        "template": "plotly_dark",
-        "paper_bgcolor": "rgba(31, 41, 55, 1)",
-        "plot_bgcolor": "rgba(31, 41, 55, 1)",
-        "font": {"color": "#e5e7eb"},
-        "xaxis": {"gridcolor": "rgba(75, 85, 99, 0.3)"},
-        "yaxis": {"gridcolor": "rgba(75, 85, 99, 0.3)"},
-    }
-
-
 def get_admin_context(request, title):
     context = {
         "site_header": admin.site.site_header,
@@ -49,193 +38,35 @@ def get_admin_context(request, title):
 
 def dashboard_callback(request, context):
     cache = caches["analytics"]
-    cached = cache.get("admin_dashboard_kpis")
-    if cached is not None:
-        context.update(cached)
-        return context
-
-    today = timezone.now().date()
-    last_30_days = today - timedelta(days=30)
-    last_7_days = today - timedelta(days=7)
-
-    total_revenue_raw = Payment.objects.filter(
-        status="CONFIRMED", created_at__gte=last_30_days
-    ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-    total_revenue = convert_to_usd(total_revenue_raw, "XAF")
-
-    total_orders = Booking.objects.filter(created_at__gte=last_30_days).count()
-
-    total_tickets = Ticket.objects.filter(booking__created_at__gte=last_30_days).count()
-
-    active_events = Event.objects.filter(
-        Q(start_at__gte=timezone.now()) | Q(end_at__gte=timezone.now())
-    ).count()
-
-    revenue_last_7_raw = Payment.objects.filter(
-        status="CONFIRMED", created_at__gte=last_7_days
-    ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-    revenue_last_7 = convert_to_usd(revenue_last_7_raw, "XAF")
-
-    orders_last_7 = Booking.objects.filter(created_at__gte=last_7_days).count()
-
-    revenue_chart = generate_revenue_chart(last_30_days, today)
-    sales_chart = generate_sales_chart(last_30_days, today)
-
-    result = {
-        "navigation": [
-            {"title": "Dashboard", "link": "/admin/"},
-            {"title": "Analytics", "link": "/admin/reports/revenue/"},
-        ],
-        "kpi_data": [
-            {
-                "title": "Total Revenue (30d)",
-                "metric": f"${total_revenue:,.2f}",
-                "footer": f"Last 7 days: ${revenue_last_7:,.2f}",
-                "icon": "attach_money",
-            },
-            {
-                "title": "Total Orders (30d)",
-                "metric": str(total_orders),
-                "footer": f"Last 7 days: {orders_last_7}",
-                "icon": "shopping_cart",
-            },
-            {
-                "title": "Tickets Sold (30d)",
-                "metric": str(total_tickets),
-                "footer": f"Active now: {total_tickets}",
-                "icon": "confirmation_number",
-            },
-            {
-                "title": "Active Events",
-                "metric": str(active_events),
-                "footer": "Currently running or upcoming",
-                "icon": "event",
-            },
-        ],
-        "charts": [
-            {"title": "Revenue Trend", "html": revenue_chart},
-            {"title": "Sales Overview", "html": sales_chart},
-        ],
-    }
-
-    cache.set("admin_dashboard_kpis", result, 300)
-    context.update(result)
+    snapshot = cache.get(DASHBOARD_SNAPSHOT_KEY)
+    if snapshot is None:
+        if cache.add(DASHBOARD_REFRESH_KEY, True, DASHBOARD_REFRESH_TIMEOUT):
+            refresh_dashboard_snapshot_task.delay()
+        snapshot = {"dashboard_pending": True}
+    context.update(snapshot)
     return context
 
 
-def generate_revenue_chart(start_date, end_date):
-    payments = (
-        Payment.objects.filter(
-            status="CONFIRMED",
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
-        )
-        .annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(revenue=Sum("amount"))
-        .order_by("date")
-    )
-
-    dates = [p["date"] for p in payments]
-    revenues = [float(convert_to_usd(p["revenue"], "XAF")) for p in payments]
-
-    theme = get_plotly_theme()
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=dates,
-            y=revenues,
-            mode="lines+markers",
-            name="Revenue",
-            line=dict(color="#a78bfa", width=3),
-            marker=dict(size=8, color="#a78bfa"),
-        )
-    )
-
-    fig.update_layout(
-        template=theme["template"],
-        paper_bgcolor=theme["paper_bgcolor"],
-        plot_bgcolor=theme["plot_bgcolor"],
-        font=theme["font"],
-        height=300,
-        margin=dict(l=0, r=0, t=0, b=0),
-        xaxis_title="Date",
-        yaxis_title="Revenue ($)",
-        xaxis=theme["xaxis"],
-        yaxis=theme["yaxis"],
-        hovermode="x unified",
-    )
-
-    return fig.to_html(
-        include_plotlyjs="cdn", div_id="revenue_chart", config={"displayModeBar": False}
-    )
-
-
-def generate_sales_chart(start_date, end_date):
-    orders = (
-        Booking.objects.filter(
-            created_at__date__gte=start_date, created_at__date__lte=end_date
-        )
-        .annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(count=Count("id"))
-        .order_by("date")
-    )
-
-    dates = [o["date"] for o in orders]
-    counts = [o["count"] for o in orders]
-
-    theme = get_plotly_theme()
-    fig = go.Figure()
-    fig.add_trace(go.Bar(x=dates, y=counts, name="Orders", marker_color="#a78bfa"))
-
-    fig.update_layout(
-        template=theme["template"],
-        paper_bgcolor=theme["paper_bgcolor"],
-        plot_bgcolor=theme["plot_bgcolor"],
-        font=theme["font"],
-        height=300,
-        margin=dict(l=0, r=0, t=0, b=0),
-        xaxis_title="Date",
-        yaxis_title="Number of Orders",
-        xaxis=theme["xaxis"],
-        yaxis=theme["yaxis"],
-        hovermode="x unified",
-    )
-
-    return fig.to_html(
-        include_plotlyjs="cdn", div_id="sales_chart", config={"displayModeBar": False}
-    )
-
-
 @staff_member_required
 def revenue_analytics(request):
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
     today = timezone.now().date()
     last_90_days = today - timedelta(days=90)
 
-    payments = Payment.objects.filter(status="CONFIRMED", created_at__gte=last_90_days)
-
-    total_revenue_raw = payments.aggregate(Sum("amount"))["amount__sum"] or Decimal(
-        "0.00"
-    )
-    total_fees_raw = payments.aggregate(Sum("service_fee"))[
-        "service_fee__sum"
-    ] or Decimal("0.00")
+    rollups = DailyRollup.objects.filter(date__gte=last_90_days)
 
-    total_revenue = convert_to_usd(total_revenue_raw, "XAF")
-    total_fees = convert_to_usd(total_fees_raw, "XAF")
+    totals = usd_totals(rollups, "gross", "fees")
+    total_revenue = totals["gross"]
+    total_fees = totals["fees"]
     net_revenue = total_revenue - total_fees
 
-    revenue_by_date = (
-        payments.annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(revenue=Sum("amount"), fees=Sum("service_fee"))
-        .order_by("date")
-    )
+    revenue_by_date = daily_series(rollups, "gross", "fees", usd=True)
 
-    dates = [r["date"] for r in revenue_by_date]
-    revenues = [float(convert_to_usd(r["revenue"], "XAF")) for r in revenue_by_date]
-    fees = [float(convert_to_usd(r["fees"] or 0, "XAF")) for r in revenue_by_date]
+    dates = [date for date, _ in revenue_by_date]
+    revenues = [float(values["gross"]) for _, values in revenue_by_date]
+    fees = [float(values["fees"]) for _, values in revenue_by_date]
     net = [revenues[i] - fees[i] for i in range(len(revenues))]
 
     theme = get_plotly_theme()
@@ -279,16 +110,19 @@ def revenue_analytics(request):
         go.Bar(x=dates, y=net, name="Net Revenue", marker_color="#34d399"), row=2, col=1
     )
 
-    payment_status = (
-        Payment.objects.filter(created_at__gte=last_90_days)
-        .values("status")
-        .annotate(count=Count("id"))
+    status_counts = rollup_totals(
+        rollups, *(field for field, _ in PAYMENT_STATUS_MEASURES.values())
     )
+    payment_status = [
+        (status, status_counts[field])
+        for status, (field, _) in PAYMENT_STATUS_MEASURES.items()
+        if status_counts[field]
+    ]
 
     fig.add_trace(
         go.Pie(
-            labels=[p["status"] for p in payment_status],
-            values=[p["count"] for p in payment_status],
+            labels=[status for status, _ in payment_status],
+            values=[count for _, count in payment_status],
             marker=dict(colors=["#34d399", "#ef4444", "#fbbf24", "#a78bfa", "#60a5fa"]),
         ),
         row=2,
@@ -324,17 +158,22 @@ def revenue_analytics(request):
 
 @staff_member_required
 def event_analytics(request):
-    events = Event.objects.annotate(
-        revenue=Sum(
-            "bookings__payment__amount", filter=Q(bookings__payment__status="CONFIRMED")
-        ),
-        tickets_sold=Count("ticket_types__tickets"),
-        bookings_count=Count("bookings", distinct=True),
-    ).order_by("-revenue")[:20]
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
+    events = list(
+        DailyRollup.objects.values("event_id", title=F("event__title"))
+        .annotate(
+            revenue=Sum("gross_usd"),
+            tickets_sold=Sum("tickets_sold"),
+            bookings_count=Sum("orders"),
+        )
+        .order_by("-revenue")[:20]
+    )
 
-    event_names = [e.title[:30] for e in events]
-    event_revenues = [float(convert_to_usd(e.revenue or 0, "XAF")) for e in events]
-    event_tickets = [e.tickets_sold for e in events]
+    event_names = [e["title"][:30] for e in events]
+    event_revenues = [float(e["revenue"] or 0) for e in events]
+    event_tickets = [e["tickets_sold"] for e in events]
 
     theme = get_plotly_theme()
     fig = make_subplots(
@@ -395,24 +234,24 @@ def event_analytics(request):
 
 @staff_member_required
 def ticket_analytics(request):
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
     today = timezone.now().date()
     last_30_days = today - timedelta(days=30)
 
-    tickets = (
-        Ticket.objects.filter(booking__created_at__date__gte=last_30_days)
-        .annotate(date=TruncDate("booking__created_at"))
-        .values("date")
-        .annotate(count=Count("id"))
-        .order_by("date")
+    tickets = daily_series(
+        DailyRollup.objects.filter(date__gte=last_30_days), "tickets_sold"
     )
 
-    dates = [t["date"] for t in tickets]
-    counts = [t["count"] for t in tickets]
+    dates = [date for date, _ in tickets]
+    counts = [values["tickets_sold"] for _, values in tickets]
 
-    checked_in = Ticket.objects.filter(checked_in_at__isnull=False).count()
-    not_checked_in = Ticket.objects.filter(
-        checked_in_at__isnull=True, booking__status="CONFIRMED"
-    ).count()
+    totals = rollup_totals(
+        DailyRollup.objects.all(), "tickets_sold", "tickets_checked_in"
+    )
+    checked_in = totals["tickets_checked_in"]
+    not_checked_in = totals["tickets_sold"] - checked_in
 
     theme = get_plotly_theme()
     fig = make_subplots(
@@ -462,7 +301,7 @@ def ticket_analytics(request):
     context = get_admin_context(request, "Ticket Analytics")
     context.update(
         {
-            "total_tickets": Ticket.objects.count(),
+            "total_tickets": totals["tickets_sold"],
             "checked_in": checked_in,
             "not_checked_in": not_checked_in,
             "chart_html": chart_html,
@@ -474,35 +313,28 @@ def ticket_analytics(request):
 
 @staff_member_required
 def payment_analytics(request):
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
     today = timezone.now().date()
     last_90_days = today - timedelta(days=90)
 
-    payments = Payment.objects.filter(created_at__date__gte=last_90_days)
+    rollups = DailyRollup.objects.filter(date__gte=last_90_days)
 
-    total_volume_raw = payments.filter(status="CONFIRMED").aggregate(Sum("amount"))[
-        "amount__sum"
-    ] or Decimal("0.00")
-    failed_volume_raw = payments.filter(status="FAILED").aggregate(Sum("amount"))[
-        "amount__sum"
-    ] or Decimal("0.00")
-    pending_volume_raw = payments.filter(status="PENDING").aggregate(Sum("amount"))[
-        "amount__sum"
-    ] or Decimal("0.00")
+    totals = usd_totals(rollups, "gross", "failed_amount", "pending_amount", "fees")
+    total_volume = totals["gross"]
+    failed_volume = totals["failed_amount"]
+    pending_volume = totals["pending_amount"]
 
-    total_volume = convert_to_usd(total_volume_raw, "XAF")
-    failed_volume = convert_to_usd(failed_volume_raw, "XAF")
-    pending_volume = convert_to_usd(pending_volume_raw, "XAF")
-
-    payments_by_gateway = (
-        payments.filter(status="CONFIRMED")
+    payments_by_gateway = list(
+        rollups.filter(payments_confirmed__gt=0)
         .values("provider")
-        .annotate(volume=Sum("amount"), count=Count("id"))
+        .annotate(volume=Sum("gross_usd"), count=Sum("payments_confirmed"))
+        .order_by("provider")
     )
 
     gateways = [p["provider"] for p in payments_by_gateway]
-    gateway_volumes = [
-        float(convert_to_usd(p["volume"], "XAF")) for p in payments_by_gateway
-    ]
+    gateway_volumes = [float(p["volume"]) for p in payments_by_gateway]
     gateway_counts = [p["count"] for p in payments_by_gateway]
 
     fig = make_subplots(
@@ -542,16 +374,10 @@ def payment_analytics(request):
         col=1,
     )
 
-    fees_by_date = (
-        payments.filter(status="CONFIRMED")
-        .annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(fees=Sum("service_fee"))
-        .order_by("date")
-    )
+    fees_by_date = daily_series(rollups, "fees", usd=True)
 
-    fee_dates = [f["date"] for f in fees_by_date]
-    fee_amounts = [float(convert_to_usd(f["fees"] or 0, "XAF")) for f in fees_by_date]
+    fee_dates = [date for date, _ in fees_by_date]
+    fee_amounts = [float(values["fees"]) for _, values in fees_by_date]
 
     fig.add_trace(
         go.Scatter(
@@ -581,13 +407,7 @@ def payment_analytics(request):
 
     chart_html = fig.to_html(include_plotlyjs="cdn", div_id="payment_analytics")
 
-    total_fees_raw = payments.filter(status="CONFIRMED").aggregate(
-        service=Sum("service_fee")
-    )
-
-    service_fees_usd = convert_to_usd(
-        total_fees_raw["service"] or Decimal("0.00"), "XAF"
-    )
+    service_fees_usd = totals["fees"]
 
     context = get_admin_context(request, "Payment Analytics")
     context.update(
@@ -0,0 +1,35 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.core.services.image_variants import (
+    IMAGE_VARIANT_FIELDS,
+    generate_image_variants,
+)
+from apps.events.services.listings import refresh_event_listings
+
+
+class Command(BaseCommand):
+    help = "Generate responsive image variants for uploaded covers and logos"
+
+    def handle(self, *args, **options):
+        generated = 0
+        for label, fields in IMAGE_VARIANT_FIELDS.items():
+            has_image = Q()
+            for field in fields:
+                has_image |= ~Q(**{field: ""})
+            pks = (
+                apps.get_model(label)
+                .objects.filter(has_image)
+                .values_list("pk", flat=True)
+            )
+            for pk in pks.iterator():
+                try:
+                    generated += len(generate_image_variants(label, pk))
+                except Exception as e:
+                    self.stderr.write(f"Skipped {label} {pk}: {e}")
+
+        refresh_event_listings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully generated {generated} image variant sets")
+        )
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import FileExtensionValidator
 from django.db import models
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from datetime import timedelta
@@ -10,6 +11,70 @@ import string
 from apps.core.validators import ALLOWED_IMAGE_EXTENSIONS, validate_image_file_size
 
 
+class FieldTrackingMixin:
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot_tracked_fields(fields)
+
+    def save(self, *args, **kwargs):
+        state = self.__dict__.get("_tracked_state", {})
+        for name in self.tracked_fields:
+            if name not in state and self._tracked_field(name).attname in self.__dict__:
+                self.previous(name)
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get("update_fields"))
+
+    def _tracked_field(self, name):
+        return self._meta.get_field(name)
+
+    def _snapshot_tracked_fields(self, fields=None):
+        state = self.__dict__.setdefault("_tracked_state", {})
+        for name in self.tracked_fields:
+            field = self._tracked_field(name)
+            if fields is not None and not {name, field.attname} & set(fields):
+                continue
+            if field.attname in self.__dict__:
+                value = getattr(self, field.attname)
+                state[name] = value.name if isinstance(value, FieldFile) else value
+
+    def previous(self, name):
+        """Value this instance loaded (or last saved), not the current row.
+
+        Two stale copies of the same row both report the same transition, so
+        consumers that must act once per transition need their own guard.
+        """
+        state = self.__dict__.get("_tracked_state")
+        if state is None:
+            return None
+        if name not in state:
+            state[name] = (
+                type(self)
+                ._base_manager.filter(pk=self.pk)
+                .values_list(self._tracked_field(name).attname, flat=True)
+                .first()
+            )
+        return state[name]
+
+    def has_changed(self, name):
+        attname = self._tracked_field(name).attname
+        if attname not in self.__dict__:
+            return False
+        value = getattr(self, attname)
+        if isinstance(value, FieldFile):
+            if not value._committed:
+                return True
+            value = value.name
+        return self.previous(name) != value
+
+
 class User(AbstractUser):
     class UserMode(models.TextChoices):
         ATTENDEE = "ATTENDEE", _("Attendee")
@@ -1,8 +1,15 @@
 import os
-from django.db.models.signals import pre_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from apps.orgs.models import Organization
 from apps.events.models import Event, EventCustomization
+from apps.core.services.image_variants import (
+    IMAGE_VARIANT_FIELDS,
+    delete_image_variants,
+    pending_image_fields,
+    sync_image_variants,
+)
 
 
 def delete_file_if_exists(file_field):
@@ -14,63 +21,95 @@ def delete_file_if_exists(file_field):
             pass
 
 
+def delete_replaced_file(instance, name):
+    previous = instance.previous(name)
+    if previous and instance.has_changed(name):
+        field = instance._meta.get_field(name)
+        delete_file_if_exists(field.attr_class(instance, field, previous))
+
+
+def _touches_images(instance, update_fields):
+    if update_fields is None:
+        return True
+    return bool(set(update_fields) & set(IMAGE_VARIANT_FIELDS[instance._meta.label]))
+
+
+def queue_image_variants(instance):
+    fields = pending_image_fields(instance)
+    if not fields:
+        return
+
+    from apps.core.tasks import generate_image_variants_task
+
+    label, pk = instance._meta.label, instance.pk
+    transaction.on_commit(
+        lambda: generate_image_variants_task.delay(label, pk, fields), robust=True
+    )
+
+
 @receiver(pre_save, sender=Organization)
-def delete_old_org_logo_on_update(sender, instance, **kwargs):
+def delete_old_org_logo_on_update(sender, instance, update_fields=None, **kwargs):
     if not instance.pk:
         return
 
-    try:
-        old_instance = Organization.objects.get(pk=instance.pk)
-        if old_instance.logo and old_instance.logo != instance.logo:
-            delete_file_if_exists(old_instance.logo)
-    except Organization.DoesNotExist:
-        pass
+    delete_replaced_file(instance, "logo")
+    if _touches_images(instance, update_fields):
+        sync_image_variants(instance)
+
+
+@receiver(post_save, sender=Organization)
+def queue_org_logo_variants(sender, instance, **kwargs):
+    queue_image_variants(instance)
 
 
 @receiver(post_delete, sender=Organization)
 def delete_org_logo_on_delete(sender, instance, **kwargs):
     delete_file_if_exists(instance.logo)
+    delete_image_variants(instance.image_variants.get("logo"))
 
 
 @receiver(pre_save, sender=Event)
-def delete_old_event_cover_on_update(sender, instance, **kwargs):
+def delete_old_event_cover_on_update(sender, instance, update_fields=None, **kwargs):
     if not instance.pk:
         return
 
-    try:
-        old_instance = Event.objects.get(pk=instance.pk)
-        if (
-            old_instance.cover_image
-            and old_instance.cover_image != instance.cover_image
-        ):
-            delete_file_if_exists(old_instance.cover_image)
-    except Event.DoesNotExist:
-        pass
+    delete_replaced_file(instance, "cover_image")
+    if _touches_images(instance, update_fields):
+        sync_image_variants(instance)
+
+
+@receiver(post_save, sender=Event)
+def queue_event_cover_variants(sender, instance, **kwargs):
+    queue_image_variants(instance)
 
 
 @receiver(post_delete, sender=Event)
 def delete_event_cover_on_delete(sender, instance, **kwargs):
     delete_file_if_exists(instance.cover_image)
+    delete_image_variants(instance.image_variants.get("cover_image"))
 
 
 @receiver(pre_save, sender=EventCustomization)
-def delete_old_customization_images_on_update(sender, instance, **kwargs):
+def delete_old_customization_images_on_update(
+    sender, instance, update_fields=None, **kwargs
+):
     if not instance.pk:
         return
 
-    try:
-        old_instance = EventCustomization.objects.get(pk=instance.pk)
+    delete_replaced_file(instance, "hero_image")
+    delete_replaced_file(instance, "logo")
+    if _touches_images(instance, update_fields):
+        sync_image_variants(instance)
 
-        if old_instance.hero_image and old_instance.hero_image != instance.hero_image:
-            delete_file_if_exists(old_instance.hero_image)
 
-        if old_instance.logo and old_instance.logo != instance.logo:
-            delete_file_if_exists(old_instance.logo)
-    except EventCustomization.DoesNotExist:
-        pass
+@receiver(post_save, sender=EventCustomization)
+def queue_customization_image_variants(sender, instance, **kwargs):
+    queue_image_variants(instance)
 
 
 @receiver(post_delete, sender=EventCustomization)
 def delete_customization_images_on_delete(sender, instance, **kwargs):
     delete_file_if_exists(instance.hero_image)
     delete_file_if_exists(instance.logo)
+    for variants in instance.image_variants.values():
+        delete_image_variants(variants)
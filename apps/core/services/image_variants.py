@@ -0,0 +1,203 @@
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+PDF_VARIANT_WIDTH = 480
+VARIANT_FORMATS = {
+    "avif": ("AVIF", "avif", {"quality": 50}),
+    "webp": ("WEBP", "webp", {"quality": 75, "method": 6}),
+    "jpeg": ("JPEG", "jpg", {"quality": 80, "optimize": True, "progressive": True}),
+}
+SOURCE_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+IMAGE_VARIANT_FIELDS = {
+    "events.Event": ("cover_image",),
+    "events.EventCustomization": ("hero_image", "logo"),
+    "orgs.Organization": ("logo",),
+}
+
+
+def variant_formats():
+    return [
+        name for name in VARIANT_FORMATS if name != "avif" or features.check("avif")
+    ]
+
+
+def _variant_name(name, suffix, extension):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}_{suffix}.{extension}"
+
+
+def _resize(image, width):
+    if image.width <= width:
+        return image
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _flatten(image):
+    if image.mode != "RGBA":
+        return image
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def _save(image, name, image_format, options):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    default_storage.delete(name)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def build_image_variants(file_field):
+    with file_field.open("rb") as source, Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    widths = [width for width in VARIANT_WIDTHS if width < image.width]
+    widths.append(min(image.width, VARIANT_WIDTHS[-1]))
+    variants = {"source": file_field.name, "width": image.width}
+    for name in variant_formats():
+        variants[name] = []
+
+    for width in widths:
+        resized = _resize(image, width)
+        for name in variant_formats():
+            image_format, extension, options = VARIANT_FORMATS[name]
+            encoded = _flatten(resized) if image_format == "JPEG" else resized
+            variants[name].append(
+                [
+                    width,
+                    _save(
+                        encoded,
+                        _variant_name(file_field.name, f"{width}w", extension),
+                        image_format,
+                        options,
+                    ),
+                ]
+            )
+
+    pdf = _resize(image, PDF_VARIANT_WIDTH)
+    if has_alpha:
+        variants["pdf"] = _save(
+            pdf, _variant_name(file_field.name, "pdf", "png"), "PNG", {"optimize": True}
+        )
+    else:
+        variants["pdf"] = _save(
+            pdf,
+            _variant_name(file_field.name, "pdf", "jpg"),
+            "JPEG",
+            {"quality": 85, "optimize": True},
+        )
+    return variants
+
+
+def variant_names(variants):
+    names = [variants["pdf"]] if variants.get("pdf") else []
+    for name in VARIANT_FORMATS:
+        names += [path for _, path in variants.get(name, [])]
+    return names
+
+
+def delete_image_variants(variants):
+    for name in variant_names(variants or {}):
+        try:
+            default_storage.delete(name)
+        except Exception:
+            pass
+
+
+def current_variants(image, variants):
+    name = getattr(image, "name", None)
+    if not variants or (name is not None and variants.get("source") != name):
+        return None
+    return variants
+
+
+def srcset(variants, image_format):
+    return ", ".join(
+        f"{default_storage.url(name)} {width}w"
+        for width, name in variants.get(image_format, [])
+    )
+
+
+def picture_sources(variants):
+    return [
+        {"type": SOURCE_TYPES[name], "srcset": srcset(variants, name)}
+        for name in variant_formats()
+        if name in SOURCE_TYPES and variants.get(name)
+    ]
+
+
+def variant_url(image, variants, variant="pdf"):
+    variants = current_variants(image, variants)
+    if variants and variants.get(variant):
+        return default_storage.url(variants[variant])
+    if not image:
+        return ""
+    return image.url if hasattr(image, "url") else image
+
+
+def open_variant(image, variants, variant="pdf"):
+    variants = current_variants(image, variants)
+    if variants and variants.get(variant):
+        return default_storage.open(variants[variant], "rb")
+    return image.open("rb")
+
+
+def sync_image_variants(instance):
+    fields = IMAGE_VARIANT_FIELDS[instance._meta.label]
+    kept = {}
+    for field, variants in (instance.image_variants or {}).items():
+        image = getattr(instance, field, None)
+        if image and variants.get("source") == image.name:
+            kept[field] = variants
+        else:
+            delete_image_variants(variants)
+    instance.image_variants = {
+        field: variants for field, variants in kept.items() if field in fields
+    }
+
+
+def pending_image_fields(instance):
+    return [
+        field
+        for field in IMAGE_VARIANT_FIELDS[instance._meta.label]
+        if getattr(instance, field)
+        and not current_variants(
+            getattr(instance, field), (instance.image_variants or {}).get(field)
+        )
+    ]
+
+
+def generate_image_variants(model_label, pk, fields=None):
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return []
+
+    variants = dict(instance.image_variants or {})
+    generated = []
+    for field in fields or IMAGE_VARIANT_FIELDS[model_label]:
+        image = getattr(instance, field)
+        if not image or current_variants(image, variants.get(field)):
+            continue
+        variants[field] = build_image_variants(image)
+        generated.append(field)
+
+    if generated:
+        updated = model.objects.filter(
+            pk=pk, **{field: getattr(instance, field).name for field in generated}
+        ).update(image_variants=variants, updated_at=timezone.now())
+        if not updated:
+            for field in generated:
+                delete_image_variants(variants[field])
+            return []
+    return generated
@@ -6,7 +6,9 @@ from django.utils import timezone
 from celery import shared_task
 
 from apps.core.models import OTPVerification
+from apps.core.services.image_variants import generate_image_variants
 from apps.core.services.notifications import NotificationService
+from apps.events.services.listings import refresh_event_listings
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -145,3 +147,15 @@ def cleanup_expired_otps_task():
             logger.debug(f"Deletion details: {details}")
     except Exception as e:
         logger.error(f"Failed to cleanup OTPs: {e}")
+
+
+@shared_task
+def generate_image_variants_task(model_label: str, pk: int, fields: list):
+    try:
+        generated = generate_image_variants(model_label, pk, fields)
+    except Exception as e:
+        logger.error(f"Failed to generate image variants for {model_label} {pk}: {e}")
+        return []
+    if generated and model_label == "events.Event":
+        refresh_event_listings([pk])
+    return generated
@@ -0,0 +1,45 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from apps.core.services.image_variants import (
+    current_variants,
+    picture_sources,
+    srcset,
+    variant_url,
+)
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, variants=None, sizes="100vw", **attrs):
+    src = variant_url(image, None)
+    if not src:
+        return ""
+
+    variants = current_variants(image, variants)
+    if not variants:
+        return format_html('<img src="{}"{}>', src, flatatt(attrs))
+
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (source["type"], source["srcset"], sizes)
+            for source in picture_sources(variants)
+        ),
+    )
+    return format_html(
+        '<picture class="contents">{}<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        sources,
+        src,
+        srcset(variants, "jpeg"),
+        sizes,
+        flatatt(attrs),
+    )
+
+
+@register.simple_tag
+def image_variant_url(image, variants=None, variant="pdf"):
+    return variant_url(image, variants, variant)
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+
+from apps.events.models import Event
+from apps.tickets.models import Booking
+
+
+def _selects(queries, table):
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestFieldTracking:
+    def test_save_compares_against_loaded_values(self, event):
+        event = Event.objects.get(pk=event.pk)
+        slug = event.slug
+        assert not event.has_changed("title")
+
+        event.title = "Renamed Event"
+        assert event.has_changed("title")
+        assert event.previous("title") == "Test Event"
+        with CaptureQueriesContext(connection) as queries:
+            event.save()
+
+        assert not _selects(queries, "events_event")
+        assert not _selects(queries, "orgs_organization")
+        assert event.slug != slug and event.slug.startswith("renamed-event-")
+        assert event.previous("title") == "Renamed Event"
+        assert not event.has_changed("title")
+
+    def test_deferred_status_is_read_before_write(self, event):
+        booking = Booking.objects.create(event=event, guest_email="a@example.com")
+        assert booking.previous("status") == Booking.Status.PENDING
+
+        seen = []
+
+        def record(sender, instance, **kwargs):
+            seen.append(instance.previous("status"))
+
+        post_save.connect(record, sender=Booking)
+        try:
+            booking = Booking.objects.only("id", "event_id").get(pk=booking.pk)
+            booking.status = Booking.Status.CONFIRMED
+            booking.save(update_fields=["status"])
+        finally:
+            post_save.disconnect(record, sender=Booking)
+
+        assert seen == [Booking.Status.PENDING]
+        assert booking.previous("status") == Booking.Status.CONFIRMED
+        assert not booking.has_changed("status")
@@ -0,0 +1,89 @@
+import base64
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from PIL import Image
+
+from apps.core import tasks
+from apps.core.services.image_variants import generate_image_variants
+from apps.events.models import Event, EventListing
+from apps.tickets.services import get_organization_logo_base64
+
+
+def _upload(name, size, mode="RGB", image_format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size, "teal").save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), f"image/{image_format.lower()}")
+
+
+@pytest.fixture
+def media(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = tmp_path
+    queued = []
+    monkeypatch.setattr(
+        tasks.generate_image_variants_task, "delay", lambda *args: queued.append(args)
+    )
+    return queued
+
+
+@pytest.mark.django_db
+class TestImageVariants:
+    def test_upload_generates_variants_for_listing_and_templates(
+        self, event, media, django_capture_on_commit_callbacks
+    ):
+        event.state = Event.State.PUBLISHED
+        event.is_public = True
+        event.cover_image = _upload("cover.png", (1000, 500))
+        with django_capture_on_commit_callbacks(execute=True):
+            event.save()
+
+        assert media == [("events.Event", event.pk, ["cover_image"])]
+        tasks.generate_image_variants_task(*media[0])
+
+        event.refresh_from_db()
+        variants = event.image_variants["cover_image"]
+        assert variants["source"] == event.cover_image.name
+        assert [width for width, _ in variants["jpeg"]] == [320, 640, 960, 1000]
+        assert [width for width, _ in variants["webp"]] == [320, 640, 960, 1000]
+        with default_storage.open(variants["pdf"]) as pdf:
+            assert Image.open(pdf).size == (480, 240)
+        assert EventListing.objects.get(pk=event.pk).cover_variants == variants
+        assert generate_image_variants("events.Event", event.pk) == []
+
+        html = Template(
+            "{% load image_tags %}"
+            "{% responsive_image event.cover_image event.image_variants.cover_image"
+            ' sizes="50vw" alt=event.title %}'
+        ).render(Context({"event": event}))
+        assert '<source type="image/webp"' in html
+        assert "cover_640w.jpg 640w" in html
+        assert 'alt="Test Event"' in html
+
+    def test_replacing_cover_drops_old_variants(self, event, media):
+        event.cover_image = _upload("first.png", (800, 400))
+        event.save()
+        generate_image_variants("events.Event", event.pk)
+        event.refresh_from_db()
+        old = event.image_variants["cover_image"]
+
+        event.cover_image = _upload("second.png", (800, 400))
+        event.save()
+
+        assert event.image_variants == {}
+        assert not default_storage.exists(old["pdf"])
+        assert not any(default_storage.exists(name) for _, name in old["jpeg"])
+
+    def test_ticket_pdf_logo_uses_pdf_variant(self, organization, media):
+        organization.logo = _upload("logo.png", (1200, 1200), mode="RGBA")
+        organization.save()
+        generate_image_variants("orgs.Organization", organization.pk)
+        organization.refresh_from_db()
+
+        logo = Image.open(
+            BytesIO(base64.b64decode(get_organization_logo_base64(organization)))
+        )
+        assert logo.format == "PNG"
+        assert logo.size == (480, 480)
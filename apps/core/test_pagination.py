@@ -0,0 +1,60 @@
+import pytest
+from decimal import Decimal
+from apps.core.utils.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from apps.tickets.models import Booking, Ticket
+
+
+@pytest.fixture
+def tickets(event, user, ticket_type):
+    booking = Booking.objects.create(event=event, user=user, total_amount=Decimal("0"))
+    return [
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+        for _ in range(5)
+    ]
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    def test_walks_forward_and_back(self, tickets):
+        paginator = KeysetPaginator(Ticket.objects.all(), ("-id",), per_page=2)
+        ids = [t.id for t in sorted(tickets, key=lambda t: -t.id)]
+
+        rows, has_next, has_previous = paginator.paginate()
+        assert [t.id for t in rows] == ids[:2]
+        assert has_next and not has_previous
+
+        rows, has_next, has_previous = paginator.paginate(
+            after=paginator.cursor(rows[-1])
+        )
+        assert [t.id for t in rows] == ids[2:4]
+        assert has_next and has_previous
+
+        rows, has_next, has_previous = paginator.paginate(
+            before=paginator.cursor(rows[0])
+        )
+        assert [t.id for t in rows] == ids[:2]
+        assert has_next and not has_previous
+
+    def test_tampered_cursor_starts_over(self, tickets):
+        paginator = KeysetPaginator(Ticket.objects.all(), ("id",), per_page=10)
+        rows, has_next, has_previous = paginator.paginate(after="bogus")
+        assert len(rows) == 5
+        assert not has_next and not has_previous
+
+    def test_cursors_from_other_feeds_start_over(self, tickets):
+        paginator = KeysetPaginator(Ticket.objects.all(), ("id",), per_page=2)
+        other = KeysetPaginator(Ticket.objects.all(), ("-id",))
+        for cursor in (
+            encode_cursor([tickets[1].id]),
+            encode_cursor([tickets[1].id, tickets[2].id]),
+            other.cursor(tickets[1]),
+        ):
+            rows, _, has_previous = paginator.paginate(after=cursor)
+            assert [t.id for t in rows] == [t.id for t in tickets[:2]]
+            assert not has_previous
+
+    def test_decode_rejects_wrong_length(self):
+        token = encode_cursor(["2025-01-01", 1], salt="feed")
+        assert decode_cursor(token, salt="feed") == ["2025-01-01", 1]
+        assert decode_cursor(token, salt="feed", length=3) is None
+        assert decode_cursor(token) is None
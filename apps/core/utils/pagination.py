@@ -0,0 +1,192 @@
+import hashlib
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+
+CURSOR_SALT = "apps.core.keyset-cursor"
+COUNT_CACHE_TIMEOUT = 60
+
+
+def _serialize(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values, salt=CURSOR_SALT):
+    return signing.dumps(
+        [_serialize(value) for value in values], salt=salt, compress=True
+    )
+
+
+def decode_cursor(token, salt=CURSOR_SALT, length=None):
+    if not token:
+        return None
+    try:
+        values = signing.loads(token, salt=salt)
+    except signing.BadSignature:
+        return None
+    if not isinstance(values, list):
+        return None
+    if length is not None and len(values) != length:
+        return None
+    return values
+
+
+def _resolve(obj, field):
+    value = obj
+    for part in field.split("__"):
+        value = getattr(value, part)
+    return value
+
+
+def keyset_q(fields, values):
+    condition = Q()
+    equal = Q()
+    for (field, descending), value in zip(fields, values):
+        lookup = "lt" if descending else "gt"
+        condition |= equal & Q(**{f"{field}__{lookup}": value})
+        equal &= Q(**{field: value})
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_url=None, previous_url=None):
+        self.object_list = object_list
+        self.next_url = next_url
+        self.previous_url = previous_url
+
+    @property
+    def has_next(self):
+        return self.next_url is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_url is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, ordering, per_page=50):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.fields = [
+            (field.lstrip("-"), field.startswith("-")) for field in ordering
+        ]
+        self.salt = f"{CURSOR_SALT}:{','.join(ordering)}"
+
+    def _ordering(self, reverse=False):
+        return [
+            f"-{field}" if descending != reverse else field
+            for field, descending in self.fields
+        ]
+
+    def cursor(self, obj):
+        return encode_cursor(
+            [_resolve(obj, field) for field, _ in self.fields], salt=self.salt
+        )
+
+    def _decode(self, token):
+        return decode_cursor(token, salt=self.salt, length=len(self.fields))
+
+    def _url(self, request, param, cursor):
+        query = request.GET.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query[param] = cursor
+        return f"?{query.urlencode()}"
+
+    def paginate(self, after=None, before=None):
+        queryset = self.queryset
+        reverse = False
+        values = self._decode(before)
+        if values is not None:
+            reverse = True
+            fields = [(field, not descending) for field, descending in self.fields]
+            queryset = queryset.filter(keyset_q(fields, values))
+        else:
+            values = self._decode(after)
+            if values is not None:
+                queryset = queryset.filter(keyset_q(self.fields, values))
+
+        rows = list(queryset.order_by(*self._ordering(reverse))[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            has_next, has_previous = bool(rows), has_more
+        else:
+            has_next, has_previous = has_more, values is not None and bool(rows)
+        return rows, has_next, has_previous
+
+    def get_page(self, request):
+        rows, has_next, has_previous = self.paginate(
+            after=request.GET.get("after"), before=request.GET.get("before")
+        )
+        next_url = (
+            self._url(request, "after", self.cursor(rows[-1])) if has_next else None
+        )
+        previous_url = (
+            self._url(request, "before", self.cursor(rows[0]))
+            if has_previous
+            else None
+        )
+        return KeysetPage(rows, next_url=next_url, previous_url=previous_url)
+
+
+def cached_aggregate(queryset, timeout=COUNT_CACHE_TIMEOUT, **aggregates):
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return queryset.aggregate(**aggregates)
+
+    signature = f"{sql}|{params}|{sorted((k, repr(v)) for k, v in aggregates.items())}"
+    key = "keyset_totals:" + hashlib.md5(signature.encode()).hexdigest()
+    totals = cache.get(key)
+    if totals is None:
+        totals = queryset.aggregate(**aggregates)
+        cache.set(key, totals, timeout)
+    return totals
+
+
+def stream_rows(
+    request, queryset, start_template, rows_template, end_template, context, chunk_size=500
+):
+    def render():
+        yield render_to_string(start_template, context, request=request)
+        chunk = []
+        offset = 0
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                yield render_to_string(
+                    rows_template, {**context, "tickets": chunk, "offset": offset}
+                )
+                offset += len(chunk)
+                chunk = []
+        if chunk:
+            yield render_to_string(
+                rows_template, {**context, "tickets": chunk, "offset": offset}
+            )
+        yield render_to_string(end_template, context, request=request)
+
+    return StreamingHttpResponse(render(), content_type="text/html; charset=utf-8")
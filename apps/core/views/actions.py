@@ -20,7 +20,7 @@ from apps.cfp.models import Proposal, SpeakerProfile
 from apps.core.models import OTPVerification, User
 from apps.core.tasks import resend_otp_task, send_otp_sms_task
 from apps.core.services.notifications import NotificationService
-from apps.events.models import Event
+from apps.events.models import Event, EventListing
 from apps.orgs.models import Membership
 
 
@@ -81,13 +81,9 @@ def manifest_view(request):
 
 class HomeView(View):
     def get(self, request):
-        featured_events = (
-            Event.objects.filter(
-                is_featured=True, is_public=True, state=Event.State.PUBLISHED
-            )
-            .select_related("organization")
-            .order_by("feature_order", "-feature_approved_at")[:5]
-        )
+        featured_events = EventListing.objects.filter(is_featured=True).order_by(
+            "feature_order", "-start_at"
+        )[:5]
 
         user_has_events = False
         if request.user.is_authenticated:
@@ -1,7 +1,14 @@
 from unfold.admin import ModelAdmin
 from django.contrib import admin
 from django.utils import timezone
-from apps.events.models import Event, EventCategory, EventFlyerConfig, CheckoutQuestion
+from apps.events.models import (
+    Event,
+    EventCategory,
+    EventFlyerConfig,
+    EventListing,
+    CheckoutQuestion,
+)
+from apps.events.services.listings import refresh_event_listings
 from apps.tickets.models import TicketType
 
 
@@ -126,14 +133,15 @@ class EventAdmin(ModelAdmin):
     @admin.action(description="Approve selected events for featuring")
     def approve_feature(self, request, queryset):
         now = timezone.now()
-        updated = queryset.filter(
-            feature_requested_at__isnull=False, is_featured=False
-        ).update(
+        pending = queryset.filter(feature_requested_at__isnull=False, is_featured=False)
+        event_ids = list(pending.values_list("pk", flat=True))
+        updated = pending.update(
             is_featured=True,
             feature_approved_at=now,
             feature_expires_at=now + timezone.timedelta(days=30),
             feature_rejection_reason="",
         )
+        refresh_event_listings(event_ids)
         self.message_user(request, f"{updated} event(s) approved for featuring.")
 
     @admin.action(description="Reject feature request for selected events")
@@ -147,12 +155,33 @@ class EventAdmin(ModelAdmin):
 
     @admin.action(description="Remove featured status from selected events")
     def remove_feature(self, request, queryset):
-        updated = queryset.filter(is_featured=True).update(
+        featured = queryset.filter(is_featured=True)
+        event_ids = list(featured.values_list("pk", flat=True))
+        updated = featured.update(
             is_featured=False, feature_approved_at=None, feature_expires_at=None
         )
+        refresh_event_listings(event_ids)
         self.message_user(request, f"{updated} event(s) removed from featured.")
 
 
+@admin.register(EventListing)
+class EventListingAdmin(ModelAdmin):
+    list_display = [
+        "title",
+        "organization_name",
+        "category_name",
+        "city",
+        "start_at",
+        "min_price",
+        "availability",
+        "updated_at",
+    ]
+    list_filter = ["availability", "is_free", "is_featured"]
+    search_fields = ["title", "organization_name", "city"]
+    readonly_fields = ["updated_at"]
+    ordering = ["-start_at"]
+
+
 @admin.register(TicketType)
 class TicketTypeAdmin(ModelAdmin):
     list_display = [
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.services.listings import refresh_event_listings
+
+
+class Command(BaseCommand):
+    help = "Rebuild the public event listing read model from source tables"
+
+    def handle(self, *args, **options):
+        refreshed = refresh_event_listings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt {refreshed} event listings")
+        )
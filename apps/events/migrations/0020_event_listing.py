@@ -0,0 +1,113 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0019_alter_event_cover_image"),
+        ("orgs", "0009_alter_invitation_email_alter_organization_logo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventListing",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="listing",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("organization_slug", models.SlugField(max_length=120)),
+                ("organization_name", models.CharField(max_length=100)),
+                ("title", models.CharField(max_length=200)),
+                ("slug", models.SlugField(max_length=220)),
+                ("short_description", models.CharField(blank=True, max_length=300)),
+                ("category_slug", models.SlugField(blank=True, max_length=110)),
+                ("category_name", models.CharField(blank=True, max_length=100)),
+                ("location", models.CharField(blank=True, max_length=200)),
+                ("city", models.CharField(blank=True, max_length=100)),
+                ("cover_url", models.CharField(blank=True, max_length=500)),
+                ("start_at", models.DateTimeField()),
+                ("end_at", models.DateTimeField()),
+                ("currency", models.CharField(default="XAF", max_length=3)),
+                ("is_free", models.BooleanField(default=False)),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                (
+                    "max_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                ("tickets_available", models.PositiveIntegerField(default=0)),
+                (
+                    "availability",
+                    models.CharField(
+                        choices=[
+                            ("ON_SALE", "On Sale"),
+                            ("LIMITED", "Limited"),
+                            ("SOLD_OUT", "Sold Out"),
+                            ("NOT_ON_SALE", "Not On Sale"),
+                            ("ENDED", "Ended"),
+                        ],
+                        default="ON_SALE",
+                        max_length=20,
+                    ),
+                ),
+                ("is_featured", models.BooleanField(default=False)),
+                ("feature_order", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="event_listings",
+                        to="orgs.organization",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["start_at", "event"],
+                        name="events_even_start_a_55c4fc_idx",
+                    ),
+                    models.Index(
+                        fields=["category_slug", "start_at"],
+                        name="events_even_categor_d6f123_idx",
+                    ),
+                    models.Index(
+                        fields=["city", "start_at"], name="events_even_city_20460d_idx"
+                    ),
+                    models.Index(
+                        fields=["organization", "start_at"],
+                        name="events_even_organiz_0dd5fb_idx",
+                    ),
+                    models.Index(
+                        fields=["min_price", "start_at"],
+                        name="events_even_min_pri_6cfe42_idx",
+                    ),
+                    models.Index(
+                        fields=["availability", "end_at"],
+                        name="events_even_availab_29d02f_idx",
+                    ),
+                    models.Index(
+                        fields=["is_featured", "feature_order"],
+                        name="events_even_is_feat_aaf21d_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
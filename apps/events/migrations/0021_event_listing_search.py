@@ -0,0 +1,96 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:35
+
+import operator
+from functools import reduce
+
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+SEARCH_FIELDS = (
+    ("title", "A"),
+    ("organization_name", "B"),
+    ("short_description", "B"),
+    ("venue_name", "C"),
+    ("city", "C"),
+    ("description_text", "D"),
+)
+SEARCH_CONFIGS = ("english", "french")
+FTS_TABLE = "events_eventlisting_search"
+
+POSTGRES_INDEXES = [
+    GinIndex(fields=["search_vector"], name="events_listing_search_gin"),
+    GinIndex(
+        fields=["title"], name="events_listing_title_trgm", opclasses=["gin_trgm_ops"]
+    ),
+    GinIndex(
+        fields=["organization_name"],
+        name="events_listing_org_trgm",
+        opclasses=["gin_trgm_ops"],
+    ),
+]
+
+
+def create_search_index(apps, schema_editor):
+    EventListing = apps.get_model("events", "EventListing")
+    columns = ", ".join(field for field, _ in SEARCH_FIELDS)
+
+    if schema_editor.connection.vendor == "postgresql":
+        for index in POSTGRES_INDEXES:
+            schema_editor.add_index(EventListing, index)
+        vector = reduce(
+            operator.add,
+            [
+                SearchVector(field, config=config, weight=weight)
+                for config in SEARCH_CONFIGS
+                for field, weight in SEARCH_FIELDS
+            ],
+        )
+        EventListing.objects.update(search_vector=vector)
+    else:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) "
+            f"SELECT event_id, {columns} FROM events_eventlisting"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    EventListing = apps.get_model("events", "EventListing")
+    if schema_editor.connection.vendor == "postgresql":
+        for index in POSTGRES_INDEXES:
+            schema_editor.remove_index(EventListing, index)
+    else:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0020_event_listing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlisting',
+            name='description_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='eventlisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventlisting',
+            name='venue_name',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_usage_emails(apps, schema_editor):
+    CouponUsage = apps.get_model("events", "CouponUsage")
+
+    usages = CouponUsage.objects.select_related("booking__user", "used_by")
+    for usage in usages.iterator():
+        booking = usage.booking
+        email = booking.guest_email or (booking.user.email if booking.user else "")
+        if not email and usage.used_by:
+            email = usage.used_by.email
+        if email:
+            usage.email = email.lower()
+            usage.save(update_fields=["email"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0022_image_variants'),
+        ('tickets', '0007_booking_delivery_method'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coupon',
+            name='max_uses_per_email',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='couponusage',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254),
+        ),
+        migrations.AddIndex(
+            model_name='couponusage',
+            index=models.Index(fields=['coupon', 'email'], name='events_coup_coupon__892be2_idx'),
+        ),
+        migrations.RunPython(backfill_usage_emails, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,12 @@
 import uuid
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from apps.core.validators import ALLOWED_IMAGE_EXTENSIONS, validate_image_file_size
+from apps.core.models import FieldTrackingMixin
 from apps.orgs.models import Organization
 
 
@@ -44,7 +46,7 @@ class EventCategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class Event(models.Model):
+class Event(FieldTrackingMixin, models.Model):
     class State(models.TextChoices):
         DRAFT = "DRAFT", _("Draft")
         PUBLISHED = "PUBLISHED", _("Published")
@@ -75,6 +77,7 @@ class Event(models.Model):
         blank=True,
         validators=[FileExtensionValidator(ALLOWED_IMAGE_EXTENSIONS), validate_image_file_size],
     )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     start_at = models.DateTimeField()
     end_at = models.DateTimeField()
     timezone = models.CharField(max_length=50, default="Africa/Douala")
@@ -111,6 +114,8 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tracked_fields = ("title", "cover_image", "state")
+
     class Meta:
         indexes = [
             models.Index(fields=["organization", "state"]),
@@ -124,14 +129,9 @@ class Event(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        if self.pk:
-            try:
-                old = Event.objects.get(pk=self.pk)
-                if old.title != self.title:
-                    base_slug = slugify(self.title)
-                    self.slug = f"{base_slug}-{uuid.uuid4().hex[:8]}"
-            except Event.DoesNotExist:
-                pass
+        if self.pk and self.has_changed("title"):
+            base_slug = slugify(self.title)
+            self.slug = f"{base_slug}-{uuid.uuid4().hex[:8]}"
         if not self.slug:
             base_slug = slugify(self.title)
             self.slug = f"{base_slug}-{uuid.uuid4().hex[:8]}"
@@ -146,7 +146,68 @@ class Event(models.Model):
         return f"/events/{self.organization.slug}/{self.slug}/dashboard/"
 
 
-class EventCustomization(models.Model):
+class EventListing(models.Model):
+    class Availability(models.TextChoices):
+        ON_SALE = "ON_SALE", _("On Sale")
+        LIMITED = "LIMITED", _("Limited")
+        SOLD_OUT = "SOLD_OUT", _("Sold Out")
+        NOT_ON_SALE = "NOT_ON_SALE", _("Not On Sale")
+        ENDED = "ENDED", _("Ended")
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="listing"
+    )
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="event_listings"
+    )
+    organization_slug = models.SlugField(max_length=120)
+    organization_name = models.CharField(max_length=100)
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=220)
+    short_description = models.CharField(max_length=300, blank=True)
+    category_slug = models.SlugField(max_length=110, blank=True)
+    category_name = models.CharField(max_length=100, blank=True)
+    location = models.CharField(max_length=200, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    venue_name = models.CharField(max_length=200, blank=True)
+    description_text = models.TextField(blank=True)
+    cover_url = models.CharField(max_length=500, blank=True)
+    cover_variants = models.JSONField(default=dict, blank=True)
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    currency = models.CharField(max_length=3, default="XAF")
+    is_free = models.BooleanField(default=False)
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    max_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    tickets_available = models.PositiveIntegerField(default=0)
+    availability = models.CharField(
+        max_length=20, choices=Availability.choices, default=Availability.ON_SALE
+    )
+    is_featured = models.BooleanField(default=False)
+    feature_order = models.PositiveIntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_at", "event"]),
+            models.Index(fields=["category_slug", "start_at"]),
+            models.Index(fields=["city", "start_at"]),
+            models.Index(fields=["organization", "start_at"]),
+            models.Index(fields=["min_price", "start_at"]),
+            models.Index(fields=["availability", "end_at"]),
+            models.Index(fields=["is_featured", "feature_order"]),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class EventCustomization(FieldTrackingMixin, models.Model):
     class LayoutTemplate(models.TextChoices):
         DEFAULT = "DEFAULT", _("Default")
         MINIMAL = "MINIMAL", _("Minimal")
@@ -167,11 +228,14 @@ class EventCustomization(models.Model):
     )
     hero_image = models.ImageField(upload_to="event_heroes/", blank=True)
     logo = models.ImageField(upload_to="event_logos/", blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     custom_css = models.TextField(blank=True)
     hide_reckot_branding = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tracked_fields = ("hero_image", "logo")
+
 
 class CheckoutQuestion(models.Model):
     class FieldType(models.TextChoices):
@@ -236,6 +300,7 @@ class Coupon(models.Model):
     assigned_email = models.EmailField(blank=True)
     assigned_emails = models.JSONField(default=list, blank=True)
     max_uses = models.PositiveIntegerField(default=1)
+    max_uses_per_email = models.PositiveIntegerField(default=0)
     use_count = models.PositiveIntegerField(default=0)
     valid_from = models.DateTimeField(null=True, blank=True)
     valid_until = models.DateTimeField(null=True, blank=True)
@@ -294,10 +359,6 @@ class Coupon(models.Model):
             return amount * (self.discount_value / 100)
         return min(self.discount_value, amount)
 
-    def use(self):
-        self.use_count += 1
-        self.save(update_fields=["use_count"])
-
 
 class CouponUsage(models.Model):
     coupon = models.ForeignKey(Coupon, on_delete=models.CASCADE, related_name="usages")
@@ -305,6 +366,7 @@ class CouponUsage(models.Model):
         "tickets.Booking", on_delete=models.CASCADE, related_name="coupon_usages"
     )
     discount_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    email = models.EmailField(blank=True)
     used_at = models.DateTimeField(auto_now_add=True)
     used_by = models.ForeignKey(
         "core.User", on_delete=models.SET_NULL, null=True, related_name="used_coupons"
@@ -314,6 +376,7 @@ class CouponUsage(models.Model):
         indexes = [
             models.Index(fields=["coupon", "used_at"]),
             models.Index(fields=["booking"]),
+            models.Index(fields=["coupon", "email"]),
         ]
 
 
@@ -0,0 +1,193 @@
+import secrets
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import batched
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.events.models import Coupon, CouponUsage
+
+COUPON_CACHE_TIMEOUT = 300
+COUPON_VERSION_KEY = "coupon_version:{}"
+COUPON_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+COUPON_CODE_LENGTH = 8
+COUPON_BATCH_SIZE = 1000
+MAX_GENERATED_COUPONS = 10000
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CouponDefinition:
+    id: int
+    code: str
+    discount_type: str
+    discount_value: Decimal
+    assignment_type: str
+    assigned_emails: frozenset
+    max_uses: int
+    max_uses_per_email: int
+    use_count: int
+    valid_from: object
+    valid_until: object
+
+    @classmethod
+    def from_coupon(cls, coupon):
+        emails = (
+            coupon.assigned_emails
+            if coupon.assignment_type == Coupon.AssignmentType.GROUP
+            else [coupon.assigned_email]
+        )
+        return cls(
+            id=coupon.id,
+            code=coupon.code,
+            discount_type=coupon.discount_type,
+            discount_value=coupon.discount_value,
+            assignment_type=coupon.assignment_type,
+            assigned_emails=frozenset(email.lower() for email in emails if email),
+            max_uses=coupon.max_uses,
+            max_uses_per_email=coupon.max_uses_per_email,
+            use_count=coupon.use_count,
+            valid_from=coupon.valid_from,
+            valid_until=coupon.valid_until,
+        )
+
+    @property
+    def is_valid(self):
+        now = timezone.now()
+        if self.max_uses > 0 and self.use_count >= self.max_uses:
+            return False
+        if self.valid_from and now < self.valid_from:
+            return False
+        if self.valid_until and now > self.valid_until:
+            return False
+        return True
+
+    def can_be_used_by(self, email):
+        if not self.is_valid:
+            return False
+        if self.assignment_type == Coupon.AssignmentType.PUBLIC:
+            return True
+        return email.lower() in self.assigned_emails
+
+    def calculate_discount(self, amount):
+        if self.discount_type == Coupon.DiscountType.PERCENTAGE:
+            return amount * (self.discount_value / Decimal("100"))
+        return min(self.discount_value, amount)
+
+
+def coupon_version(organization_id):
+    key = COUPON_VERSION_KEY.format(organization_id)
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def bump_coupon_version(organization_id):
+    key = COUPON_VERSION_KEY.format(organization_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_coupon_version_on_commit(organization_id):
+    transaction.on_commit(lambda: bump_coupon_version(organization_id), robust=True)
+
+
+def get_coupon(organization_id, event_id, code):
+    key = (
+        f"coupon:{organization_id}:{coupon_version(organization_id)}:{event_id}:{code}"
+    )
+    definition = cache.get(key, _MISSING)
+    if definition is _MISSING:
+        coupon = Coupon.objects.filter(
+            Q(event_id=event_id) | Q(event__isnull=True),
+            organization_id=organization_id,
+            code=code,
+            is_active=True,
+        ).first()
+        definition = CouponDefinition.from_coupon(coupon) if coupon else None
+        cache.set(key, definition, COUPON_CACHE_TIMEOUT)
+    return definition
+
+
+def validate_coupon(organization_id, event_id, code, email=""):
+    coupon = get_coupon(organization_id, event_id, code)
+    if not coupon:
+        return None, _("Invalid coupon code")
+    if not coupon.is_valid:
+        return None, _("This coupon is no longer valid")
+    if email and not coupon.can_be_used_by(email):
+        return None, _("This coupon cannot be used with your email")
+    return coupon, None
+
+
+def claim_coupon(coupon, organization_id, email):
+    now = timezone.now()
+    email = email.lower()
+    with transaction.atomic():
+        claimed = Coupon.objects.filter(
+            Q(max_uses=0) | Q(use_count__lt=F("max_uses")),
+            Q(valid_from__isnull=True) | Q(valid_from__lte=now),
+            Q(valid_until__isnull=True) | Q(valid_until__gte=now),
+            pk=coupon.id,
+            is_active=True,
+        ).update(use_count=F("use_count") + 1)
+        if not claimed:
+            bump_coupon_version_on_commit(organization_id)
+            return False
+
+        if (
+            coupon.max_uses_per_email
+            and CouponUsage.objects.filter(coupon_id=coupon.id, email=email).count()
+            >= coupon.max_uses_per_email
+        ):
+            transaction.set_rollback(True)
+            return False
+
+    if coupon.max_uses and coupon.use_count + 1 >= coupon.max_uses:
+        bump_coupon_version_on_commit(organization_id)
+    return True
+
+
+def record_coupon_usage(coupon, booking, email, discount_amount, user=None):
+    return CouponUsage.objects.create(
+        coupon_id=coupon.id,
+        booking=booking,
+        email=email.lower(),
+        used_by=user,
+        discount_amount=discount_amount,
+    )
+
+
+def _random_code(prefix, length):
+    return prefix + "".join(secrets.choice(COUPON_CODE_ALPHABET) for _ in range(length))
+
+
+def generate_coupon_codes(organization, count, prefix="", **fields):
+    count = min(count, MAX_GENERATED_COUPONS)
+    prefix = prefix[: Coupon._meta.get_field("code").max_length - COUPON_CODE_LENGTH]
+    created = []
+    while len(created) < count:
+        codes = {
+            _random_code(prefix, COUPON_CODE_LENGTH)
+            for _ in range(count - len(created))
+        }
+        for batch in batched(list(codes), COUPON_BATCH_SIZE):
+            codes.difference_update(
+                Coupon.objects.filter(
+                    organization=organization, code__in=batch
+                ).values_list("code", flat=True)
+            )
+        Coupon.objects.bulk_create(
+            [Coupon(organization=organization, code=code, **fields) for code in codes],
+            batch_size=COUPON_BATCH_SIZE,
+        )
+        created.extend(codes)
+    bump_coupon_version_on_commit(organization.id)
+    return sorted(created)
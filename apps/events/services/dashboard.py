@@ -0,0 +1,38 @@
+from django.core.cache import caches
+
+from apps.analytics.models import DailyRollup
+from apps.analytics.rollups import rollup_totals
+from apps.analytics.services import get_event_revenue
+from apps.analytics.versions import org_data_version
+
+EVENT_DASHBOARD_KEY = "event_dashboard:{}:{}"
+EVENT_DASHBOARD_TIMEOUT = 15 * 60
+
+
+def build_event_dashboard_summary(event_id):
+    totals = rollup_totals(
+        DailyRollup.objects.filter(event_id=event_id),
+        "tickets_sold",
+        "tickets_checked_in",
+        "orders",
+    )
+    tickets_sold = totals["tickets_sold"]
+    checked_in = totals["tickets_checked_in"]
+    return {
+        "tickets_sold": tickets_sold,
+        "checked_in": checked_in,
+        "checkin_rate": (checked_in / tickets_sold * 100) if tickets_sold else 0,
+        "orders": totals["orders"],
+        "revenue": get_event_revenue(event_id)["gross"],
+    }
+
+
+def event_dashboard_summary(event):
+    cache = caches["analytics"]
+    version = org_data_version(event.organization_id)
+    key = EVENT_DASHBOARD_KEY.format(event.id, version)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_event_dashboard_summary(event.id)
+        cache.set(key, summary, EVENT_DASHBOARD_TIMEOUT)
+    return {**summary, "version": version}
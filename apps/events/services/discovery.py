@@ -0,0 +1,181 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.core.services.image_variants import picture_sources, srcset
+from apps.core.utils.pagination import KeysetPaginator
+from apps.events.models import EventListing
+from apps.events.services.search import (
+    SEARCH_ORDERING,
+    annotate_search,
+    highlight,
+    search_filter,
+)
+
+DISCOVERY_PAGE_SIZE = 24
+DISCOVERY_MAX_PAGE_SIZE = 60
+DISCOVERY_ORDERING = ("-start_at", "-event_id")
+DISCOVERY_CACHE_KEY = "discover:first_page"
+DISCOVERY_CACHE_TIMEOUT = 60
+CITY_FACET_LIMIT = 20
+
+FREE = Q(is_free=True) | Q(min_price=0)
+PAID = Q(is_free=False, min_price__gt=0)
+
+
+def _decimal(value):
+    try:
+        return Decimal(value) if value else None
+    except InvalidOperation:
+        return None
+
+
+def _day_start(value):
+    day = parse_date(value or "")
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def parse_filters(params):
+    filters = {
+        "q": params.get("q", "").strip(),
+        "category": params.get("category", "").strip(),
+        "city": params.get("city", "").strip(),
+        "date_from": _day_start(params.get("date_from")),
+        "date_to": _day_start(params.get("date_to")),
+        "price": params.get("price") if params.get("price") in ("free", "paid") else "",
+        "price_min": _decimal(params.get("price_min")),
+        "price_max": _decimal(params.get("price_max")),
+    }
+    return {key: value for key, value in filters.items() if value not in ("", None)}
+
+
+def parse_page_size(value):
+    try:
+        return max(1, min(int(value), DISCOVERY_MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DISCOVERY_PAGE_SIZE
+
+
+def filter_events(filters, skip=None):
+    queryset = EventListing.objects.all()
+    filters = {key: value for key, value in filters.items() if key != skip}
+    if skip == "price":
+        filters.pop("price_min", None)
+        filters.pop("price_max", None)
+
+    if "q" in filters:
+        queryset = search_filter(queryset, filters["q"])
+    if "category" in filters:
+        queryset = queryset.filter(category_slug=filters["category"])
+    if "city" in filters:
+        queryset = queryset.filter(
+            Q(city__icontains=filters["city"]) | Q(location__icontains=filters["city"])
+        )
+    if "date_from" in filters:
+        queryset = queryset.filter(start_at__gte=filters["date_from"])
+    if "date_to" in filters:
+        queryset = queryset.filter(start_at__lt=filters["date_to"] + timedelta(days=1))
+    if filters.get("price") == "free":
+        queryset = queryset.filter(FREE)
+    elif filters.get("price") == "paid":
+        queryset = queryset.filter(PAID)
+    if "price_min" in filters:
+        queryset = queryset.filter(min_price__gte=filters["price_min"])
+    if "price_max" in filters:
+        queryset = queryset.filter(min_price__lte=filters["price_max"])
+    return queryset
+
+
+def get_facets(filters):
+    categories = (
+        filter_events(filters, skip="category")
+        .exclude(category_slug="")
+        .values("category_slug", "category_name")
+        .annotate(count=Count("pk"))
+        .order_by("-count", "category_name")
+    )
+    cities = (
+        filter_events(filters, skip="city")
+        .exclude(city="")
+        .values("city")
+        .annotate(count=Count("pk"))
+        .order_by("-count", "city")[:CITY_FACET_LIMIT]
+    )
+    price = filter_events(filters, skip="price").aggregate(
+        free=Count("pk", filter=FREE),
+        paid=Count("pk", filter=PAID),
+    )
+    return {
+        "categories": [
+            {
+                "slug": row["category_slug"],
+                "name": row["category_name"],
+                "count": row["count"],
+            }
+            for row in categories
+        ],
+        "cities": [{"city": row["city"], "count": row["count"]} for row in cities],
+        "price": price,
+    }
+
+
+def serialize_listing(listing):
+    return {
+        "id": listing.event_id,
+        "title": listing.title,
+        "short_description": listing.short_description,
+        "location": listing.location,
+        "city": listing.city,
+        "location_short": (listing.location or listing.city or "Online")[:20],
+        "start_at": listing.start_at.isoformat(),
+        "end_at": listing.end_at.isoformat(),
+        "date_formatted": listing.start_at.strftime("%b %d, %Y"),
+        "category_name": listing.category_name,
+        "category_slug": listing.category_slug,
+        "cover_image": listing.cover_url,
+        "cover_srcset": srcset(listing.cover_variants, "jpeg"),
+        "cover_sources": picture_sources(listing.cover_variants),
+        "is_free": listing.is_free,
+        "min_price": float(listing.min_price or 0),
+        "max_price": float(listing.max_price or 0),
+        "currency": listing.currency,
+        "availability": listing.availability,
+        "url": reverse(
+            "events:public_detail",
+            kwargs={"org_slug": listing.organization_slug, "event_slug": listing.slug},
+        ),
+        "headline": highlight(getattr(listing, "search_headline", "")),
+    }
+
+
+def build_discovery_page(filters, after=None, per_page=DISCOVERY_PAGE_SIZE):
+    queryset = filter_events(filters)
+    ordering = DISCOVERY_ORDERING
+    if "q" in filters:
+        queryset = annotate_search(queryset, filters["q"])
+        ordering = SEARCH_ORDERING
+    paginator = KeysetPaginator(queryset, ordering, per_page=per_page)
+    rows, has_next, _ = paginator.paginate(after=after)
+    return {
+        "results": [serialize_listing(listing) for listing in rows],
+        "next": paginator.cursor(rows[-1]) if has_next else None,
+        "total": filter_events(filters).count(),
+        "facets": get_facets(filters),
+    }
+
+
+def get_discovery_page(filters, after=None, per_page=DISCOVERY_PAGE_SIZE):
+    if filters or after or per_page != DISCOVERY_PAGE_SIZE:
+        return build_discovery_page(filters, after, per_page)
+    data = cache.get(DISCOVERY_CACHE_KEY)
+    if data is None:
+        data = build_discovery_page({})
+        cache.set(DISCOVERY_CACHE_KEY, data, DISCOVERY_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,128 @@
+import hashlib
+import json
+from io import BytesIO
+
+from django.core.cache import caches
+
+from apps.events.models import EventFlyerConfig, FlyerBilling, FlyerGeneration
+from apps.events.services.flyer_service import generate_flyer
+
+_flyer_cache = caches["reports"]
+FLYER_RESULT_TTL = 6 * 3600
+FLYER_PENDING_TTL = 5 * 60
+
+PENDING = "pending"
+FAILED = "failed"
+READY = "ready"
+
+
+def _result_key(digest):
+    return f"flyer:{digest}"
+
+
+def _status_key(digest):
+    return f"flyer_status:{digest}"
+
+
+def _photo_key(digest):
+    return f"flyer_photo:{digest}"
+
+
+def _generation_key(digest, ticket_id):
+    return f"flyer_generation:{digest}:{ticket_id}"
+
+
+def _pending_generations_key(digest):
+    return f"flyer_pending_generations:{digest}"
+
+
+def _event_key(digest):
+    return f"flyer_event:{digest}"
+
+
+def flyer_digest(config, photo_bytes, text_values):
+    payload = json.dumps(
+        [
+            config.pk,
+            config.updated_at.isoformat(),
+            hashlib.sha256(photo_bytes).hexdigest(),
+            sorted(text_values.items()),
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_rendered_flyer(digest):
+    return _flyer_cache.get(_result_key(digest))
+
+
+def flyer_event_id(digest):
+    return _flyer_cache.get(_event_key(digest))
+
+
+def flyer_render_state(digest):
+    if _flyer_cache.has_key(_result_key(digest)):
+        return READY
+    return _flyer_cache.get(_status_key(digest))
+
+
+def queue_flyer_render(digest, photo_bytes):
+    if _flyer_cache.get(_status_key(digest)) == FAILED:
+        _flyer_cache.delete(_status_key(digest))
+    if not _flyer_cache.add(_status_key(digest), PENDING, FLYER_PENDING_TTL):
+        return False
+    _flyer_cache.set(_photo_key(digest), photo_bytes, FLYER_PENDING_TTL)
+    return True
+
+
+def mark_flyer_failed(digest):
+    _flyer_cache.set(_status_key(digest), FAILED, FLYER_PENDING_TTL)
+    _flyer_cache.delete(_photo_key(digest))
+
+
+def flyer_generation_recorded(digest, ticket_id):
+    return _flyer_cache.has_key(_generation_key(digest, ticket_id))
+
+
+def claim_flyer_generation(digest, ticket_id):
+    return _flyer_cache.add(_generation_key(digest, ticket_id), True, FLYER_RESULT_TTL)
+
+
+def record_flyer_generation(event, rate_per_flyer=None, **generation):
+    FlyerGeneration.objects.create(event=event, **generation)
+    if rate_per_flyer is not None:
+        billing, _created = FlyerBilling.objects.get_or_create(
+            event=event, defaults={"rate_per_flyer": rate_per_flyer}
+        )
+        billing.update_totals()
+
+
+def queue_flyer_generation(digest, ticket_id, **generation):
+    pending = _flyer_cache.get(_pending_generations_key(digest)) or {}
+    pending[ticket_id] = generation
+    _flyer_cache.set(_pending_generations_key(digest), pending, FLYER_RESULT_TTL)
+
+
+def record_flyer_generations(digest, event):
+    pending = _flyer_cache.get(_pending_generations_key(digest)) or {}
+    _flyer_cache.delete(_pending_generations_key(digest))
+    for ticket_id, generation in pending.items():
+        if claim_flyer_generation(digest, ticket_id):
+            record_flyer_generation(event, ticket_id=ticket_id, **generation)
+
+
+def render_flyer(digest, config_id, text_values):
+    config = EventFlyerConfig.objects.get(pk=config_id)
+    photo_bytes = _flyer_cache.get(_photo_key(digest))
+    if photo_bytes is None:
+        mark_flyer_failed(digest)
+        return False
+
+    output = generate_flyer(
+        config, BytesIO(photo_bytes) if photo_bytes else None, text_values
+    )
+    _flyer_cache.set(_result_key(digest), output.getvalue(), FLYER_RESULT_TTL)
+    _flyer_cache.set(_event_key(digest), config.event_id, FLYER_RESULT_TTL)
+    _flyer_cache.delete_many([_status_key(digest), _photo_key(digest)])
+    record_flyer_generations(digest, config.event)
+    return True
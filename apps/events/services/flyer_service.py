@@ -1,7 +1,35 @@
+from dataclasses import dataclass
+from functools import cache, lru_cache
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 import os
 
+from django.core.files.storage import default_storage
+
+from apps.events.models import FlyerTextField
+
+FLYER_TEMPLATE_CACHE_SIZE = 8
+FONT_CACHE_SIZE = 64
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "C:\\Windows\\Fonts\\arial.ttf",
+]
+
+
+@dataclass(frozen=True)
+class TextFieldSpec:
+    id: int
+    label: str
+    x: int
+    y: int
+    font_size: int
+    font_weight: str
+    color: tuple
+    text_align: str
+    bg_color: tuple
+
 
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip("#")
@@ -26,6 +54,7 @@ def parse_color(color_str):
         return rgb + (255,)
 
 
+@lru_cache(maxsize=32)
 def create_circular_mask(size):
     mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
@@ -33,6 +62,7 @@ def create_circular_mask(size):
     return mask
 
 
+@lru_cache(maxsize=32)
 def create_rounded_mask(size, radius=None):
     if radius is None:
         radius = min(size[0], size[1]) // 8
@@ -42,28 +72,64 @@ def create_rounded_mask(size, radius=None):
     return mask
 
 
+@cache
+def _font_paths():
+    return [path for path in FONT_PATHS if os.path.exists(path)]
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load_font(path, size):
+    return ImageFont.truetype(path, size)
+
+
 def get_font(size, weight="regular"):
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/System/Library/Fonts/Helvetica.ttc",
-        "C:\\Windows\\Fonts\\arial.ttf",
-    ]
-    for path in font_paths:
-        if os.path.exists(path):
-            try:
-                return ImageFont.truetype(path, size)
-            except Exception:
-                continue
+    for path in _font_paths():
+        try:
+            return _load_font(path, size)
+        except Exception:
+            continue
     return ImageFont.load_default()
 
 
-def generate_flyer(config, user_photo, text_values: dict) -> BytesIO:
-    template = Image.open(config.template_image.path).convert("RGBA")
-    template = template.resize(
-        (config.output_width, config.output_height), Image.Resampling.LANCZOS
+@lru_cache(maxsize=FLYER_TEMPLATE_CACHE_SIZE)
+def _template_bitmap(config_id, updated_at, name, size):
+    with default_storage.open(name) as source, Image.open(source) as image:
+        return image.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+
+
+@lru_cache(maxsize=FLYER_TEMPLATE_CACHE_SIZE * 4)
+def _text_field_specs(config_id, updated_at):
+    return tuple(
+        TextFieldSpec(
+            id=field.id,
+            label=field.label,
+            x=field.x,
+            y=field.y,
+            font_size=field.font_size,
+            font_weight=field.font_weight,
+            color=hex_to_rgb(field.font_color),
+            text_align=field.text_align,
+            bg_color=parse_color(field.bg_color) if field.bg_color else None,
+        )
+        for field in FlyerTextField.objects.filter(flyer_config_id=config_id)
     )
 
+
+def clear_flyer_caches():
+    _template_bitmap.cache_clear()
+    _text_field_specs.cache_clear()
+    _load_font.cache_clear()
+    _font_paths.cache_clear()
+
+
+def generate_flyer(config, user_photo, text_values: dict) -> BytesIO:
+    template = _template_bitmap(
+        config.pk,
+        config.updated_at,
+        config.template_image.name,
+        (config.output_width, config.output_height),
+    ).copy()
+
     if user_photo:
         photo = Image.open(user_photo).convert("RGBA")
         photo = ImageOps.fit(
@@ -136,13 +202,13 @@ def generate_flyer(config, user_photo, text_values: dict) -> BytesIO:
             template.paste(photo, (config.photo_x, config.photo_y), photo)
 
     draw = ImageDraw.Draw(template)
-    for field in config.text_fields.all():
+    for field in _text_field_specs(config.pk, config.updated_at):
         text = text_values.get(str(field.id), "") or text_values.get(field.label, "")
         if not text:
             continue
 
         font = get_font(field.font_size, field.font_weight)
-        color = hex_to_rgb(field.font_color)
+        color = field.color
 
         bbox = draw.textbbox((0, 0), text, font=font)
         text_width = bbox[2] - bbox[0]
@@ -155,8 +221,8 @@ def generate_flyer(config, user_photo, text_values: dict) -> BytesIO:
         else:
             x = field.x
 
-        if hasattr(field, "bg_color") and field.bg_color:
-            bg_color = parse_color(field.bg_color)
+        if field.bg_color:
+            bg_color = field.bg_color
             if bg_color[3] > 0:
                 padding = 8
                 bg_bbox = (
@@ -0,0 +1,178 @@
+from html import unescape
+from itertools import batched
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.core.services.image_variants import current_variants
+from apps.events.models import Event, EventListing
+from apps.events.services.search import index_listing_search
+from apps.tickets.models import Ticket, TicketType
+
+LISTING_BATCH_SIZE = 1000
+LIMITED_AVAILABILITY_RATIO = 0.1
+LISTING_REFRESH_DELAY = 30
+LISTING_REFRESH_KEY_TTL = 5 * 60
+LISTING_REFRESH_KEY = "listing_refresh:{}"
+
+LISTING_UPDATE_FIELDS = [
+    "organization",
+    "organization_slug",
+    "organization_name",
+    "title",
+    "slug",
+    "short_description",
+    "category_slug",
+    "category_name",
+    "location",
+    "city",
+    "venue_name",
+    "description_text",
+    "cover_url",
+    "cover_variants",
+    "start_at",
+    "end_at",
+    "currency",
+    "is_free",
+    "min_price",
+    "max_price",
+    "tickets_available",
+    "availability",
+    "is_featured",
+    "feature_order",
+    "updated_at",
+]
+
+
+def _listing_source():
+    active = Q(ticket_types__is_active=True)
+    capacity = (
+        TicketType.objects.filter(event=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("event")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    sold = (
+        Ticket.objects.filter(
+            ticket_type__event=OuterRef("pk"), ticket_type__is_active=True
+        )
+        .order_by()
+        .values("ticket_type__event")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return (
+        Event.objects.filter(is_public=True, state=Event.State.PUBLISHED)
+        .select_related("organization", "category")
+        .annotate(
+            listing_min_price=Min("ticket_types__price", filter=active),
+            listing_max_price=Max("ticket_types__price", filter=active),
+            ticket_capacity=Coalesce(Subquery(capacity), Value(0)),
+            tickets_sold=Coalesce(Subquery(sold), Value(0)),
+        )
+    )
+
+
+def _availability(event, remaining, now):
+    if event.end_at < now:
+        return EventListing.Availability.ENDED
+    if not event.ticket_capacity:
+        return EventListing.Availability.NOT_ON_SALE
+    if not remaining:
+        return EventListing.Availability.SOLD_OUT
+    if remaining <= event.ticket_capacity * LIMITED_AVAILABILITY_RATIO:
+        return EventListing.Availability.LIMITED
+    return EventListing.Availability.ON_SALE
+
+
+def build_listing(event, now):
+    remaining = max(0, event.ticket_capacity - event.tickets_sold)
+    description_text = unescape(strip_tags(event.description or ""))
+    return EventListing(
+        event=event,
+        organization_id=event.organization_id,
+        organization_slug=event.organization.slug,
+        organization_name=event.organization.name,
+        title=event.title,
+        slug=event.slug,
+        short_description=event.short_description or description_text[:150],
+        category_slug=event.category.slug if event.category else "",
+        category_name=event.category.name if event.category else "",
+        location=event.location,
+        city=event.city,
+        venue_name=event.venue_name,
+        description_text=description_text,
+        cover_url=event.cover_image.url if event.cover_image else "",
+        cover_variants=current_variants(
+            event.cover_image, event.image_variants.get("cover_image")
+        )
+        or {},
+        start_at=event.start_at,
+        end_at=event.end_at,
+        currency=event.organization.currency,
+        is_free=event.is_free,
+        min_price=event.listing_min_price,
+        max_price=event.listing_max_price,
+        tickets_available=remaining,
+        availability=_availability(event, remaining, now),
+        is_featured=event.is_featured,
+        feature_order=event.feature_order,
+    )
+
+
+def refresh_event_listings(event_ids=None):
+    now = timezone.now()
+    events = _listing_source()
+    if event_ids is not None:
+        events = events.filter(pk__in=event_ids)
+
+    refreshed = 0
+    with transaction.atomic():
+        for batch in batched(
+            events.iterator(chunk_size=LISTING_BATCH_SIZE), LISTING_BATCH_SIZE
+        ):
+            EventListing.objects.bulk_create(
+                [build_listing(event, now) for event in batch],
+                update_conflicts=True,
+                unique_fields=["event"],
+                update_fields=LISTING_UPDATE_FIELDS,
+            )
+            refreshed += len(batch)
+
+        stale = EventListing.objects.filter(updated_at__lt=now)
+        if event_ids is not None:
+            stale = stale.filter(event_id__in=event_ids)
+        stale.delete()
+        index_listing_search(event_ids)
+    return refreshed
+
+
+def refresh_listing_on_commit(*event_ids):
+    event_ids = [event_id for event_id in event_ids if event_id]
+    if event_ids:
+        transaction.on_commit(lambda: refresh_event_listings(event_ids), robust=True)
+
+
+def queue_listing_refresh(event_id):
+    from apps.events.tasks import refresh_event_listing_task
+
+    def enqueue():
+        if cache.add(
+            LISTING_REFRESH_KEY.format(event_id), True, LISTING_REFRESH_KEY_TTL
+        ):
+            refresh_event_listing_task.apply_async(
+                (event_id,), countdown=LISTING_REFRESH_DELAY
+            )
+
+    if event_id:
+        transaction.on_commit(enqueue, robust=True)
+
+
+def refresh_queued_listing(event_id):
+    cache.delete(LISTING_REFRESH_KEY.format(event_id))
+    return refresh_event_listings([event_id])
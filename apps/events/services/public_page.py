@@ -0,0 +1,86 @@
+import hashlib
+
+from django.db.models import Count, F, Max
+from django.utils import timezone
+from django.utils.translation import get_language
+
+from apps.events.models import Event
+from apps.tickets.models import TicketType
+
+PUBLIC_PAGE_CACHE_TIMEOUT = 15 * 60
+
+PAGE_STAMP_FIELDS = (
+    "updated_at",
+    "organization__updated_at",
+    "customization__updated_at",
+    "flyer_config__updated_at",
+)
+
+
+def _digest(*parts):
+    return hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _sold_out_ticket_types(event_id):
+    return list(
+        TicketType.objects.filter(event_id=event_id, is_active=True)
+        .annotate(
+            sold=Count("tickets"), sold_out_at=Max("tickets__booking__created_at")
+        )
+        .filter(sold__gte=F("quantity"))
+        .order_by("pk")
+        .values_list("pk", "sold_out_at")
+    )
+
+
+def public_page_state(request, org_slug, event_slug):
+    if not hasattr(request, "_public_page_state"):
+        request._public_page_state = None
+        if not request.GET.get("preview"):
+            row = (
+                Event.objects.filter(
+                    organization__slug=org_slug,
+                    slug=event_slug,
+                    state=Event.State.PUBLISHED,
+                )
+                .values("pk", "end_at", *PAGE_STAMP_FIELDS)
+                .first()
+            )
+            if row:
+                stamps = [row[field] for field in PAGE_STAMP_FIELDS if row[field]]
+                ended = row["end_at"] < timezone.now()
+                sold_out = _sold_out_ticket_types(row["pk"])
+                changes = [*stamps, *(moment for _, moment in sold_out if moment)]
+                if ended:
+                    changes.append(row["end_at"])
+                request._public_page_state = {
+                    "last_modified": max(changes),
+                    "version": _digest(
+                        row["pk"],
+                        *(stamp.isoformat() for stamp in stamps),
+                        ended,
+                        [pk for pk, _ in sold_out],
+                    ),
+                }
+    return request._public_page_state
+
+
+def public_page_fragment_version(request, org_slug, event_slug):
+    state = public_page_state(request, org_slug, event_slug)
+    if state is None:
+        return None
+    return _digest(state["version"], get_language(), request.get_host())
+
+
+def public_page_etag(request, org_slug, event_slug):
+    state = public_page_state(request, org_slug, event_slug)
+    if state is None:
+        return None
+    return _digest(
+        state["version"], get_language(), request.get_host(), request.user.pk
+    )
+
+
+def public_page_last_modified(request, org_slug, event_slug):
+    state = public_page_state(request, org_slug, event_slug)
+    return state["last_modified"] if state else None
@@ -0,0 +1,170 @@
+import operator
+import re
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Concat, Greatest
+from django.utils.html import escape
+from django.utils.translation import get_language
+
+from apps.events.models import EventListing
+
+SEARCH_CONFIGS = {"en": "english", "fr": "french"}
+SEARCH_FIELDS = (
+    ("title", "A"),
+    ("organization_name", "B"),
+    ("short_description", "B"),
+    ("venue_name", "C"),
+    ("city", "C"),
+    ("description_text", "D"),
+)
+SEARCH_ORDERING = ("-search_rank", "-start_at", "-event_id")
+FTS_TABLE = "events_eventlisting_search"
+FTS_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 2.0, "D": 1.0}
+HEADLINE_WORDS = 24
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def search_configs():
+    return [
+        SEARCH_CONFIGS[code] for code, _ in settings.LANGUAGES if code in SEARCH_CONFIGS
+    ]
+
+
+def listing_search_vector():
+    return reduce(
+        operator.add,
+        [
+            SearchVector(field, config=config, weight=weight)
+            for config in search_configs()
+            for field, weight in SEARCH_FIELDS
+        ],
+    )
+
+
+def _search_query(query):
+    return reduce(
+        operator.or_,
+        [
+            SearchQuery(query, config=config, search_type="websearch")
+            for config in search_configs()
+        ],
+    )
+
+
+def _fts_match(query):
+    return " ".join(f'"{token}"*' for token in TOKEN_RE.findall(query))
+
+
+def _fts_subquery(select, match, correlated=False):
+    sql = f"SELECT {select} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    if correlated:
+        sql += f' AND rowid = "{EventListing._meta.db_table}"."event_id"'
+    return sql, (match,)
+
+
+def index_listing_search(event_ids=None):
+    listings = EventListing.objects.all()
+    if event_ids is not None:
+        listings = listings.filter(pk__in=event_ids)
+
+    if connection.vendor == "postgresql":
+        listings.update(search_vector=listing_search_vector())
+        return
+
+    columns = ", ".join(field for field, _ in SEARCH_FIELDS)
+    try:
+        rows, params = listings.values_list("pk").query.sql_with_params()
+    except EmptyResultSet:
+        return
+    with connection.cursor() as cursor:
+        if event_ids is None:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        else:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({rows})", params)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) "
+            f"SELECT event_id, {columns} FROM {EventListing._meta.db_table} "
+            f"WHERE event_id IN ({rows})",
+            params,
+        )
+
+
+def search_filter(queryset, query):
+    if connection.vendor == "postgresql":
+        return queryset.filter(
+            Q(search_vector=_search_query(query))
+            | Q(title__trigram_word_similar=query)
+            | Q(organization_name__trigram_word_similar=query)
+        )
+
+    match = _fts_match(query)
+    if not match:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(*_fts_subquery("rowid", match)))
+
+
+def annotate_search(queryset, query):
+    if connection.vendor == "postgresql":
+        search_query = _search_query(query)
+        return queryset.annotate(
+            search_rank=SearchRank(F("search_vector"), search_query)
+            + Greatest(
+                TrigramWordSimilarity(query, "title"),
+                TrigramWordSimilarity(query, "organization_name"),
+            ),
+            search_headline=SearchHeadline(
+                Concat(
+                    "short_description",
+                    Value(" "),
+                    "description_text",
+                    output_field=TextField(),
+                ),
+                search_query,
+                config=SEARCH_CONFIGS.get(get_language(), "english"),
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=HEADLINE_WORDS,
+                min_words=HEADLINE_WORDS // 2,
+                max_fragments=2,
+            ),
+        )
+
+    match = _fts_match(query)
+    weights = ", ".join(str(FTS_WEIGHTS[weight]) for _, weight in SEARCH_FIELDS)
+    return queryset.annotate(
+        search_rank=RawSQL(
+            *_fts_subquery(f"-bm25({FTS_TABLE}, {weights})", match, correlated=True),
+            output_field=FloatField(),
+        ),
+        search_headline=RawSQL(
+            *_fts_subquery(
+                f"snippet({FTS_TABLE}, -1, char(2), char(3), '…', {HEADLINE_WORDS})",
+                match,
+                correlated=True,
+            ),
+            output_field=TextField(),
+        ),
+    )
+
+
+def highlight(headline):
+    return (
+        escape(headline or "")
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
@@ -0,0 +1,52 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.orgs.models import Organization
+from apps.tickets.models import Booking, TicketType
+from .models import Coupon, Event, EventCategory, EventListing
+from .services.coupons import bump_coupon_version_on_commit
+from .services.listings import queue_listing_refresh, refresh_listing_on_commit
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_listing(sender, instance, **kwargs):
+    refresh_listing_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=TicketType)
+@receiver(post_delete, sender=TicketType)
+def refresh_ticket_type_listing(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
+    refresh_listing_on_commit(instance.event_id)
+
+
+@receiver(post_save, sender=Booking)
+def refresh_booking_listing(sender, instance, created, **kwargs):
+    if created or instance.has_changed("status"):
+        queue_listing_refresh(instance.event_id)
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def refresh_category_listings(sender, instance, **kwargs):
+    refresh_listing_on_commit(
+        *EventListing.objects.filter(
+            Q(event__category=instance) | Q(category_slug=instance.slug)
+        ).values_list("event_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Organization)
+def refresh_organization_listings(sender, instance, created, **kwargs):
+    if not created:
+        refresh_listing_on_commit(
+            *instance.event_listings.values_list("event_id", flat=True)
+        )
+
+
+@receiver(post_save, sender=Coupon)
+@receiver(post_delete, sender=Coupon)
+def invalidate_coupon_cache(sender, instance, **kwargs):
+    bump_coupon_version_on_commit(instance.organization_id)
@@ -0,0 +1,33 @@
+import logging
+
+from celery import shared_task
+
+from apps.events.services.flyer_renders import mark_flyer_failed, render_flyer
+from apps.events.services.listings import (
+    refresh_event_listings,
+    refresh_queued_listing,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_event_listings_task():
+    refreshed = refresh_event_listings()
+    logger.info(f"Refreshed {refreshed} event listings")
+    return refreshed
+
+
+@shared_task
+def refresh_event_listing_task(event_id):
+    return refresh_queued_listing(event_id)
+
+
+@shared_task
+def render_flyer_task(digest, config_id, text_values):
+    try:
+        return render_flyer(digest, config_id, text_values)
+    except Exception as e:
+        logger.error(f"Failed to render flyer {digest}: {e}")
+        mark_flyer_failed(digest)
+        return False
@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.events.models import Coupon, CouponUsage
+from apps.events.services.coupons import (
+    claim_coupon,
+    generate_coupon_codes,
+    validate_coupon,
+)
+from apps.tickets.services import create_multi_ticket_booking
+
+
+@pytest.fixture
+def coupon(event, locmem_cache):
+    return Coupon.objects.create(
+        organization=event.organization,
+        event=event,
+        code="SAVE10",
+        discount_type=Coupon.DiscountType.PERCENTAGE,
+        discount_value=Decimal("10"),
+        max_uses=0,
+    )
+
+
+@pytest.mark.django_db
+class TestCouponEngine:
+    def test_validation_is_cached_until_coupon_changes(
+        self,
+        event,
+        coupon,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        validate_coupon(event.organization_id, event.id, "SAVE10")
+        with django_assert_num_queries(0):
+            definition, error = validate_coupon(
+                event.organization_id, event.id, "SAVE10"
+            )
+        assert error is None
+        assert definition.calculate_discount(Decimal("5000")) == Decimal("500")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            coupon.is_active = False
+            coupon.save(update_fields=["is_active"])
+
+        definition, error = validate_coupon(event.organization_id, event.id, "SAVE10")
+        assert definition is None and error
+
+    def test_limited_coupon_cannot_be_over_redeemed(self, event, coupon):
+        coupon.max_uses = 1
+        coupon.save()
+        definition, _ = validate_coupon(event.organization_id, event.id, "SAVE10")
+
+        assert claim_coupon(definition, event.organization_id, "a@example.com")
+        assert not claim_coupon(definition, event.organization_id, "b@example.com")
+        coupon.refresh_from_db()
+        assert coupon.use_count == 1
+
+    def test_per_email_limit_is_enforced_at_checkout(self, event, coupon, ticket_type):
+        coupon.max_uses_per_email = 1
+        coupon.save()
+
+        def checkout(email):
+            definition, _ = validate_coupon(
+                event.organization_id, event.id, "SAVE10", email
+            )
+            return create_multi_ticket_booking(
+                event=event,
+                ticket_selections={ticket_type.id: 1},
+                coupon=definition,
+                guest_email=email,
+                guest_name="Guest",
+            )
+
+        booking, error = checkout("Fan@Example.com")
+        assert error is None
+        assert booking.total_amount == Decimal("4500")
+
+        booking, error = checkout("fan@example.com")
+        assert booking is None and error
+        assert checkout("other@example.com")[1] is None
+
+        coupon.refresh_from_db()
+        assert coupon.use_count == 2
+        assert sorted(
+            CouponUsage.objects.filter(coupon=coupon).values_list("email", flat=True)
+        ) == ["fan@example.com", "other@example.com"]
+
+    def test_bulk_generation_creates_unique_codes(self, event, locmem_cache):
+        codes = generate_coupon_codes(
+            event.organization,
+            250,
+            prefix="PROMO",
+            event=event,
+            discount_value=Decimal("5"),
+        )
+
+        assert len(set(codes)) == 250
+        assert all(code.startswith("PROMO") and len(code) == 13 for code in codes)
+        assert Coupon.objects.filter(organization=event.organization).count() == 250
+        definition, error = validate_coupon(event.organization_id, event.id, codes[0])
+        assert error is None and definition.max_uses == 1
@@ -0,0 +1,89 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.tickets.models import Ticket
+from apps.tickets.services import create_multi_ticket_booking
+
+
+@pytest.fixture
+def organizer_client(locmem_cache, authenticated_client, user):
+    user.active_mode = "ORGANIZER"
+    user.save(update_fields=["active_mode"])
+    return authenticated_client
+
+
+def _book(event, ticket_type, quantity, email="fan@example.com"):
+    booking, error = create_multi_ticket_booking(
+        event=event,
+        ticket_selections={ticket_type.id: quantity},
+        guest_email=email,
+        guest_name="Guest",
+    )
+    assert error is None
+    return booking
+
+
+@pytest.mark.django_db
+class TestEventDashboardSummary:
+    def test_dashboard_reads_cached_summary(
+        self,
+        organizer_client,
+        event,
+        ticket_type,
+        django_capture_on_commit_callbacks,
+        django_assert_max_num_queries,
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            _book(event, ticket_type, 3)
+        ticket = Ticket.objects.filter(booking__event=event).first()
+        ticket.is_checked_in = True
+        ticket.checked_in_at = timezone.now()
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.save()
+
+        url = reverse("events:dashboard", args=[event.organization.slug, event.slug])
+        response = organizer_client.get(url)
+        assert response.context["stats"]["tickets_sold"] == 3
+        assert response.context["stats"]["checked_in"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _book(event, ticket_type, 10, email="other@example.com")
+        organizer_client.get(url)
+        with django_assert_max_num_queries(12) as queries:
+            response = organizer_client.get(url)
+
+        stats = response.context["stats"]
+        assert stats["tickets_sold"] == 13
+        assert stats["orders"] == 2
+        assert not any(
+            'FROM "tickets_ticket"' in query["sql"]
+            or 'FROM "analytics_' in query["sql"]
+            for query in queries.captured_queries
+        )
+
+    def test_live_endpoint_only_sends_changes(
+        self,
+        organizer_client,
+        event,
+        ticket_type,
+        django_capture_on_commit_callbacks,
+    ):
+        url = reverse(
+            "events:dashboard_live", args=[event.organization.slug, event.slug]
+        )
+        response = organizer_client.get(url)
+        version = response.context["stats"]["version"]
+        assert response.context["stats"]["tickets_sold"] == 0
+
+        assert organizer_client.get(url, {"version": version}).status_code == 204
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _book(event, ticket_type, 2)
+        response = organizer_client.get(url, {"version": version})
+        assert response.status_code == 200
+        assert response.context["stats"]["tickets_sold"] == 2
+        assert (
+            f"version={response.context['stats']['version']}"
+            in response.content.decode()
+        )
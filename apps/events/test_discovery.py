@@ -0,0 +1,126 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.events.models import Event, EventCategory
+from apps.events.services.discovery import get_discovery_page
+from apps.events.services.listings import refresh_event_listings
+from apps.tickets.models import TicketType
+
+
+@pytest.fixture
+def catalogue(organization, locmem_cache):
+    music = EventCategory.objects.create(name="Music")
+    tech = EventCategory.objects.create(name="Tech")
+    now = timezone.now()
+    events = []
+    for index in range(6):
+        event = Event.objects.create(
+            organization=organization,
+            title=f"Event {index}",
+            description="Discoverable",
+            start_at=now + timezone.timedelta(days=index + 1),
+            end_at=now + timezone.timedelta(days=index + 1, hours=2),
+            category=music if index % 2 else tech,
+            city="Douala" if index < 4 else "Yaounde",
+            is_public=True,
+            state=Event.State.PUBLISHED,
+            is_free=index == 0,
+        )
+        TicketType.objects.create(
+            event=event, name="Standard", price=1000 * index, quantity=50
+        )
+        TicketType.objects.create(
+            event=event, name="Hidden", price=1, quantity=50, is_active=False
+        )
+        events.append(event)
+    Event.objects.create(
+        organization=organization,
+        title="Draft",
+        start_at=now,
+        end_at=now,
+        is_public=True,
+    )
+    refresh_event_listings()
+    return events
+
+
+@pytest.mark.django_db
+class TestEventDiscovery:
+    def test_cursor_pages_cover_catalogue_with_min_price(self, client, catalogue):
+        url = reverse("events:discover_api")
+        seen = []
+        params = {"price": "paid"}
+        while True:
+            data = client.get(url, {**params, "per_page": 2}).json()
+            seen += data["results"]
+            if not data["next"]:
+                break
+            params["after"] = data["next"]
+
+        assert [row["title"] for row in seen] == [f"Event {i}" for i in range(5, 0, -1)]
+        assert seen[-1]["min_price"] == 1000.0
+        assert (
+            seen[0]["url"]
+            == f"/events/{catalogue[5].organization.slug}/{catalogue[5].slug}/"
+        )
+        assert data["total"] == 5
+
+    def test_filters_and_facets(self, client, catalogue):
+        data = client.get(
+            reverse("events:discover_api"),
+            {"category": "music", "city": "douala", "price_max": "2000"},
+        ).json()
+
+        assert [row["title"] for row in data["results"]] == ["Event 1"]
+        assert data["facets"]["categories"] == [
+            {"slug": "tech", "name": "Tech", "count": 2},
+            {"slug": "music", "name": "Music", "count": 1},
+        ]
+        assert data["facets"]["cities"] == [{"city": "Douala", "count": 1}]
+        assert data["facets"]["price"] == {"free": 0, "paid": 2}
+
+    def test_first_page_is_cached_and_query_count_is_flat(
+        self, client, catalogue, django_assert_num_queries
+    ):
+        with django_assert_num_queries(5):
+            first = get_discovery_page({})
+        with django_assert_num_queries(0):
+            assert get_discovery_page({}) == first
+
+        response = client.get(reverse("events:discover"))
+        assert response.status_code == 200
+        assert response.context["total"] == 6
+
+    def test_search_ranks_title_matches_and_highlights(self, client, catalogue):
+        catalogue[1].title = "Jazz Concert"
+        catalogue[1].save()
+        catalogue[2].description = (
+            "<p>An evening of <b>jazz</b> &amp; soul concerts</p>"
+        )
+        catalogue[2].venue_name = "Salle Bonanjo"
+        catalogue[2].save()
+        refresh_event_listings()
+
+        data = client.get(reverse("events:discover_api"), {"q": "concerts jazz"}).json()
+
+        assert [row["title"] for row in data["results"]] == ["Jazz Concert", "Event 2"]
+        assert "<mark>jazz</mark>" in data["results"][1]["headline"]
+        assert "&amp; soul" in data["results"][1]["headline"]
+        assert data["total"] == 2
+
+        data = client.get(reverse("events:discover_api"), {"q": "bonanjo"}).json()
+        assert [row["title"] for row in data["results"]] == ["Event 2"]
+
+        page = client.get(
+            reverse("events:discover_api"), {"q": "jazz", "per_page": 1}
+        ).json()
+        after = client.get(
+            reverse("events:discover_api"),
+            {"q": "jazz", "per_page": 1, "after": page["next"]},
+        ).json()
+        assert [row["title"] for row in page["results"] + after["results"]] == [
+            "Jazz Concert",
+            "Event 2",
+        ]
+        assert after["next"] is None
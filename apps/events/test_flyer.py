@@ -0,0 +1,161 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+from PIL import Image
+
+from apps.events.models import (
+    Event,
+    EventFlyerConfig,
+    FlyerGeneration,
+    FlyerTextField,
+)
+from apps.events import tasks
+from apps.events.services import flyer_renders, flyer_service
+from apps.events.views import actions
+from apps.tickets.models import Booking, Ticket
+
+
+def _png(size, color):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return SimpleUploadedFile("template.png", buffer.getvalue(), "image/png")
+
+
+@pytest.fixture
+def flyer_config(event, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    flyer_service.clear_flyer_caches()
+    config = EventFlyerConfig.objects.create(
+        event=event,
+        is_enabled=True,
+        template_image=_png((400, 400), "navy"),
+        output_width=200,
+        output_height=200,
+    )
+    FlyerTextField.objects.create(flyer_config=config, label="Name", x=100, y=150)
+    yield config
+    flyer_service.clear_flyer_caches()
+
+
+@pytest.mark.django_db
+class TestFlyerService:
+    def test_repeat_generations_reuse_template_and_fields(
+        self, flyer_config, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            first = flyer_service.generate_flyer(flyer_config, None, {"Name": "Ada"})
+        with django_assert_num_queries(0):
+            second = flyer_service.generate_flyer(
+                flyer_config, _png((50, 50), "red"), {"Name": "Grace"}
+            )
+
+        assert Image.open(first).size == Image.open(second).size == (200, 200)
+        assert flyer_service._template_bitmap.cache_info().hits == 1
+
+        flyer_config.output_width = 300
+        flyer_config.save()
+        with django_assert_num_queries(1):
+            third = flyer_service.generate_flyer(flyer_config, None, {"Name": "Ada"})
+        assert Image.open(third).size == (300, 200)
+
+
+@pytest.fixture
+def flyer_request(flyer_config, ticket_type, locmem_cache, monkeypatch):
+    monkeypatch.setattr(flyer_renders, "_flyer_cache", locmem_cache["reports"])
+    event = flyer_config.event
+    event.state = Event.State.PUBLISHED
+    event.save()
+    booking = Booking.objects.create(
+        event=event,
+        guest_email="fan@example.com",
+        status=Booking.Status.CONFIRMED,
+    )
+    Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+
+    queued = []
+    monkeypatch.setattr(
+        actions.render_flyer_task, "delay", lambda *args: queued.append(args)
+    )
+    field = flyer_config.text_fields.get()
+    url = reverse(
+        "events:flyer_generator",
+        kwargs={"org_slug": event.organization.slug, "event_slug": event.slug},
+    )
+
+    client = Client()
+
+    def post(email="fan@example.com"):
+        return client.post(
+            url,
+            {
+                "ticket_verification": email,
+                f"field_{field.id}": "Ada",
+                "photo": _png((50, 50), "red"),
+            },
+        )
+
+    post.client = client
+    return post, queued, ticket_type
+
+
+@pytest.mark.django_db
+class TestFlyerRenderQueue:
+    def test_renders_once_and_serves_stored_flyer(self, flyer_request):
+        post, queued, ticket_type = flyer_request
+
+        first, second = post(), post()
+        assert first.status_code == second.status_code == 202
+        assert len(queued) == 1
+        assert 'hx-trigger="every 2s"' in first.content.decode()
+        assert not FlyerGeneration.objects.exists()
+
+        digest, config_id, text_values = queued[0]
+        assert flyer_renders.render_flyer(digest, config_id, text_values)
+        assert FlyerGeneration.objects.filter(email="fan@example.com").count() == 1
+
+        again = post()
+        assert again.status_code == 200
+        assert len(queued) == 1
+        assert 'id="flyer-result"' in again.content.decode()
+        assert FlyerGeneration.objects.count() == 1
+
+        other = Booking.objects.create(
+            event=ticket_type.event,
+            guest_email="friend@example.com",
+            status=Booking.Status.CONFIRMED,
+        )
+        Ticket.objects.create(booking=other, ticket_type=ticket_type)
+        shared = post("friend@example.com")
+        assert shared.status_code == 200
+        assert len(queued) == 1
+        assert FlyerGeneration.objects.filter(email="friend@example.com").count() == 1
+
+        event = again.context["event"]
+        image_url = reverse(
+            "events:flyer_image",
+            kwargs={
+                "org_slug": event.organization.slug,
+                "event_slug": event.slug,
+                "digest": digest,
+            },
+        )
+        assert Client().get(image_url).status_code == 404
+        image = post.client.get(image_url, {"download": 1})
+        assert image["Content-Type"] == "image/jpeg"
+        assert "attachment" in image["Content-Disposition"]
+        assert Image.open(BytesIO(image.content)).size == (200, 200)
+
+    def test_failed_render_is_not_billed(self, flyer_request, monkeypatch):
+        post, queued, _ticket_type = flyer_request
+        post()
+
+        def broken_render(*args):
+            raise OSError("broken template")
+
+        monkeypatch.setattr(flyer_renders, "generate_flyer", broken_render)
+
+        assert not tasks.render_flyer_task(*queued[0])
+        assert not FlyerGeneration.objects.exists()
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.events import tasks
+from apps.events.models import Event, EventCategory, EventListing
+from apps.tickets.models import Booking, Ticket, TicketType
+
+
+@pytest.fixture
+def public_event(event, ticket_type, locmem_cache, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        event.is_public = True
+        event.state = Event.State.PUBLISHED
+        event.save()
+    return event
+
+
+@pytest.mark.django_db
+class TestEventListing:
+    def test_signals_keep_listing_in_sync(
+        self,
+        public_event,
+        ticket_type,
+        user,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        queued = []
+        monkeypatch.setattr(
+            tasks.refresh_event_listing_task,
+            "apply_async",
+            lambda args, **kwargs: queued.append(args),
+        )
+        listing = EventListing.objects.get(event=public_event)
+        assert listing.organization_slug == public_event.organization.slug
+        assert listing.min_price == listing.max_price == 5000
+        assert listing.tickets_available == 100
+        assert listing.availability == EventListing.Availability.ON_SALE
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category = EventCategory.objects.create(name="Music")
+            public_event.category = category
+            public_event.save()
+            TicketType.objects.create(
+                event=public_event, name="VIP", price=20000, quantity=5
+            )
+
+        listing.refresh_from_db()
+        assert listing.category_slug == "music"
+        assert listing.max_price == 20000
+        assert listing.tickets_available == 105
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking = Booking.objects.create(user=user, event=public_event)
+            Ticket.objects.bulk_create(
+                Ticket(booking=booking, ticket_type=ticket_type, code=f"LST{i:05d}")
+                for i in range(95)
+            )
+            booking.save()
+            booking.status = Booking.Status.CONFIRMED
+            booking.save()
+
+        assert queued == [(public_event.id,)]
+        listing.refresh_from_db()
+        assert listing.tickets_available == 105
+
+        tasks.refresh_event_listing_task(*queued[0])
+        listing.refresh_from_db()
+        assert listing.tickets_available == 10
+        assert listing.availability == EventListing.Availability.LIMITED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category.name = "Live Music"
+            category.save()
+        listing.refresh_from_db()
+        assert listing.category_name == "Live Music"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            public_event.is_public = False
+            public_event.save()
+        assert not EventListing.objects.filter(event=public_event).exists()
+
+    def test_organizer_page_reads_listings(self, client, public_event):
+        EventListing.objects.filter(event=public_event).update(
+            start_at=timezone.now() + timezone.timedelta(days=1)
+        )
+        url = reverse("events:public_organizer", args=[public_event.organization.slug])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        listing_queries = [q["sql"] for q in queries if "eventlisting" in q["sql"]]
+        assert len(listing_queries) == 2
+        assert not any("JOIN" in sql for sql in listing_queries)
+
+        assert response.status_code == 200
+        assert [
+            listing.event_id for listing in response.context["upcoming_events"]
+        ] == [public_event.id]
+        assert b"From 5,000 XAF" in response.content
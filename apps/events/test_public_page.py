@@ -0,0 +1,136 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.events.models import Event
+from apps.events.views import actions
+from apps.tickets.models import Booking, Ticket, TicketType
+
+
+@pytest.fixture
+def published_event(event, locmem_cache):
+    event.state = Event.State.PUBLISHED
+    event.is_public = True
+    event.save()
+    return event
+
+
+def detail_url(event):
+    return reverse(
+        "events:public_detail",
+        kwargs={"org_slug": event.organization.slug, "event_slug": event.slug},
+    )
+
+
+@pytest.mark.django_db
+class TestPublicEventPage:
+    def test_conditional_get_revalidates_until_event_changes(
+        self, client, published_event
+    ):
+        response = client.get(detail_url(published_event))
+        assert response.status_code == 200
+        assert "no-cache" in response["Cache-Control"]
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        response = client.get(detail_url(published_event), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        published_event.title = "Renamed"
+        published_event.save()
+        response = client.get(detail_url(published_event), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert "Renamed" in response.content.decode()
+
+    def test_ticket_edit_invalidates_page(self, client, published_event, ticket_type):
+        etag = client.get(detail_url(published_event))["ETag"]
+        ticket_type.price = 7500
+        ticket_type.save()
+
+        response = client.get(detail_url(published_event), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_selling_out_invalidates_structured_data(self, client, published_event):
+        vip = TicketType.objects.create(
+            event=published_event, name="VIP", price=10000, quantity=1
+        )
+        response = client.get(detail_url(published_event))
+        etag = response["ETag"]
+        assert "schema.org/InStock" in response.content.decode()
+
+        booking = Booking.objects.create(
+            event=published_event, guest_email="guest@example.com"
+        )
+        Ticket.objects.create(booking=booking, ticket_type=vip)
+
+        response = client.get(detail_url(published_event), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert "schema.org/SoldOut" in response.content.decode()
+
+    def test_selling_out_moves_last_modified(self, client, published_event):
+        vip = TicketType.objects.create(
+            event=published_event, name="VIP", price=10000, quantity=1
+        )
+        last_modified = client.get(detail_url(published_event))["Last-Modified"]
+        response = client.get(
+            detail_url(published_event), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304
+
+        booking = Booking.objects.create(
+            event=published_event, guest_email="guest@example.com"
+        )
+        Booking.objects.filter(pk=booking.pk).update(
+            created_at=timezone.now() + timezone.timedelta(minutes=1)
+        )
+        Ticket.objects.create(booking=booking, ticket_type=vip)
+
+        response = client.get(
+            detail_url(published_event), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 200
+        assert response["Last-Modified"] != last_modified
+
+    def test_ticket_panel_counts_sold_in_one_query(
+        self, client, published_event, ticket_type, monkeypatch
+    ):
+        visits = []
+        monkeypatch.setattr(
+            actions,
+            "track_event_visit",
+            lambda request, event_id: visits.append(event_id),
+        )
+        extra = TicketType.objects.create(
+            event=published_event, name="VIP", price=10000, quantity=3
+        )
+        booking = Booking.objects.create(
+            event=published_event, guest_email="guest@example.com"
+        )
+        for _ in range(3):
+            Ticket.objects.create(booking=booking, ticket_type=extra)
+        Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+
+        url = reverse(
+            "events:public_tickets",
+            kwargs={
+                "org_slug": published_event.organization.slug,
+                "event_slug": published_event.slug,
+            },
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert "no-cache" in response["Cache-Control"]
+        remaining = {tt.name: tt.remaining for tt in response.context["ticket_types"]}
+        assert remaining == {"General Admission": 99, "VIP": 0}
+        ticket_queries = [
+            query
+            for query in queries.captured_queries
+            if '"tickets_ticket"' in query["sql"]
+        ]
+        assert len(ticket_queries) == 1
+        assert visits == [published_event.id]
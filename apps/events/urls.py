@@ -6,6 +6,9 @@ app_name = "events"
 urlpatterns = [
     path("", actions.EventListView.as_view(), name="list"),
     path("discover/", actions.PublicEventListView.as_view(), name="discover"),
+    path(
+        "discover/api/", actions.DiscoverEventsAPIView.as_view(), name="discover_api"
+    ),
     path(
         "organizer/<slug:org_slug>/",
         actions.PublicOrganizerView.as_view(),
@@ -39,11 +42,21 @@ urlpatterns = [
         actions.PublicEventDetailView.as_view(),
         name="public_detail",
     ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/ticket-panel/",
+        actions.PublicEventTicketsView.as_view(),
+        name="public_tickets",
+    ),
     path(
         "<slug:org_slug>/<slug:event_slug>/dashboard/",
         actions.EventDashboardView.as_view(),
         name="dashboard",
     ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/dashboard/live/",
+        actions.EventDashboardLiveView.as_view(),
+        name="dashboard_live",
+    ),
     path(
         "<slug:org_slug>/<slug:event_slug>/edit/",
         actions.EventEditView.as_view(),
@@ -99,6 +112,16 @@ urlpatterns = [
         actions.FlyerGeneratorView.as_view(),
         name="flyer_generator",
     ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/flyer/render/<slug:digest>/",
+        actions.FlyerStatusView.as_view(),
+        name="flyer_status",
+    ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/flyer/render/<slug:digest>/image/",
+        actions.FlyerImageView.as_view(),
+        name="flyer_image",
+    ),
     path(
         "<slug:org_slug>/<slug:event_slug>/flyer/config/",
         actions.FlyerConfigView.as_view(),
@@ -5,21 +5,37 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db import models
-from django.db.models import Q, Count, Sum
-from django.http import JsonResponse, HttpResponse, FileResponse
+from django.db import transaction
+from django.db.models import Q, Count
+from django.http import JsonResponse, HttpResponse
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import condition
 
+from apps.analytics.tracking import track_event_visit
 from apps.cfp.models import CallForProposals
 from apps.cfp.services.cfp_service import get_cfp_stats
 from apps.events.forms import EventForm, TicketTypeForm
+from apps.events.services.discovery import (
+    get_discovery_page,
+    parse_filters,
+    parse_page_size,
+)
 from apps.events.services.event_service import create_event
+from apps.events.services.public_page import (
+    PUBLIC_PAGE_CACHE_TIMEOUT,
+    public_page_etag,
+    public_page_fragment_version,
+    public_page_last_modified,
+)
 from apps.events.services.queries import get_user_events
 from apps.events.models import (
     Event,
     EventCategory,
+    EventListing,
     Coupon,
     EventFlyerConfig,
     FlyerTextField,
@@ -28,111 +44,126 @@ from apps.events.models import (
     FlyerGeneration,
     FlyerBilling,
 )
-from apps.events.services.flyer_service import generate_flyer
+from apps.events.services.coupons import generate_coupon_codes, validate_coupon
+from apps.events.services.dashboard import event_dashboard_summary
+from apps.events.services.flyer_renders import (
+    PENDING,
+    READY,
+    flyer_digest,
+    flyer_event_id,
+    flyer_generation_recorded,
+    flyer_render_state,
+    get_rendered_flyer,
+    queue_flyer_generation,
+    queue_flyer_render,
+    record_flyer_generations,
+)
+from apps.events.tasks import render_flyer_task
 from apps.orgs.models import Organization, Membership, MemberRole
 from apps.tickets.utils.forms import BookingForm
 from apps.tickets.services import create_booking
 from apps.tickets.models import Ticket, TicketType, Booking
-from apps.payments.models import Payment
 from apps.payments.services.payment_service import calculate_organization_balance
 from decimal import Decimal
 
 
 class PublicEventListView(View):
     def get(self, request):
-        events = (
-            Event.objects.filter(is_public=True, state=Event.State.PUBLISHED)
-            .select_related("organization", "category")
-            .prefetch_related("ticket_types")
-            .order_by("-start_at")
-        )
-
-        events_data = []
-        for event in events:
-            ticket_types = event.ticket_types.filter(is_active=True)
-            min_price = (
-                ticket_types.aggregate(min_price=models.Min("price"))["min_price"] or 0
-            )
-
-            events_data.append(
-                {
-                    "id": event.id,
-                    "title": event.title,
-                    "description": event.description or "",
-                    "short_description": event.short_description
-                    or event.description[:150]
-                    if event.description
-                    else "",
-                    "location": event.location or "",
-                    "city": event.city or "",
-                    "location_short": (event.location or event.city or "Online")[:20],
-                    "start_at": event.start_at.isoformat(),
-                    "end_at": event.end_at.isoformat()
-                    if event.end_at
-                    else event.start_at.isoformat(),
-                    "date_formatted": event.start_at.strftime("%b %d, %Y"),
-                    "category_name": event.category.name if event.category else "",
-                    "category_slug": event.category.slug if event.category else "",
-                    "cover_image": event.cover_image.url if event.cover_image else "",
-                    "is_free": event.is_free,
-                    "min_price": float(min_price),
-                    "url": reverse(
-                        "events:public_detail",
-                        kwargs={
-                            "org_slug": event.organization.slug,
-                            "event_slug": event.slug,
-                        },
-                    ),
-                }
-            )
-
+        page = get_discovery_page({})
         categories = EventCategory.objects.filter(is_active=True).order_by(
             "display_order", "name"
         )
-        categories_data = [
-            {
-                "id": cat.id,
-                "name": cat.name,
-                "slug": cat.slug,
-                "icon": cat.icon or "tag",
-                "color": cat.color,
-            }
-            for cat in categories
-        ]
 
         return render(
             request,
             "events/discover.html",
             {
-                "events": events_data,
-                "events_json": json.dumps(events_data),
+                "events": page["results"],
+                "next_cursor": page["next"],
+                "total": page["total"],
                 "categories": categories,
-                "categories_json": json.dumps(categories_data),
             },
         )
 
 
+class DiscoverEventsAPIView(View):
+    def get(self, request):
+        return JsonResponse(
+            get_discovery_page(
+                parse_filters(request.GET),
+                after=request.GET.get("after"),
+                per_page=parse_page_size(request.GET.get("per_page")),
+            )
+        )
+
+
+def get_public_event(request, org_slug, event_slug, *related):
+    events = Event.objects.select_related("organization", *related)
+    preview_token = request.GET.get("preview")
+    if preview_token:
+        return get_object_or_404(
+            events,
+            organization__slug=org_slug,
+            slug=event_slug,
+            preview_token=preview_token,
+        )
+    return get_object_or_404(
+        events,
+        organization__slug=org_slug,
+        slug=event_slug,
+        state=Event.State.PUBLISHED,
+    )
+
+
+@method_decorator(cache_control(no_cache=True), name="get")
+@method_decorator(
+    condition(
+        etag_func=public_page_etag, last_modified_func=public_page_last_modified
+    ),
+    name="get",
+)
 class PublicEventDetailView(View):
     def get(self, request, org_slug, event_slug):
-        preview_token = request.GET.get("preview")
-
-        if preview_token:
-            event = get_object_or_404(
-                Event.objects.select_related("organization"),
-                organization__slug=org_slug,
-                slug=event_slug,
-                preview_token=preview_token,
-            )
-        else:
-            event = get_object_or_404(
-                Event.objects.select_related("organization"),
-                organization__slug=org_slug,
-                slug=event_slug,
-                state=Event.State.PUBLISHED,
-            )
+        event = get_public_event(request, org_slug, event_slug, "flyer_config")
+
+        flyer_enabled = False
+        try:
+            flyer_config = event.flyer_config
+            flyer_enabled = flyer_config.is_enabled and flyer_config.template_image
+        except Exception:
+            pass
+
+        page_version = public_page_fragment_version(request, org_slug, event_slug)
+
+        return render(
+            request,
+            "events/public_detail.html",
+            {
+                "event": event,
+                "ticket_types": event.ticket_types.filter(is_active=True).annotate(
+                    sold=Count("tickets")
+                ),
+                "flyer_enabled": flyer_enabled,
+                "now": timezone.localtime(timezone.now()),
+                "share_url": request.build_absolute_uri(request.path),
+                "preview_token": request.GET.get("preview", ""),
+                "page_version": page_version,
+                "page_cache_timeout": PUBLIC_PAGE_CACHE_TIMEOUT if page_version else 0,
+            },
+        )
+
+
+@method_decorator(never_cache, name="get")
+class PublicEventTicketsView(View):
+    def get(self, request, org_slug, event_slug):
+        event = get_public_event(request, org_slug, event_slug)
+        if not request.GET.get("preview"):
+            track_event_visit(request, event.id)
 
         now = timezone.localtime(timezone.now())
-        all_ticket_types = event.ticket_types.filter(is_active=True)
+        all_ticket_types = event.ticket_types.filter(is_active=True).annotate(
+            sold=Count("tickets")
+        )
 
         event_blocked = False
         event_block_reason = None
@@ -149,6 +180,7 @@ class PublicEventDetailView(View):
             is_available = True
             status_message = None
             sales_started = False
+            tt.remaining = max(0, tt.quantity - tt.sold)
 
             if event_blocked:
                 is_available = False
@@ -171,7 +203,7 @@ class PublicEventDetailView(View):
                 elif sales_end and now_naive > sales_end:
                     is_available = False
                     status_message = _("Sales ended")
-                elif tt.available_quantity <= 0:
+                elif tt.remaining <= 0:
                     is_available = False
                     status_message = _("Sold out")
                 else:
@@ -186,24 +218,16 @@ class PublicEventDetailView(View):
         checkout_questions = event.checkout_questions.all()
         affiliate_code = request.session.get("affiliate_code")
 
-        flyer_enabled = False
-        try:
-            flyer_config = event.flyer_config
-            flyer_enabled = flyer_config.is_enabled and flyer_config.template_image
-        except Exception:
-            pass
-
         has_available_tickets = any(tt.is_available for tt in available_tickets)
 
         return render(
             request,
-            "events/public_detail.html",
+            "events/_ticket_panel.html",
             {
                 "event": event,
                 "ticket_types": available_tickets,
                 "checkout_questions": checkout_questions,
                 "affiliate_code": affiliate_code,
-                "flyer_enabled": flyer_enabled,
                 "has_available_tickets": has_available_tickets,
                 "now": now,
                 "currency": event.organization.currency,
@@ -215,19 +239,10 @@ class PublicOrganizerView(View):
     def get(self, request, org_slug):
         organization = get_object_or_404(Organization, slug=org_slug)
 
-        upcoming_events = Event.objects.filter(
-            organization=organization,
-            state=Event.State.PUBLISHED,
-            is_public=True,
-            start_at__gte=timezone.now(),
-        ).order_by("start_at")
-
-        past_events = Event.objects.filter(
-            organization=organization,
-            state=Event.State.PUBLISHED,
-            is_public=True,
-            start_at__lt=timezone.now(),
-        ).order_by("-start_at")[:12]
+        listings = EventListing.objects.filter(organization=organization)
+        now = timezone.now()
+        upcoming_events = listings.filter(start_at__gte=now).order_by("start_at")
+        past_events = listings.filter(start_at__lt=now).order_by("-start_at")[:12]
 
         return render(
             request,
@@ -479,25 +494,7 @@ class EventDashboardView(LoginRequiredMixin, View):
             organization__members=request.user,
         )
 
-        tickets = Ticket.objects.filter(booking__event=event).select_related("ticket_type", "booking")
-
-        tickets_sold = tickets.count()
-        checked_in = tickets.filter(is_checked_in=True).count()
-        checkin_rate = (checked_in / tickets_sold * 100) if tickets_sold > 0 else 0
-
-        revenue = (
-            Payment.objects.filter(
-                booking__event=event, status=Payment.Status.CONFIRMED
-            ).aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
-
-        stats = {
-            "tickets_sold": tickets_sold,
-            "checked_in": checked_in,
-            "checkin_rate": checkin_rate,
-            "revenue": revenue,
-        }
+        stats = event_dashboard_summary(event)
 
         cfp_stats = None
         has_cfp = hasattr(event, "cfp")
@@ -562,6 +559,25 @@ class EventDashboardView(LoginRequiredMixin, View):
         )
 
 
+@method_decorator(never_cache, name="get")
+class EventDashboardLiveView(LoginRequiredMixin, View):
+    def get(self, request, org_slug, event_slug):
+        event = get_object_or_404(
+            Event.objects.select_related("organization"),
+            organization__slug=org_slug,
+            slug=event_slug,
+            organization__members=request.user,
+        )
+        stats = event_dashboard_summary(event)
+        if str(stats["version"]) == request.GET.get("version"):
+            return HttpResponse(status=204)
+        return render(
+            request,
+            "events/_dashboard_stats.html",
+            {"event": event, "stats": stats},
+        )
+
+
 class ApplyFeatureView(LoginRequiredMixin, View):
     def post(self, request, org_slug, event_slug):
         event = get_object_or_404(
@@ -679,10 +695,17 @@ class CouponCreateView(LoginRequiredMixin, View):
             event = get_object_or_404(Event, id=event_id, organization=organization)
 
         code = request.POST.get("code", "").strip().upper()
-        if not code:
+        try:
+            quantity = max(1, int(request.POST.get("quantity") or 1))
+        except ValueError:
+            quantity = 1
+        if not code and quantity == 1:
             code = uuid.uuid4().hex[:8].upper()
 
-        existing = Coupon.objects.filter(organization=organization, code=code).exists()
+        existing = (
+            quantity == 1
+            and Coupon.objects.filter(organization=organization, code=code).exists()
+        )
         if existing:
             organizations = Organization.objects.filter(members=request.user)
             events = Event.objects.filter(organization__members=request.user)
@@ -709,26 +732,38 @@ class CouponCreateView(LoginRequiredMixin, View):
             else []
         )
         max_uses = request.POST.get("max_uses", 1)
+        max_uses_per_email = request.POST.get("max_uses_per_email", 0)
         description = request.POST.get("description", "").strip()
         valid_from = request.POST.get("valid_from") or None
         valid_until = request.POST.get("valid_until") or None
 
-        Coupon.objects.create(
-            organization=organization,
-            event=event,
-            code=code,
-            description=description,
-            discount_type=discount_type,
-            discount_value=discount_value,
-            assignment_type=assignment_type,
-            assigned_email=assigned_email,
-            assigned_emails=assigned_emails,
-            max_uses=int(max_uses) if max_uses else 1,
-            valid_from=valid_from,
-            valid_until=valid_until,
-            is_active=True,
-            created_by=request.user,
-        )
+        fields = {
+            "event": event,
+            "description": description,
+            "discount_type": discount_type,
+            "discount_value": discount_value,
+            "assignment_type": assignment_type,
+            "assigned_email": assigned_email,
+            "assigned_emails": assigned_emails,
+            "max_uses": int(max_uses) if max_uses else 1,
+            "max_uses_per_email": int(max_uses_per_email or 0),
+            "valid_from": valid_from,
+            "valid_until": valid_until,
+            "is_active": True,
+            "created_by": request.user,
+        }
+
+        if quantity > 1:
+            codes = generate_coupon_codes(organization, quantity, prefix=code, **fields)
+            response = HttpResponse(
+                "\n".join(["code", *codes]) + "\n", content_type="text/csv"
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{organization.slug}-coupons.csv"'
+            )
+            return response
+
+        Coupon.objects.create(organization=organization, code=code, **fields)
 
         return redirect("events:coupons")
 
@@ -781,25 +816,19 @@ class ValidateCouponView(View):
                 {"valid": False, "error": _("Please enter a coupon code")}
             )
 
-        coupon = Coupon.objects.filter(
-            Q(code=code), Q(event_id=event_id) | Q(event__isnull=True)
-        ).first()
-
-        if not coupon:
+        organization_id = (
+            Event.objects.filter(pk=event_id)
+            .values_list("organization_id", flat=True)
+            .first()
+            if str(event_id).isdigit()
+            else None
+        )
+        if not organization_id:
             return JsonResponse({"valid": False, "error": _("Invalid coupon code")})
 
-        if not coupon.is_valid:
-            return JsonResponse(
-                {"valid": False, "error": _("This coupon is no longer valid")}
-            )
-
-        if email and not coupon.can_be_used_by(email):
-            return JsonResponse(
-                {
-                    "valid": False,
-                    "error": _("This coupon cannot be used with your email"),
-                }
-            )
+        coupon, error = validate_coupon(organization_id, event_id, code, email)
+        if error:
+            return JsonResponse({"valid": False, "error": error})
 
         return JsonResponse(
             {
@@ -1013,6 +1042,16 @@ class FlyerGeneratorView(View):
         except EventFlyerConfig.DoesNotExist:
             return HttpResponse(_("Flyer not configured"), status=404)
 
+        user_photo = request.FILES.get("photo")
+        photo_bytes = user_photo.read() if user_photo else b""
+        text_values = {}
+        for key, value in request.POST.items():
+            if key.startswith("field_"):
+                field_id = key.replace("field_", "")
+                text_values[field_id] = value
+
+        digest = flyer_digest(config, photo_bytes, text_values)
+
         ticket_verification = request.POST.get("ticket_verification", "").strip()
 
         if not ticket_verification:
@@ -1086,8 +1125,10 @@ class FlyerGeneratorView(View):
                     else verified_ticket.booking.guest_phone
                 )
 
+                repeat_request = flyer_generation_recorded(digest, verified_ticket.id)
                 if (
-                    ticket_email
+                    not repeat_request
+                    and ticket_email
                     and FlyerGeneration.objects.filter(
                         event=event, email__iexact=ticket_email
                     ).exists()
@@ -1100,7 +1141,8 @@ class FlyerGeneratorView(View):
                         status=403,
                     )
                 if (
-                    ticket_phone
+                    not repeat_request
+                    and ticket_phone
                     and FlyerGeneration.objects.filter(
                         event=event, phone=ticket_phone
                     ).exists()
@@ -1138,46 +1180,77 @@ class FlyerGeneratorView(View):
                     status=403,
                 )
 
-        user_photo = request.FILES.get("photo")
-        text_values = {}
-        for key, value in request.POST.items():
-            if key.startswith("field_"):
-                field_id = key.replace("field_", "")
-                text_values[field_id] = value
-
-        try:
-            flyer_image = generate_flyer(config, user_photo, text_values)
+        queue_flyer_generation(
+            digest,
+            verified_ticket.id,
+            email=attendee_email,
+            phone=attendee_phone,
+            ip_address=request.META.get("REMOTE_ADDR"),
+            user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
+            rate_per_flyer=(
+                FLYER_PAY_PER_USE_PRICE
+                if not flyer_free and config.pay_per_use_accepted
+                else None
+            ),
+        )
+        if flyer_render_state(digest) == READY:
+            record_flyer_generations(digest, event)
+        elif queue_flyer_render(digest, photo_bytes):
+            render_flyer_task.delay(digest, config.pk, text_values)
+
+        digests = request.session.get("flyer_digests", [])
+        if digest not in digests:
+            request.session["flyer_digests"] = [*digests, digest]
+
+        return render_flyer_status(request, event, digest)
+
+
+def render_flyer_status(request, event, digest):
+    state = flyer_render_state(digest)
+    return render(
+        request,
+        "events/_flyer_status.html",
+        {
+            "event": event,
+            "digest": digest,
+            "state": state,
+            "is_ready": state == READY,
+            "is_pending": state == PENDING,
+        },
+        status=202 if state == PENDING else 200,
+    )
+
+
+@method_decorator(never_cache, name="get")
+class FlyerStatusView(View):
+    def get(self, request, org_slug, event_slug, digest):
+        event = get_object_or_404(
+            Event.objects.select_related("organization"),
+            organization__slug=org_slug,
+            slug=event_slug,
+        )
+        return render_flyer_status(request, event, digest)
 
-            if not flyer_free and config.pay_per_use_accepted:
-                FlyerGeneration.objects.create(
-                    event=event,
-                    ticket=verified_ticket,
-                    email=attendee_email,
-                    phone=attendee_phone,
-                    ip_address=request.META.get("REMOTE_ADDR"),
-                    user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-                )
-                billing, _created = FlyerBilling.objects.get_or_create(
-                    event=event, defaults={"rate_per_flyer": FLYER_PAY_PER_USE_PRICE}
-                )
-                billing.update_totals()
-            else:
-                FlyerGeneration.objects.create(
-                    event=event,
-                    ticket=verified_ticket,
-                    email=attendee_email,
-                    phone=attendee_phone,
-                    ip_address=request.META.get("REMOTE_ADDR"),
-                    user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-                )
 
-            response = FileResponse(flyer_image, content_type="image/jpeg")
+class FlyerImageView(View):
+    def get(self, request, org_slug, event_slug, digest):
+        event = get_object_or_404(Event, organization__slug=org_slug, slug=event_slug)
+        is_holder = digest in request.session.get("flyer_digests", [])
+        is_member = (
+            request.user.is_authenticated
+            and flyer_event_id(digest) == event.pk
+            and event.organization.members.filter(pk=request.user.pk).exists()
+        )
+        flyer = get_rendered_flyer(digest) if is_holder or is_member else None
+        if flyer is None:
+            return HttpResponse(_("Flyer not found"), status=404)
+        response = HttpResponse(flyer, content_type="image/jpeg")
+        response["Cache-Control"] = "private, max-age=3600"
+        if request.GET.get("download"):
             response["Content-Disposition"] = (
-                f'attachment; filename="{event.slug}-flyer.jpg"'
+                f'attachment; filename="{event_slug}-flyer.jpg"'
             )
-            return response
-        except Exception as e:
-            return HttpResponse(f"Error generating flyer: {str(e)}", status=500)
+        return response
 
 
 class FlyerConfigView(LoginRequiredMixin, View):
@@ -1284,41 +1357,42 @@ class FlyerConfigView(LoginRequiredMixin, View):
                 billing.save(update_fields=["total_amount", "updated_at"])
             config.template_change_count += 1
 
-        try:
-            config.save()
-        except Exception as e:
-            messages.error(request, f"Failed to save configuration: {str(e)}")
-            return redirect(
-                "events:flyer_config", org_slug=org_slug, event_slug=event_slug
-            )
-
-        config.text_fields.all().delete()
-
         fields_json = request.POST.get("fields_json", "[]")
         try:
             fields = json.loads(fields_json)
         except json.JSONDecodeError:
             fields = []
 
-        for i, field in enumerate(fields):
-            if not field.get("label", "").strip():
-                continue
-            field_bg = field.get("bg_color", "rgba(0,0,0,0.3)")
-            if field_bg == "transparent":
-                field_bg = "rgba(0,0,0,0)"
-            FlyerTextField.objects.create(
-                flyer_config=config,
-                label=field.get("label", ""),
-                placeholder=field.get("placeholder", ""),
-                is_required=field.get("required", True),
-                order=i,
-                x=int(field.get("x", 0)),
-                y=int(field.get("y", 0)),
-                max_width=int(field.get("max_width", 400)),
-                font_size=int(field.get("font_size", 32)),
-                font_color=field.get("font_color", "#ffffff"),
-                text_align=field.get("text_align", "CENTER"),
-                bg_color=field_bg,
+        try:
+            with transaction.atomic():
+                if config.pk is None:
+                    config.save()
+                config.text_fields.all().delete()
+                for i, field in enumerate(fields):
+                    if not field.get("label", "").strip():
+                        continue
+                    field_bg = field.get("bg_color", "rgba(0,0,0,0.3)")
+                    if field_bg == "transparent":
+                        field_bg = "rgba(0,0,0,0)"
+                    FlyerTextField.objects.create(
+                        flyer_config=config,
+                        label=field.get("label", ""),
+                        placeholder=field.get("placeholder", ""),
+                        is_required=field.get("required", True),
+                        order=i,
+                        x=int(field.get("x", 0)),
+                        y=int(field.get("y", 0)),
+                        max_width=int(field.get("max_width", 400)),
+                        font_size=int(field.get("font_size", 32)),
+                        font_color=field.get("font_color", "#ffffff"),
+                        text_align=field.get("text_align", "CENTER"),
+                        bg_color=field_bg,
+                    )
+                config.save()
+        except Exception as e:
+            messages.error(request, f"Failed to save configuration: {str(e)}")
+            return redirect(
+                "events:flyer_config", org_slug=org_slug, event_slug=event_slug
             )
 
         messages.success(request, _("Flyer configuration saved successfully"))
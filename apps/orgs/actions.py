@@ -5,12 +5,12 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db.models import Count, Sum
+from django.db.models import Count
 from django.http import HttpResponse
 from django.utils.translation import gettext_lazy as _
+from apps.analytics.services import get_organization_revenue
 from apps.core.tasks import send_email_task
 from apps.orgs.models import Organization, Membership, Invitation, MemberRole
-from apps.payments.models import Payment
 from apps.core.models import User
 
 logger = logging.getLogger(__name__)
@@ -127,13 +127,7 @@ class OrganizationDetailView(LoginRequiredMixin, OrgPermissionMixin, View):
             .order_by("role", "created_at")
         )
 
-        total_revenue = (
-            Payment.objects.filter(
-                booking__event__organization=organization,
-                status=Payment.Status.CONFIRMED,
-            ).aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
+        total_revenue = get_organization_revenue([organization.id])["gross"]
 
         user_membership = Membership.objects.filter(
             organization=organization, user=request.user
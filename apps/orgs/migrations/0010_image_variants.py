@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orgs', '0009_alter_invitation_email_alter_organization_logo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -8,9 +8,10 @@ from datetime import timedelta
 from django.utils import timezone
 
 from apps.core.validators import ALLOWED_IMAGE_EXTENSIONS, validate_image_file_size
+from apps.core.models import FieldTrackingMixin
 
 
-class Organization(models.Model):
+class Organization(FieldTrackingMixin, models.Model):
     class Currency(models.TextChoices):
         XAF = "XAF", _("Central African CFA Franc (XAF)")
         XOF = "XOF", _("West African CFA Franc (XOF)")
@@ -29,6 +30,7 @@ class Organization(models.Model):
         blank=True,
         validators=[FileExtensionValidator(ALLOWED_IMAGE_EXTENSIONS), validate_image_file_size],
     )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     website = models.URLField(blank=True)
     currency = models.CharField(
         max_length=3,
@@ -50,6 +52,8 @@ class Organization(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tracked_fields = ("name", "logo")
+
     class Meta:
         indexes = [
             models.Index(fields=["slug"]),
@@ -59,14 +63,9 @@ class Organization(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        if self.pk:
-            try:
-                old = Organization.objects.get(pk=self.pk)
-                if old.name != self.name:
-                    base_slug = slugify(self.name)
-                    self.slug = f"{base_slug}-{uuid.uuid4().hex[:6]}"
-            except Organization.DoesNotExist:
-                pass
+        if self.pk and self.has_changed("name"):
+            base_slug = slugify(self.name)
+            self.slug = f"{base_slug}-{uuid.uuid4().hex[:6]}"
         if not self.slug:
             base_slug = slugify(self.name)
             self.slug = f"{base_slug}-{uuid.uuid4().hex[:6]}"
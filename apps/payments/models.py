@@ -2,6 +2,7 @@ from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from apps.core.models import FieldTrackingMixin
 from apps.core.validators import (
     ALLOWED_DOCUMENT_EXTENSIONS,
     ALLOWED_PDF_EXTENSIONS,
@@ -78,7 +79,7 @@ class PaymentGatewayConfig(models.Model):
             )
 
 
-class Payment(models.Model):
+class Payment(FieldTrackingMixin, models.Model):
     class Status(models.TextChoices):
         PENDING = "PENDING", _("Pending")
         CONFIRMED = "CONFIRMED", _("Confirmed")
@@ -114,6 +115,8 @@ class Payment(models.Model):
     confirmed_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField()
 
+    tracked_fields = ("status",)
+
     class Meta:
         indexes = [
             models.Index(fields=["reference"]),
@@ -207,7 +210,7 @@ class OfflinePayment(models.Model):
         ]
 
 
-class Refund(models.Model):
+class Refund(FieldTrackingMixin, models.Model):
     class Status(models.TextChoices):
         PENDING = "PENDING", _("Pending Review")
         APPROVED = "APPROVED", _("Approved")
@@ -250,6 +253,8 @@ class Refund(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     processed_at = models.DateTimeField(null=True, blank=True)
 
+    tracked_fields = ("status",)
+
     class Meta:
         indexes = [
             models.Index(fields=["reference"]),
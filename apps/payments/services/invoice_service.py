@@ -4,6 +4,7 @@ from django.template.loader import render_to_string
 from weasyprint import CSS, HTML
 from weasyprint.text.fonts import FontConfiguration
 
+from apps.core.services.image_variants import variant_url
 from apps.payments.models import Invoice, Payment
 
 
@@ -36,7 +37,9 @@ def create_invoice(payment: Payment) -> Invoice:
         billing_email=billing_email,
         organization_name=organization.name,
         organization_email=organization.owner.email if organization.owner else "",
-        organization_logo=organization.logo.url if organization.logo else "",
+        organization_logo=variant_url(
+            organization.logo, organization.image_variants.get("logo")
+        ),
     )
 
     generate_invoice_pdf(invoice)
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from apps.payments.models import Payment, Refund, RefundAuditLog
@@ -21,21 +21,9 @@ def handle_payment_status_change(sender, instance, created, **kwargs):
         send_admin_sale_notifications_task.delay(booking.id)
 
 
-@receiver(pre_save, sender=Refund)
-def track_refund_status_change(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old_instance = Refund.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-        except Refund.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
-
-
 @receiver(post_save, sender=Refund)
 def handle_refund_status_change(sender, instance, created, **kwargs):
-    old_status = getattr(instance, "_old_status", None)
+    old_status = instance.previous("status")
 
     if created:
         RefundAuditLog.objects.create(
@@ -11,8 +11,8 @@ import requests
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.db.models import Q, Sum
+from django.db.models import Count, F, Q
+from django.db.models.functions import Coalesce
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -22,7 +22,18 @@ from django.views import View
 from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
 
-from apps.events.models import Coupon, Event
+from apps.analytics.services import get_organization_revenue
+from apps.analytics.tracking import emit_funnel_event, track_event_visit
+from apps.core.utils.pagination import (
+    KeysetPage,
+    KeysetPaginator,
+    cached_aggregate,
+    decode_cursor,
+    encode_cursor,
+    keyset_q,
+)
+from apps.events.models import Event
+from apps.events.services.coupons import validate_coupon
 from apps.orgs.models import Organization
 from apps.payments.gateways.campay import CampayGateway
 from apps.payments.services.invoice_service import create_invoice, get_invoice_pdf
@@ -42,6 +53,8 @@ from apps.tickets.services.tasks import send_ticket_confirmation_task
 
 logger = logging.getLogger(__name__)
 
+TRANSACTION_CURSOR_SALT = "apps.payments.transaction-history"
+
 
 def htmx_redirect(request, *args, **kwargs):
     response = redirect(*args, **kwargs)
@@ -58,6 +71,7 @@ class CheckoutView(View):
             return redirect("events:discover")
 
         event = get_object_or_404(Event, id=event_id, state="PUBLISHED")
+        track_event_visit(request, event.id, stage="checkout")
 
         ticket_selections = {}
         question_answers = {}
@@ -95,19 +109,9 @@ class CheckoutView(View):
             email_for_coupon = (
                 request.user.email if user else request.POST.get("guest_email", "")
             )
-            coupon = Coupon.objects.filter(
-                Q(code=coupon_code),
-                Q(event=event) | Q(event__isnull=True, organization=event.organization),
-                is_active=True,
-            ).first()
-            if coupon and not coupon.is_valid:
-                coupon = None
-            if (
-                coupon
-                and email_for_coupon
-                and not coupon.can_be_used_by(email_for_coupon)
-            ):
-                coupon = None
+            coupon, _error = validate_coupon(
+                event.organization_id, event.id, coupon_code, email_for_coupon
+            )
 
         guest_session = None
         guest_name = None
@@ -192,7 +196,6 @@ class CheckoutView(View):
 class PaymentListView(LoginRequiredMixin, View):
     def get(self, request):
         status_filter = request.GET.get("status", "")
-        page_number = request.GET.get("page", 1)
 
         payments_qs = Payment.objects.filter(
             booking__event__organization__members=request.user
@@ -201,25 +204,23 @@ class PaymentListView(LoginRequiredMixin, View):
         if status_filter:
             payments_qs = payments_qs.filter(status=status_filter)
 
-        payments_qs = payments_qs.order_by("-created_at")
-
-        confirmed_payments = Payment.objects.filter(
-            booking__event__organization__members=request.user,
-            status=Payment.Status.CONFIRMED,
+        counts = cached_aggregate(
+            Payment.objects.filter(booking__event__organization__members=request.user),
+            confirmed=Count("id", filter=Q(status=Payment.Status.CONFIRMED)),
+            pending=Count("id", filter=Q(status=Payment.Status.PENDING)),
         )
 
         stats = {
-            "total_revenue": confirmed_payments.aggregate(total=Sum("amount"))["total"]
-            or 0,
-            "confirmed": confirmed_payments.count(),
-            "pending": Payment.objects.filter(
-                booking__event__organization__members=request.user,
-                status=Payment.Status.PENDING,
-            ).count(),
+            "total_revenue": get_organization_revenue(
+                Organization.objects.filter(members=request.user).values("id")
+            )["gross"],
+            "confirmed": counts["confirmed"],
+            "pending": counts["pending"],
         }
 
-        paginator = Paginator(payments_qs, 50)
-        page_obj = paginator.get_page(page_number)
+        page_obj = KeysetPaginator(payments_qs, ("-id",), per_page=50).get_page(
+            request
+        )
 
         return render(
             request,
@@ -227,7 +228,6 @@ class PaymentListView(LoginRequiredMixin, View):
             {
                 "payments": page_obj.object_list,
                 "page_obj": page_obj,
-                "paginator": paginator,
                 "status_filter": status_filter,
                 "stats": stats,
             },
@@ -354,6 +354,8 @@ class PaymentStartView(View):
                 "payments/_error.html",
                 {"error": result.get("message", _("Payment initiation failed"))},
             )
+        if booking.event_id:
+            emit_funnel_event(booking.event_id, "payment_started")
         response = render(request, "payments/_pending.html", {"payment": payment})
         response["HX-Trigger"] = "payment-started"
         return response
@@ -1138,59 +1140,80 @@ class TransactionHistoryView(LoginRequiredMixin, View):
                 request, "payments/transactions/history.html", {"transactions": []}
             )
 
-        transactions = []
+        per_page = 100
+        cursor = decode_cursor(
+            request.GET.get("after"), salt=TRANSACTION_CURSOR_SALT, length=3
+        )
+        sources = [
+            Payment.objects.filter(
+                booking__event__organization=user_org, status=Payment.Status.CONFIRMED
+            )
+            .select_related("booking__event", "booking__user")
+            .annotate(tx_date=Coalesce("confirmed_at", "created_at")),
+            Withdrawal.objects.filter(
+                organization=user_org,
+                status__in=[Withdrawal.Status.COMPLETED, Withdrawal.Status.PROCESSING],
+            ).annotate(tx_date=F("created_at")),
+            Refund.objects.filter(
+                payment__booking__event__organization=user_org,
+                status=Refund.Status.PROCESSED,
+            )
+            .select_related("payment__booking__event")
+            .annotate(tx_date=Coalesce("processed_at", "created_at")),
+        ]
+
+        rows = []
+        for rank, queryset in enumerate(sources):
+            if cursor:
+                date, cursor_rank, cursor_id = cursor
+                if rank < cursor_rank:
+                    queryset = queryset.filter(tx_date__lte=date)
+                elif rank > cursor_rank:
+                    queryset = queryset.filter(tx_date__lt=date)
+                else:
+                    queryset = queryset.filter(
+                        keyset_q([("tx_date", True), ("id", True)], [date, cursor_id])
+                    )
+            for obj in queryset.order_by("-tx_date", "-id")[: per_page + 1]:
+                rows.append((obj.tx_date, rank, obj.id, obj))
 
-        payments = Payment.objects.filter(
-            booking__event__organization=user_org, status=Payment.Status.CONFIRMED
-        ).select_related("booking__event", "booking__user")
+        rows.sort(key=lambda row: row[:3], reverse=True)
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
 
-        for payment in payments:
-            transactions.append(
-                {
-                    "date": payment.confirmed_at or payment.created_at,
+        transactions = []
+        for date, rank, tx_id, obj in rows:
+            if rank == 0:
+                transaction = {
                     "type": "credit",
-                    "description": f"Payment for {payment.booking.event.title}",
-                    "amount": payment.amount,
-                    "balance_change": f"+{payment.amount - payment.service_fee}",
-                    "reference": str(payment.reference),
+                    "description": f"Payment for {obj.booking.event.title}",
+                    "balance_change": f"+{obj.amount - obj.service_fee}",
                 }
-            )
-
-        withdrawals = Withdrawal.objects.filter(
-            organization=user_org,
-            status__in=[Withdrawal.Status.COMPLETED, Withdrawal.Status.PROCESSING],
-        ).select_related("organization")
-
-        for withdrawal in withdrawals:
-            transactions.append(
-                {
-                    "date": withdrawal.created_at,
+            elif rank == 1:
+                transaction = {
                     "type": "debit",
-                    "description": f"Withdrawal to {withdrawal.phone_number}",
-                    "amount": withdrawal.amount,
-                    "balance_change": f"-{withdrawal.amount}",
-                    "reference": str(withdrawal.reference),
+                    "description": f"Withdrawal to {obj.phone_number}",
+                    "balance_change": f"-{obj.amount}",
                 }
-            )
-
-        refunds = Refund.objects.filter(
-            payment__booking__event__organization=user_org,
-            status=Refund.Status.PROCESSED,
-        ).select_related("payment__booking__event")
-
-        for refund in refunds:
-            transactions.append(
-                {
-                    "date": refund.processed_at or refund.created_at,
+            else:
+                transaction = {
                     "type": "debit",
-                    "description": f"Refund for {refund.payment.booking.event.title}",
-                    "amount": refund.amount,
-                    "balance_change": f"-{refund.amount}",
-                    "reference": str(refund.reference),
+                    "description": f"Refund for {obj.payment.booking.event.title}",
+                    "balance_change": f"-{obj.amount}",
                 }
+            transaction.update(
+                {"date": date, "amount": obj.amount, "reference": str(obj.reference)}
             )
+            transactions.append(transaction)
 
-        transactions.sort(key=lambda x: x["date"], reverse=True)
+        next_url = None
+        if has_next:
+            query = request.GET.copy()
+            query["after"] = encode_cursor(
+                rows[-1][:3], salt=TRANSACTION_CURSOR_SALT
+            )
+            next_url = f"?{query.urlencode()}"
+        page_obj = KeysetPage(transactions, next_url=next_url)
 
         balance_data = calculate_organization_balance(user_org)
 
@@ -1198,7 +1221,8 @@ class TransactionHistoryView(LoginRequiredMixin, View):
             request,
             "payments/transactions/history.html",
             {
-                "transactions": transactions[:100],
+                "transactions": transactions,
+                "page_obj": page_obj,
                 "balance_data": balance_data,
             },
         )
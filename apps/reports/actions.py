@@ -1,24 +1,45 @@
 import json
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.db.models import Count, Q, Sum
-from django.db.models.functions import TruncDate
-from django.http import HttpResponse
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from django.utils.timesince import timesince
 from django.utils.translation import gettext_lazy as _
 from django.views import View
-
+from redis.exceptions import RedisError
+
+from apps.analytics.organization import ORG_ANALYTICS_PERIODS, get_org_analytics
+from apps.analytics.services import (
+    SALES_ZOOMS,
+    get_event_revenue,
+    get_organization_revenue,
+    get_sales_timeline,
+)
+from apps.analytics.tracking import get_live_funnel
+from apps.core.utils.pagination import (
+    KeysetPaginator,
+    cached_aggregate,
+    stream_rows,
+)
 from apps.events.models import CheckoutQuestion, Event
-from apps.orgs.models import Organization
+from apps.orgs.models import MemberRole, Organization
 from apps.payments.models import Payment
 from apps.payments.services.payment_service import calculate_organization_balance
+from apps.reports.columnar import (
+    COLUMNAR_FORMATS,
+    COLUMNAR_SOURCES,
+    build_parquet,
+    columnar_filename,
+    stream_arrow,
+)
 from apps.reports.queries import (
     get_event_summary,
     get_questions_summary,
@@ -31,6 +52,22 @@ from apps.reports.services import (
 )
 from apps.tickets.models import Booking, Ticket
 
+ATTENDEE_ORDERING = ("sort_last_name", "sort_first_name", "id")
+
+
+def daily_sales_timeline(event_id, days):
+    first_day = timezone.localdate() - timedelta(days=days - 1)
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+    counts = {
+        timezone.localdate(item["period"]): item["tickets"]
+        for item in get_sales_timeline(event_id, zoom="day", start=start)
+    }
+    timeline = [
+        {"date": day, "count": counts.get(day, 0)}
+        for day in (first_day + timedelta(days=i) for i in range(days))
+    ]
+    return timeline, max((item["count"] for item in timeline), default=0)
+
 
 class AnalyticsView(LoginRequiredMixin, View):
     @method_decorator(cache_control(no_cache=True, must_revalidate=True, no_store=True))
@@ -42,21 +79,16 @@ class AnalyticsView(LoginRequiredMixin, View):
             "organization"
         )
 
-        payment_stats = Payment.objects.filter(
-            booking__event__organization__members=user, status=Payment.Status.CONFIRMED
-        ).aggregate(total_revenue=Sum("amount"))
-
-        total_revenue = payment_stats["total_revenue"] or 0
+        total_revenue = get_organization_revenue(
+            Organization.objects.filter(members=user).values("id")
+        )["gross"]
 
-        ticket_stats = Ticket.objects.filter(
-            booking__event__organization__members=user,
-            booking__status=Booking.Status.CONFIRMED,
-        ).aggregate(
-            total=Count("id"), checked_in=Count("id", filter=Q(is_checked_in=True))
-        )
-
-        tickets_sold = ticket_stats["total"]
-        checked_in = ticket_stats["checked_in"]
+        org_stats = [
+            get_org_analytics(organization)
+            for organization in Organization.objects.filter(members=user)
+        ]
+        tickets_sold = sum(stats["tickets"]["sold"] for stats in org_stats)
+        checked_in = sum(stats["tickets"]["checked_in"] for stats in org_stats)
         checkin_rate = (checked_in / tickets_sold * 100) if tickets_sold > 0 else 0
 
         event_counts = user_events.aggregate(
@@ -80,18 +112,20 @@ class AnalyticsView(LoginRequiredMixin, View):
             .order_by("-booking__created_at")[:5]
         )
 
-        top_events = user_events.annotate(
-            revenue=Sum(
-                "bookings__payment__amount",
-                filter=Q(bookings__payment__status=Payment.Status.CONFIRMED),
-            ),
-            ticket_count=Count(
-                "bookings__tickets", filter=Q(bookings__status=Booking.Status.CONFIRMED)
-            ),
-            checkin_count=Count(
-                "bookings__tickets", filter=Q(bookings__tickets__is_checked_in=True)
-            ),
-        ).order_by("-revenue")[:5]
+        top_rows = sorted(
+            (row for stats in org_stats for row in stats["top_events"]),
+            key=lambda row: row["revenue_usd"],
+            reverse=True,
+        )[:5]
+        events_by_id = user_events.in_bulk([row["id"] for row in top_rows])
+        top_events = []
+        for row in top_rows:
+            event = events_by_id.get(row["id"])
+            if event:
+                event.revenue = row["revenue"]
+                event.ticket_count = row["tickets_sold"]
+                event.checkin_count = row["checked_in"]
+                top_events.append(event)
 
         all_events = user_events.order_by("-start_at")[:20]
 
@@ -138,6 +172,20 @@ class AnalyticsView(LoginRequiredMixin, View):
         )
 
 
+class OrganizationAnalyticsAPIView(LoginRequiredMixin, View):
+    def get(self, request, org_slug):
+        organization = get_object_or_404(
+            Organization, slug=org_slug, members=request.user
+        )
+        try:
+            days = int(request.GET.get("days", 30))
+        except ValueError:
+            days = 30
+        if days not in ORG_ANALYTICS_PERIODS:
+            days = 30
+        return JsonResponse(get_org_analytics(organization, days))
+
+
 class ReportsDashboardView(LoginRequiredMixin, View):
     def get(self, request, org_slug, event_slug):
         event = get_object_or_404(Event, organization__slug=org_slug, slug=event_slug)
@@ -148,28 +196,7 @@ class ReportsDashboardView(LoginRequiredMixin, View):
         ).count()
         summary["pending_count"] = pending_count
 
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        sales_timeline = (
-            Ticket.objects.filter(
-                booking__event=event,
-                booking__status=Booking.Status.CONFIRMED,
-                booking__created_at__gte=seven_days_ago,
-            )
-            .annotate(date=TruncDate("booking__created_at"))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
-
-        timeline_dict = {item["date"]: item["count"] for item in sales_timeline}
-        sales_timeline_filled = []
-        max_daily_sales = 0
-        for i in range(7):
-            date = (seven_days_ago + timedelta(days=i)).date()
-            count = timeline_dict.get(date, 0)
-            sales_timeline_filled.append({"date": date, "count": count})
-            if count > max_daily_sales:
-                max_daily_sales = count
+        sales_timeline_filled, max_daily_sales = daily_sales_timeline(event.id, 7)
 
         revenue_breakdown = (
             Ticket.objects.filter(
@@ -387,30 +414,7 @@ class SalesTimelineView(LoginRequiredMixin, View):
         else:
             days = 7
 
-        start_date = timezone.now() - timedelta(days=days)
-
-        sales_timeline = (
-            Ticket.objects.filter(
-                booking__event=event,
-                booking__status=Booking.Status.CONFIRMED,
-                booking__created_at__gte=start_date,
-            )
-            .annotate(date=TruncDate("booking__created_at"))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
-
-        timeline_dict = {item["date"]: item["count"] for item in sales_timeline}
-        sales_timeline_filled = []
-        max_daily_sales = 0
-
-        for i in range(days):
-            date = (start_date + timedelta(days=i)).date()
-            count = timeline_dict.get(date, 0)
-            sales_timeline_filled.append({"date": date, "count": count})
-            if count > max_daily_sales:
-                max_daily_sales = count
+        sales_timeline_filled, max_daily_sales = daily_sales_timeline(event.id, days)
 
         return render(
             request,
@@ -423,6 +427,65 @@ class SalesTimelineView(LoginRequiredMixin, View):
         )
 
 
+class SalesTimelineDataView(LoginRequiredMixin, View):
+    def get(self, request, org_slug, event_slug):
+        event = get_object_or_404(
+            Event,
+            organization__slug=org_slug,
+            slug=event_slug,
+            organization__members=request.user,
+        )
+        zoom = request.GET.get("zoom", "day")
+        if zoom not in SALES_ZOOMS:
+            zoom = "day"
+
+        bounds = {}
+        for name in ("start", "end"):
+            value = request.GET.get(name, "")
+            try:
+                bounds[name] = parse_datetime(value) if value else None
+            except ValueError:
+                bounds[name] = None
+            if value and bounds[name] is None:
+                return JsonResponse(
+                    {"error": str(_("Invalid date range"))}, status=400
+                )
+        start, end = bounds["start"], bounds["end"]
+
+        ticket_type_id = request.GET.get("ticket_type") or None
+        if ticket_type_id is not None:
+            if not (
+                ticket_type_id.isdigit()
+                and event.ticket_types.filter(pk=ticket_type_id).exists()
+            ):
+                return JsonResponse(
+                    {"error": str(_("Invalid ticket type"))}, status=400
+                )
+            ticket_type_id = int(ticket_type_id)
+
+        buckets = get_sales_timeline(
+            event.id,
+            zoom=zoom,
+            start=start,
+            end=end,
+            ticket_type_id=ticket_type_id,
+        )
+        return JsonResponse(
+            {
+                "zoom": zoom,
+                "buckets": [
+                    {
+                        "period": bucket["period"].isoformat(),
+                        "tickets": bucket["tickets"],
+                        "gross": str(bucket["gross"]),
+                        "orders": bucket["orders"],
+                    }
+                    for bucket in buckets
+                ],
+            }
+        )
+
+
 class ReportsSummaryView(LoginRequiredMixin, View):
     def get(self, request, org_slug, event_slug):
         event = get_object_or_404(Event, organization__slug=org_slug, slug=event_slug)
@@ -442,12 +505,7 @@ class LiveStatsView(LoginRequiredMixin, View):
             booking__event=event, is_checked_in=True
         ).count()
 
-        total_revenue = (
-            Payment.objects.filter(
-                booking__event=event, status=Payment.Status.CONFIRMED
-            ).aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
+        total_revenue = get_event_revenue(event.id)["gross"]
 
         pending_payments = Payment.objects.filter(
             booking__event=event, status=Payment.Status.PENDING
@@ -484,7 +542,6 @@ class AttendeeListView(LoginRequiredMixin, View):
         event = get_object_or_404(Event, organization__slug=org_slug, slug=event_slug)
         print_mode = request.GET.get("print") == "1"
         search_query = request.GET.get("search", "").strip()
-        page_number = request.GET.get("page", 1)
 
         tickets_qs = (
             Ticket.objects.filter(
@@ -492,6 +549,10 @@ class AttendeeListView(LoginRequiredMixin, View):
             )
             .select_related("booking__user", "booking", "ticket_type")
             .prefetch_related("answers__question")
+            .annotate(
+                sort_last_name=Coalesce("booking__user__last_name", Value("")),
+                sort_first_name=Coalesce("booking__user__first_name", Value("")),
+            )
         )
 
         if search_query:
@@ -504,39 +565,37 @@ class AttendeeListView(LoginRequiredMixin, View):
                 | Q(code__icontains=search_query)
             )
 
-        tickets_qs = tickets_qs.order_by(
-            "booking__user__last_name", "booking__user__first_name"
+        totals = cached_aggregate(
+            tickets_qs.order_by(),
+            total=Count("id"),
+            checked_in=Count("id", filter=Q(is_checked_in=True)),
         )
+        questions = list(CheckoutQuestion.objects.filter(event=event).order_by("order"))
 
-        total_count = tickets_qs.count()
-        checked_in_count = tickets_qs.filter(is_checked_in=True).count()
+        context = {
+            "event": event,
+            "questions": questions,
+            "print_mode": print_mode,
+            "total_count": totals["total"],
+            "checked_in_count": totals["checked_in"],
+            "search_query": search_query,
+        }
 
         if print_mode:
-            tickets = tickets_qs
-            paginator = None
-            page_obj = None
-        else:
-            paginator = Paginator(tickets_qs, 100)
-            page_obj = paginator.get_page(page_number)
-            tickets = page_obj.object_list
-
-        questions = CheckoutQuestion.objects.filter(event=event).order_by("order")
+            return stream_rows(
+                request,
+                tickets_qs.order_by(*ATTENDEE_ORDERING),
+                "reports/print/attendees_start.html",
+                "reports/_attendee_rows.html",
+                "reports/print/attendees_end.html",
+                context,
+            )
 
-        return render(
-            request,
-            "reports/attendee_list.html",
-            {
-                "event": event,
-                "tickets": tickets,
-                "questions": questions,
-                "print_mode": print_mode,
-                "total_count": total_count,
-                "checked_in_count": checked_in_count,
-                "search_query": search_query,
-                "page_obj": page_obj,
-                "paginator": paginator,
-            },
-        )
+        page_obj = KeysetPaginator(
+            tickets_qs, ATTENDEE_ORDERING, per_page=100
+        ).get_page(request)
+        context.update({"tickets": page_obj.object_list, "page_obj": page_obj})
+        return render(request, "reports/attendee_list.html", context)
 
 
 class ExportCenterView(LoginRequiredMixin, View):
@@ -577,6 +636,19 @@ class ExportGenerateView(LoginRequiredMixin, View):
                 "reports:export_center", org_slug=org_slug, event_slug=event_slug
             )
 
+        if format_type in COLUMNAR_FORMATS:
+            return columnar_export_response(
+                request,
+                [event.id],
+                event.slug,
+                report_type,
+                format_type,
+                mask_emails,
+                redirect(
+                    "reports:export_center", org_slug=org_slug, event_slug=event_slug
+                ),
+            )
+
         try:
             if format_type == "PDF":
                 content, filename, content_type = generate_pdf_export(
@@ -607,6 +679,85 @@ class ExportGenerateView(LoginRequiredMixin, View):
             )
 
 
+def columnar_export_response(
+    request, event_ids, scope_slug, report_type, format_type, mask_emails, fallback
+):
+    if report_type not in COLUMNAR_SOURCES:
+        messages.error(request, _("This report is not available in a columnar format"))
+        return fallback
+
+    filename = columnar_filename(scope_slug, report_type, format_type)
+    content_type = COLUMNAR_FORMATS[format_type][1]
+    if format_type == "ARROW":
+        response = StreamingHttpResponse(
+            stream_arrow(report_type, event_ids, mask_emails),
+            content_type=content_type,
+        )
+    else:
+        response = HttpResponse(
+            build_parquet(report_type, event_ids, mask_emails),
+            content_type=content_type,
+        )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Content-Type-Options"] = "nosniff"
+    response["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    return response
+
+
+UNMASK_EXPORT_ROLES = [MemberRole.OWNER, MemberRole.ADMIN]
+
+
+class OrganizationColumnarExportView(LoginRequiredMixin, View):
+    def get(self, request, org_slug):
+        return self.export(request, org_slug, request.GET, mask_emails=True)
+
+    def post(self, request, org_slug):
+        mask_emails = request.POST.get("mask_emails", "on") == "on"
+        return self.export(request, org_slug, request.POST, mask_emails)
+
+    def export(self, request, org_slug, params, mask_emails):
+        organization = get_object_or_404(
+            Organization, slug=org_slug, members=request.user
+        )
+        if organization.get_member_role(request.user) not in UNMASK_EXPORT_ROLES:
+            mask_emails = True
+        report_type = params.get("report", "RSVP").upper()
+        format_type = params.get("format", "PARQUET").upper()
+        if format_type not in COLUMNAR_FORMATS:
+            format_type = "PARQUET"
+        event_ids = list(organization.events.values_list("id", flat=True))
+        return columnar_export_response(
+            request,
+            event_ids,
+            organization.slug,
+            report_type,
+            format_type,
+            mask_emails,
+            redirect("reports:analytics"),
+        )
+
+
+class EventFunnelView(LoginRequiredMixin, View):
+    def get(self, request, org_slug, event_slug):
+        event = get_object_or_404(
+            Event,
+            organization__slug=org_slug,
+            slug=event_slug,
+            organization__members=request.user,
+        )
+        try:
+            minutes = int(request.GET.get("minutes", 60))
+        except ValueError:
+            minutes = 60
+        try:
+            funnel = get_live_funnel(event.id, minutes)
+        except RedisError:
+            return JsonResponse(
+                {"error": str(_("Live funnel is temporarily unavailable"))}, status=503
+            )
+        return JsonResponse(funnel)
+
+
 class CustomResponsesView(LoginRequiredMixin, View):
     def get(self, request, org_slug, event_slug):
         event = get_object_or_404(
@@ -0,0 +1,269 @@
+from datetime import datetime
+from io import BytesIO
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from apps.checkin.models import CheckIn
+from apps.payments.models import Payment
+from apps.reports.queries import mask_email
+from apps.tickets.models import Booking, Ticket
+
+COLUMNAR_BATCH_SIZE = 5000
+
+COLUMNAR_FORMATS = {
+    "PARQUET": ("parquet", "application/vnd.apache.parquet"),
+    "ARROW": ("arrows", "application/vnd.apache.arrow.stream"),
+}
+
+
+def _money():
+    return pa.decimal128(12, 2)
+
+
+def _timestamp():
+    return pa.timestamp("us", tz="UTC")
+
+
+def _rsvp_source(event_ids, mask_emails):
+    schema = pa.schema(
+        [
+            ("ticket_id", pa.int64()),
+            ("event_id", pa.int64()),
+            ("event_slug", pa.string()),
+            ("code", pa.string()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("ticket_type", pa.string()),
+            ("price", _money()),
+            ("checked_in", pa.bool_()),
+            ("checked_in_at", _timestamp()),
+            ("registered_at", _timestamp()),
+        ]
+    )
+    rows = (
+        Ticket.objects.filter(
+            booking__event_id__in=event_ids, booking__status=Booking.Status.CONFIRMED
+        )
+        .order_by("id")
+        .values_list(
+            "id",
+            "booking__event_id",
+            "booking__event__slug",
+            "code",
+            "attendee_name",
+            "attendee_email",
+            "booking__user__first_name",
+            "booking__user__last_name",
+            "booking__user__email",
+            "booking__guest_name",
+            "booking__guest_email",
+            "ticket_type__name",
+            "ticket_type__price",
+            "is_checked_in",
+            "checked_in_at",
+            "booking__created_at",
+        )
+    )
+
+    def convert(row):
+        (
+            ticket_id,
+            event_id,
+            event_slug,
+            code,
+            attendee_name,
+            attendee_email,
+            first_name,
+            last_name,
+            user_email,
+            guest_name,
+            guest_email,
+            ticket_type,
+            price,
+            checked_in,
+            checked_in_at,
+            registered_at,
+        ) = row
+        if user_email:
+            name = attendee_name or f"{first_name or ''} {last_name or ''}".strip()
+            email = attendee_email or user_email
+        else:
+            name = attendee_name or guest_name
+            email = attendee_email or guest_email
+        if mask_emails and email:
+            email = mask_email(email)
+        return (
+            ticket_id,
+            event_id,
+            event_slug,
+            code,
+            name or None,
+            email or None,
+            ticket_type,
+            price,
+            checked_in,
+            checked_in_at,
+            registered_at,
+        )
+
+    return schema, rows, convert
+
+
+def _payment_source(event_ids, mask_emails):
+    schema = pa.schema(
+        [
+            ("payment_id", pa.int64()),
+            ("event_id", pa.int64()),
+            ("event_slug", pa.string()),
+            ("reference", pa.string()),
+            ("customer", pa.string()),
+            ("phone", pa.string()),
+            ("provider", pa.string()),
+            ("status", pa.string()),
+            ("currency", pa.string()),
+            ("amount", _money()),
+            ("service_fee", _money()),
+            ("created_at", _timestamp()),
+            ("confirmed_at", _timestamp()),
+        ]
+    )
+    rows = (
+        Payment.objects.filter(booking__event_id__in=event_ids)
+        .order_by("id")
+        .values_list(
+            "id",
+            "booking__event_id",
+            "booking__event__slug",
+            "reference",
+            "booking__user__email",
+            "phone_number",
+            "provider",
+            "status",
+            "currency",
+            "amount",
+            "service_fee",
+            "created_at",
+            "confirmed_at",
+            "booking__guest_email",
+        )
+    )
+
+    def convert(row):
+        *row, guest_email = row
+        row[3] = str(row[3])
+        row[4] = row[4] or guest_email or None
+        if mask_emails:
+            row[4] = mask_email(row[4])
+            phone = row[5]
+            if len(phone) > 6:
+                row[5] = phone[:4] + "****" + phone[-2:]
+        return row
+
+    return schema, rows, convert
+
+
+def _checkin_source(event_ids, mask_emails):
+    schema = pa.schema(
+        [
+            ("checkin_id", pa.int64()),
+            ("event_id", pa.int64()),
+            ("event_slug", pa.string()),
+            ("code", pa.string()),
+            ("email", pa.string()),
+            ("ticket_type", pa.string()),
+            ("checked_in_at", _timestamp()),
+            ("checked_in_by", pa.string()),
+        ]
+    )
+    rows = (
+        CheckIn.objects.filter(ticket__ticket_type__event_id__in=event_ids)
+        .order_by("id")
+        .values_list(
+            "id",
+            "ticket__ticket_type__event_id",
+            "ticket__ticket_type__event__slug",
+            "ticket__code",
+            "ticket__booking__user__email",
+            "ticket__ticket_type__name",
+            "checked_in_at",
+            "checked_in_by__email",
+            "ticket__attendee_email",
+            "ticket__booking__guest_email",
+        )
+    )
+
+    def convert(row):
+        *row, attendee_email, guest_email = row
+        row[4] = attendee_email or row[4] or guest_email or None
+        if mask_emails:
+            row[4] = mask_email(row[4])
+        return row
+
+    return schema, rows, convert
+
+
+COLUMNAR_SOURCES = {
+    "RSVP": _rsvp_source,
+    "PAYMENTS": _payment_source,
+    "CHECKINS": _checkin_source,
+}
+
+
+def iter_record_batches(report_type, event_ids, mask_emails=True):
+    schema, rows, convert = COLUMNAR_SOURCES[report_type](event_ids, mask_emails)
+    names = schema.names
+
+    def to_batch(buffer):
+        columns = list(zip(*buffer))
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(column, type=schema.field(name).type)
+                for name, column in zip(names, columns)
+            ],
+            schema=schema,
+        )
+
+    yield schema
+    buffer = []
+    for row in rows.iterator(chunk_size=COLUMNAR_BATCH_SIZE):
+        buffer.append(convert(row))
+        if len(buffer) == COLUMNAR_BATCH_SIZE:
+            yield to_batch(buffer)
+            buffer = []
+    if buffer:
+        yield to_batch(buffer)
+
+
+def build_parquet(report_type, event_ids, mask_emails=True):
+    batches = iter_record_batches(report_type, event_ids, mask_emails)
+    schema = next(batches)
+    sink = pa.BufferOutputStream()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def stream_arrow(report_type, event_ids, mask_emails=True):
+    batches = iter_record_batches(report_type, event_ids, mask_emails)
+    schema = next(batches)
+    buffer = BytesIO()
+    writer = pa.ipc.new_stream(buffer, schema)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield _drain(buffer)
+    writer.close()
+    yield _drain(buffer)
+
+
+def columnar_filename(scope_slug, report_type, format_type):
+    extension, _ = COLUMNAR_FORMATS[format_type]
+    return f"{report_type.lower()}_{scope_slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
@@ -1,4 +1,4 @@
-from django.db.models import Sum
+from apps.analytics.services import get_event_revenue
 from apps.events.models import Event, CheckoutQuestion
 from apps.tickets.models import Ticket, Booking, TicketQuestionAnswer
 from apps.checkin.models import CheckIn, SwagCollection
@@ -23,12 +23,7 @@ def get_event_summary(event_id: int) -> dict:
     tickets = Ticket.objects.filter(ticket_type__event_id=event_id)
     total_tickets = tickets.count()
     checked_in = tickets.filter(is_checked_in=True).count()
-    total_revenue = (
-        Payment.objects.filter(
-            booking__tickets__ticket_type__event_id=event_id, status="CONFIRMED"
-        ).aggregate(total=Sum("amount"))["total"]
-        or 0
-    )
+    revenue = get_event_revenue(event_id)
     return {
         "event": event,
         "total_tickets": total_tickets,
@@ -36,7 +31,9 @@ def get_event_summary(event_id: int) -> dict:
         "check_in_rate": round(checked_in / total_tickets * 100, 1)
         if total_tickets
         else 0,
-        "total_revenue": total_revenue,
+        "total_revenue": revenue["gross"],
+        "total_refunds": revenue["refunds"],
+        "net_revenue": revenue["net"],
     }
 
 
@@ -89,9 +86,7 @@ def get_rsvp_data(event_id: int, mask_emails: bool = True):
 
 def get_payment_data(event_id: int, mask_emails: bool = True):
     payments = (
-        Payment.objects.filter(booking__tickets__ticket_type__event_id=event_id)
-        .distinct()
-        .select_related("booking__user")
+        Payment.objects.filter(booking__event_id=event_id)
         .values(
             "reference",
             "booking__user__email",
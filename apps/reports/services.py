@@ -1,5 +1,9 @@
 import csv
 import json
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from io import BytesIO, StringIO
 
@@ -7,10 +11,11 @@ from django.contrib.staticfiles import finders
 from django.db.models import Count, Sum
 from django.template.loader import render_to_string
 from openpyxl import Workbook
+from pypdf import PdfReader, PdfWriter
 from weasyprint import CSS, HTML
 from weasyprint.text.fonts import FontConfiguration
 
-from apps.payments.models import Payment
+from apps.analytics.services import get_event_revenue, get_event_revenue_by_provider
 from apps.reports.queries import (
     get_checkin_data,
     get_payment_data,
@@ -19,6 +24,21 @@ from apps.reports.queries import (
 )
 from apps.tickets.models import Booking, Ticket
 
+logger = logging.getLogger(__name__)
+
+PDF_CHUNK_ROWS = 500
+
+CHUNK_PAGE_CSS = "@page { @bottom-center { content: none; } }"
+
+PAGE_NUMBER_HTML = """
+<html><head><style>
+.sheet { break-after: page; }
+.sheet:last-child { break-after: auto; }
+</style></head><body>%s</body></html>
+"""
+
+_pdf_worker = {}
+
 DATA_FETCHERS = {
     "RSVP": get_rsvp_data,
     "PAYMENTS": get_payment_data,
@@ -28,14 +48,15 @@ DATA_FETCHERS = {
 
 
 def get_financial_summary(event):
-    payments = Payment.objects.filter(
-        booking__event=event, status=Payment.Status.CONFIRMED
-    )
+    revenue = get_event_revenue(event.id)
 
     return {
         "event": event,
-        "total_revenue": payments.aggregate(total=Sum("amount"))["total"] or 0,
-        "total_transactions": payments.count(),
+        "total_revenue": revenue["gross"],
+        "total_fees": revenue["fees"],
+        "total_refunds": revenue["refunds"],
+        "net_revenue": revenue["net"],
+        "total_transactions": revenue["orders_count"],
         "tickets_sold": Ticket.objects.filter(
             booking__event=event, booking__status=Booking.Status.CONFIRMED
         ).count(),
@@ -45,9 +66,7 @@ def get_financial_summary(event):
         .values("ticket_type__name", "ticket_type__price")
         .annotate(count=Count("id"), revenue=Sum("ticket_type__price"))
         .order_by("-count"),
-        "payment_methods": payments.values("provider")
-        .annotate(count=Count("id"), total=Sum("amount"))
-        .order_by("-total"),
+        "payment_methods": get_event_revenue_by_provider(event.id),
         "generated_at": datetime.now(),
     }
 
@@ -205,6 +224,107 @@ def generate_json_export(event, report_type: str, user, mask_emails: bool = True
     return content.encode("utf-8"), filename, "application/json"
 
 
+def _init_pdf_worker(css_path):
+    font_config = FontConfiguration()
+    _pdf_worker["font_config"] = font_config
+    _pdf_worker["stylesheets"] = [
+        CSS(filename=css_path, font_config=font_config),
+        CSS(string=CHUNK_PAGE_CSS, font_config=font_config),
+    ]
+
+
+def _render_pdf_chunk(html_content):
+    document = HTML(string=html_content).render(
+        stylesheets=_pdf_worker["stylesheets"],
+        font_config=_pdf_worker["font_config"],
+    )
+    return document.write_pdf()
+
+
+def _stamp_page_numbers(writer, css, font_config):
+    sheets = '<div class="sheet"></div>' * len(writer.pages)
+    overlay = PdfReader(
+        BytesIO(
+            HTML(string=PAGE_NUMBER_HTML % sheets).write_pdf(
+                stylesheets=[css], font_config=font_config
+            )
+        )
+    )
+    for page, numbered in zip(writer.pages, overlay.pages):
+        page.merge_page(numbered)
+
+
+def _pdf_chunk_html(template, context, rows, chunk_size):
+    total = len(rows)
+    for offset in range(0, total, chunk_size):
+        yield render_to_string(
+            template,
+            {
+                **context,
+                "data": rows[offset : offset + chunk_size],
+                "total_rows": total,
+                "chunk": {
+                    "first": offset == 0,
+                    "last": offset + chunk_size >= total,
+                    "offset": offset,
+                },
+            },
+        )
+
+
+def _rendered_pdf_chunks(chunks, css_path, workers):
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        _init_pdf_worker(css_path)
+        for html_content in chunks:
+            yield _render_pdf_chunk(html_content)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_pdf_worker, initargs=(css_path,)
+    ) as pool:
+        pending = deque()
+        for html_content in chunks:
+            pending.append(pool.submit(_render_pdf_chunk, html_content))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def render_pdf_report(template, context, chunk_size=PDF_CHUNK_ROWS, workers=1):
+    css_path = finders.find("css/report_pdf.css")
+    font_config = FontConfiguration()
+    css = CSS(filename=css_path, font_config=font_config)
+
+    rows = context.get("data")
+    if not isinstance(rows, list) or len(rows) <= chunk_size:
+        html_content = render_to_string(
+            template,
+            {
+                **context,
+                "total_rows": len(rows or []),
+                "chunk": {"first": True, "last": True, "offset": 0},
+            },
+        )
+        return HTML(string=html_content).write_pdf(
+            stylesheets=[css], font_config=font_config
+        )
+
+    total = len(rows)
+    writer = PdfWriter()
+    chunks = _pdf_chunk_html(template, context, rows, chunk_size)
+    for index, pdf in enumerate(_rendered_pdf_chunks(chunks, css_path, workers), 1):
+        writer.append(PdfReader(BytesIO(pdf)))
+        logger.info(
+            f"Rendered {min(index * chunk_size, total)} of {total} PDF report rows"
+        )
+    _stamp_page_numbers(writer, css, font_config)
+
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
 def generate_pdf_export(event, report_type: str, user, mask_emails: bool = True):
     template_map = {
         "RSVP": "reports/pdf/attendees.html",
@@ -243,14 +363,7 @@ def generate_pdf_export(event, report_type: str, user, mask_emails: bool = True)
     }
     context["report_title"] = report_titles.get(report_type, report_type)
 
-    html_content = render_to_string(template, context)
-
-    font_config = FontConfiguration()
-    css_path = finders.find("css/report_pdf.css")
-    css = CSS(filename=css_path, font_config=font_config)
-
-    html = HTML(string=html_content)
-    pdf_content = html.write_pdf(stylesheets=[css], font_config=font_config)
+    pdf_content = render_pdf_report(template, context)
 
     filename = f"{report_type.lower()}_{event.slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
     return pdf_content, filename, "application/pdf"
@@ -0,0 +1,120 @@
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from decimal import Decimal
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from apps.core.models import User
+from apps.events.models import Event
+from apps.orgs.models import Membership, MemberRole
+from apps.payments.models import Payment
+from apps.reports.columnar import build_parquet, stream_arrow
+from apps.tickets.models import Booking, Ticket, TicketType
+
+
+@pytest.fixture
+def second_event(organization):
+    return Event.objects.create(
+        organization=organization,
+        title="Second Event",
+        description="Another event.",
+        start_at=timezone.now() + timezone.timedelta(days=14),
+        end_at=timezone.now() + timezone.timedelta(days=14, hours=2),
+        capacity=50,
+    )
+
+
+def _confirmed_ticket(event, user, price="2500"):
+    ticket_type = TicketType.objects.create(
+        event=event, name="Standard", price=Decimal(price), quantity=10
+    )
+    booking = Booking.objects.create(
+        event=event,
+        user=user,
+        total_amount=Decimal(price),
+        status=Booking.Status.CONFIRMED,
+    )
+    return Ticket.objects.create(booking=booking, ticket_type=ticket_type)
+
+
+@pytest.mark.django_db
+class TestColumnarExport:
+    def test_parquet_keeps_column_types(self, event, user):
+        _confirmed_ticket(event, user)
+
+        table = pq.read_table(pa.BufferReader(build_parquet("RSVP", [event.id])))
+
+        assert table.num_rows == 1
+        assert table.schema.field("price").type == pa.decimal128(12, 2)
+        assert table.schema.field("checked_in").type == pa.bool_()
+        assert pa.types.is_timestamp(table.schema.field("registered_at").type)
+        assert table.column("price")[0].as_py() == Decimal("2500.00")
+        assert table.column("email")[0].as_py() == "t**t@example.com"
+
+    def test_arrow_stream_spans_events(self, event, second_event, user):
+        _confirmed_ticket(event, user)
+        _confirmed_ticket(second_event, user)
+        Payment.objects.create(
+            booking=Booking.objects.create(
+                event=second_event, user=user, total_amount=Decimal("1000")
+            ),
+            amount=Decimal("1000"),
+            currency="XAF",
+            provider="CAMPAY",
+        )
+
+        body = b"".join(stream_arrow("RSVP", [event.id, second_event.id]))
+        table = pa.ipc.open_stream(body).read_all()
+        assert sorted(table.column("event_id").to_pylist()) == sorted(
+            [event.id, second_event.id]
+        )
+
+        body = b"".join(stream_arrow("PAYMENTS", [event.id, second_event.id]))
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.column("amount").to_pylist() == [Decimal("1000.00")]
+
+    def test_guest_payment_email_and_member_masking(
+        self, locmem_cache, event, organization, user
+    ):
+        Payment.objects.create(
+            booking=Booking.objects.create(
+                event=event,
+                guest_email="guest@example.com",
+                total_amount=Decimal("1000"),
+            ),
+            amount=Decimal("1000"),
+            currency="XAF",
+            provider="CAMPAY",
+        )
+        body = b"".join(stream_arrow("PAYMENTS", [event.id], mask_emails=False))
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.column("customer").to_pylist() == ["guest@example.com"]
+
+        member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="pass12345",
+            active_mode="ORGANIZER",
+        )
+        Membership.objects.create(
+            organization=organization, user=member, role=MemberRole.MEMBER
+        )
+        client = Client()
+        client.force_login(member)
+        url = reverse("reports:org_columnar_export", args=[organization.slug])
+        params = {"report": "PAYMENTS", "format": "ARROW", "mask_emails": "off"}
+
+        for response in (client.get(url, params), client.post(url, params)):
+            table = pa.ipc.open_stream(b"".join(response.streaming_content)).read_all()
+            assert table.column("customer").to_pylist() == ["g***t@example.com"]
+
+        user.active_mode = "ORGANIZER"
+        user.save(update_fields=["active_mode"])
+        client.force_login(user)
+        for response, customer in (
+            (client.get(url, params), "g***t@example.com"),
+            (client.post(url, params), "guest@example.com"),
+        ):
+            table = pa.ipc.open_stream(b"".join(response.streaming_content)).read_all()
+            assert table.column("customer").to_pylist() == [customer]
@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from apps.reports import services
+
+
+def _blank_pdf(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class FakeDocument:
+    def __init__(self, html, calls):
+        self.pages = [html]
+        self.calls = calls
+
+    def write_pdf(self, *args, **kwargs):
+        self.calls.append("write")
+        return _blank_pdf(len(self.pages))
+
+
+class FakeHTML:
+    rendered = []
+    calls = []
+
+    def __init__(self, string):
+        self.string = string
+
+    def render(self, *args, **kwargs):
+        self.rendered.append(self.string)
+        self.calls.append("render")
+        return FakeDocument(self.string, self.calls)
+
+    def write_pdf(self, *args, **kwargs):
+        sheets = self.string.count('class="sheet"')
+        if sheets:
+            self.calls.append("number")
+        else:
+            self.rendered.append(self.string)
+        return _blank_pdf(max(1, sheets))
+
+
+class BoundedExecutor(ThreadPoolExecutor):
+    peak = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+
+    def submit(self, fn, *args):
+        self.in_flight += 1
+        BoundedExecutor.peak = max(BoundedExecutor.peak, self.in_flight)
+        future = super().submit(fn, *args)
+        original = future.result
+
+        def result(*result_args):
+            self.in_flight -= 1
+            return original(*result_args)
+
+        future.result = result
+        return future
+
+
+@pytest.fixture
+def fake_weasyprint(monkeypatch):
+    FakeHTML.rendered = []
+    FakeHTML.calls = []
+    monkeypatch.setattr(services, "HTML", FakeHTML)
+    monkeypatch.setattr(services, "CSS", lambda *args, **kwargs: None)
+    monkeypatch.setattr(services, "FontConfiguration", lambda: None)
+    monkeypatch.setattr(services, "ProcessPoolExecutor", ThreadPoolExecutor)
+    return FakeHTML
+
+
+@pytest.mark.django_db
+class TestRenderPdfReport:
+    def _context(self, event, rows):
+        return {
+            "event": event,
+            "organization": event.organization,
+            "data": [{"name": f"Guest {i}"} for i in range(rows)],
+            "report_title": "Data",
+        }
+
+    def test_small_report_renders_once(self, event, fake_weasyprint):
+        pdf = services.render_pdf_report(
+            "reports/pdf/generic.html", self._context(event, 3), chunk_size=10
+        )
+        assert len(PdfReader(BytesIO(pdf)).pages) == 1
+        assert len(fake_weasyprint.rendered) == 1
+        assert fake_weasyprint.rendered[0].count("cover-page") == 1
+
+    def test_large_report_is_chunked(self, event, fake_weasyprint):
+        pdf = services.render_pdf_report(
+            "reports/pdf/generic.html", self._context(event, 25), chunk_size=10
+        )
+        assert len(PdfReader(BytesIO(pdf)).pages) == 3
+        assert fake_weasyprint.calls == ["render", "write"] * 3 + ["number"]
+
+        html = "|".join(fake_weasyprint.rendered)
+        assert html.count("cover-page") == 1
+        assert html.count("generated automatically") == 1
+        assert "<td>25</td>" in html
+        assert "<td>26</td>" not in html
+
+    def test_pool_keeps_chunks_in_flight_bounded(
+        self, event, fake_weasyprint, monkeypatch
+    ):
+        monkeypatch.setattr(services, "ProcessPoolExecutor", BoundedExecutor)
+        BoundedExecutor.peak = 0
+        pdf = services.render_pdf_report(
+            "reports/pdf/generic.html",
+            self._context(event, 55),
+            chunk_size=10,
+            workers=2,
+        )
+        assert len(PdfReader(BytesIO(pdf)).pages) == 6
+        assert BoundedExecutor.peak == 2
@@ -5,6 +5,16 @@ app_name = "reports"
 
 urlpatterns = [
     path("", actions.AnalyticsView.as_view(), name="analytics"),
+    path(
+        "org/<slug:org_slug>/analytics/",
+        actions.OrganizationAnalyticsAPIView.as_view(),
+        name="org_analytics_api",
+    ),
+    path(
+        "org/<slug:org_slug>/export/columnar/",
+        actions.OrganizationColumnarExportView.as_view(),
+        name="org_columnar_export",
+    ),
     path(
         "<slug:org_slug>/<slug:event_slug>/",
         actions.ReportsDashboardView.as_view(),
@@ -35,6 +45,16 @@ urlpatterns = [
         actions.SalesTimelineView.as_view(),
         name="sales_timeline",
     ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/sales-timeline/data/",
+        actions.SalesTimelineDataView.as_view(),
+        name="sales_timeline_data",
+    ),
+    path(
+        "<slug:org_slug>/<slug:event_slug>/funnel/",
+        actions.EventFunnelView.as_view(),
+        name="event_funnel",
+    ),
     path(
         "<slug:org_slug>/<slug:event_slug>/attendees/",
         actions.AttendeeListView.as_view(),
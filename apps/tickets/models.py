@@ -5,6 +5,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from apps.core.models import FieldTrackingMixin
 from apps.events.models import Event, CheckoutQuestion
 
 
@@ -59,7 +60,7 @@ class GuestSession(models.Model):
         return timezone.now() > self.expires_at
 
 
-class Booking(models.Model):
+class Booking(FieldTrackingMixin, models.Model):
     class Status(models.TextChoices):
         PENDING = "PENDING", _("Pending Payment")
         CONFIRMED = "CONFIRMED", _("Confirmed")
@@ -104,6 +105,8 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tracked_fields = ("status",)
+
     class Meta:
         indexes = [
             models.Index(fields=["reference"]),
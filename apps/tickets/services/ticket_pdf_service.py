@@ -6,6 +6,8 @@ from django.template.loader import render_to_string
 from weasyprint import CSS, HTML
 from weasyprint.text.fonts import FontConfiguration
 
+from apps.core.services.image_variants import variant_url
+
 _pdf_cache = caches["reports"]
 _SINGLE_TICKET_TTL = 3600
 _BOOKING_PDF_TTL = 3600
@@ -42,8 +44,14 @@ def generate_ticket_pdf(booking, tickets, qr_code_bytes=None):
         "tickets": ticket_data,
         "ticket_count": len(ticket_data),
         "qr_code": qr_code_data_uri,
-        "organization_logo": organization.logo.url if organization.logo else None,
-        "event_image": event.cover_image.url if event.cover_image else None,
+        "organization_logo": variant_url(
+            organization.logo, organization.image_variants.get("logo")
+        )
+        or None,
+        "event_image": variant_url(
+            event.cover_image, event.image_variants.get("cover_image")
+        )
+        or None,
     }
 
     html_content = render_to_string("tickets/ticket_pdf.html", context)
@@ -9,8 +9,10 @@ from decimal import Decimal
 from io import BytesIO
 from weasyprint import HTML, CSS
 from weasyprint.text.fonts import FontConfiguration
+from apps.core.services.image_variants import open_variant
 from apps.tickets.models import TicketType, Booking, Ticket, TicketQuestionAnswer
-from apps.events.models import CouponUsage, CheckoutQuestion, Event
+from apps.events.models import CheckoutQuestion, Event
+from apps.events.services.coupons import claim_coupon, record_coupon_usage
 
 
 def create_booking(user, ticket_type: TicketType, quantity: int):
@@ -124,13 +126,13 @@ def create_multi_ticket_booking(
             total_amount += ticket_type.price * quantity
 
         discount_amount = Decimal("0.00")
+        coupon_email = user.email if user else guest_email
         if coupon and coupon.is_valid:
-            if coupon.discount_type == "PERCENTAGE":
-                discount_amount = total_amount * (
-                    coupon.discount_value / Decimal("100")
-                )
-            else:
-                discount_amount = min(coupon.discount_value, total_amount)
+            discount_amount = coupon.calculate_discount(total_amount)
+            if discount_amount > 0 and not claim_coupon(
+                coupon, event.organization_id, coupon_email
+            ):
+                return None, "This coupon is no longer available."
             total_amount = max(Decimal("0.00"), total_amount - discount_amount)
 
         booking = Booking.objects.create(
@@ -145,13 +147,9 @@ def create_multi_ticket_booking(
         )
 
         if coupon and discount_amount > 0:
-            CouponUsage.objects.create(
-                coupon=coupon,
-                booking=booking,
-                used_by=user,
-                discount_amount=discount_amount,
+            record_coupon_usage(
+                coupon, booking, coupon_email, discount_amount, user=user
             )
-            coupon.use()
 
         if total_amount == Decimal("0.00"):
             booking.status = Booking.Status.CONFIRMED
@@ -208,7 +206,9 @@ def get_organization_logo_base64(organization):
     if not organization.logo:
         return None
     try:
-        with organization.logo.open("rb") as image_file:
+        with open_variant(
+            organization.logo, organization.image_variants.get("logo")
+        ) as image_file:
             return base64.b64encode(image_file.read()).decode()
     except Exception:
         return None
@@ -10,11 +10,12 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.db import transaction
 from django.http import HttpResponse
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils.translation import gettext_lazy as _
 from django.template.loader import render_to_string
 from weasyprint import HTML
 
+from apps.core.utils.pagination import KeysetPaginator, cached_aggregate
 from apps.tickets.models import Ticket, Booking
 from apps.tickets.services import generate_ticket_pdf, generate_booking_tickets_pdf
 from apps.payments.models import Payment, Refund
@@ -71,26 +72,19 @@ class TicketListView(LoginRequiredMixin, View):
         if date_to:
             tickets = tickets.filter(booking__created_at__lte=date_to)
 
-        tickets = tickets.order_by("-booking__created_at")
-
         if export_format:
-            return self._export_tickets(tickets, export_format, request.user)
-
-        tickets = tickets[:100]
-
-        stats = {
-            "total": Ticket.objects.filter(
-                booking__event__organization__members=request.user,
-                booking__status=Booking.Status.CONFIRMED,
-            ).count(),
-            "checked_in": Ticket.objects.filter(
-                booking__event__organization__members=request.user, is_checked_in=True
-            ).count(),
-            "pending": Ticket.objects.filter(
-                booking__event__organization__members=request.user,
-                booking__status=Booking.Status.PENDING,
-            ).count(),
-        }
+            return self._export_tickets(
+                tickets.order_by("-booking__created_at"), export_format, request.user
+            )
+
+        page_obj = KeysetPaginator(tickets, ("-id",), per_page=100).get_page(request)
+
+        stats = cached_aggregate(
+            Ticket.objects.filter(booking__event__organization__members=request.user),
+            total=Count("id", filter=Q(booking__status=Booking.Status.CONFIRMED)),
+            checked_in=Count("id", filter=Q(is_checked_in=True)),
+            pending=Count("id", filter=Q(booking__status=Booking.Status.PENDING)),
+        )
 
         events = (
             request.user.organizations.first().events.all()
@@ -102,7 +96,8 @@ class TicketListView(LoginRequiredMixin, View):
             request,
             "tickets/list.html",
             {
-                "tickets": tickets,
+                "tickets": page_obj.object_list,
+                "page_obj": page_obj,
                 "stats": stats,
                 "events": events,
             },
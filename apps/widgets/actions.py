@@ -6,7 +6,7 @@ from django.utils.decorators import method_decorator
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils.translation import gettext_lazy as _
 from apps.widgets.models import EmbedWidget
-from apps.events.models import Event
+from apps.events.models import Event, EventListing
 
 
 @method_decorator(xframe_options_exempt, name="dispatch")
@@ -65,6 +65,7 @@ class WidgetJSView(View):
 class WidgetConfigView(View):
     def get(self, request, widget_id):
         widget = get_object_or_404(EmbedWidget, widget_id=widget_id)
+        listing = EventListing.objects.filter(event_id=widget.event_id).first()
 
         return JsonResponse(
             {
@@ -75,6 +76,9 @@ class WidgetConfigView(View):
                     else None,
                     "start_at": widget.event.start_at.isoformat(),
                     "location": widget.event.location,
+                    "min_price": float(listing.min_price or 0) if listing else None,
+                    "currency": listing.currency if listing else None,
+                    "availability": listing.availability if listing else None,
                 },
                 "settings": {
                     "theme": widget.theme,
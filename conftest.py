@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import caches
 from django.test import Client
 from django.utils import timezone
 
@@ -68,3 +69,15 @@ def authenticated_client(db, user):
     client = Client()
     client.login(email="test@example.com", password="testpass123")
     return client
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in settings.CACHES
+    }
+    settings.ANALYTICS_METRICS_BUFFER = False
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    return caches
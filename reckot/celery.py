@@ -15,6 +15,30 @@ app.conf.beat_schedule = {
         "task": "apps.payments.tasks.process_expired_payments_task",
         "schedule": 300.0,
     },
+    "flush-metrics-buffer-every-5-seconds": {
+        "task": "apps.analytics.tasks.flush_metrics_buffer_task",
+        "schedule": 5.0,
+    },
+    "consume-funnel-events-every-5-seconds": {
+        "task": "apps.analytics.tasks.consume_funnel_events_task",
+        "schedule": 5.0,
+    },
+    "fold-visitor-counts-every-minute": {
+        "task": "apps.analytics.tasks.fold_visitor_counts_task",
+        "schedule": 60.0,
+    },
+    "refresh-admin-dashboard-every-5-minutes": {
+        "task": "apps.analytics.tasks.refresh_dashboard_snapshot_task",
+        "schedule": 300.0,
+    },
+    "build-attendee-cohorts-nightly": {
+        "task": "apps.analytics.tasks.build_attendee_cohorts_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "refresh-event-listings-every-hour": {
+        "task": "apps.events.tasks.refresh_event_listings_task",
+        "schedule": crontab(minute=15),
+    },
     "cleanup-otps-every-hour": {
         "task": "apps.core.tasks.cleanup_expired_otps_task",
         "schedule": crontab(minute=0),
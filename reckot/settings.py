@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     "django.contrib.sites",
     "django.contrib.sitemaps",
     "django.contrib.humanize",
+    "django.contrib.postgres",
     "allauth",
     "allauth.account",
     "allauth.socialaccount",
@@ -208,6 +209,12 @@ CACHES = {
     },
 }
 
+ANALYTICS_METRICS_BUFFER = os.getenv("ANALYTICS_METRICS_BUFFER", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
 TIME_ZONE = "Africa/Douala"
 
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
@@ -235,10 +242,12 @@ CELERY_TASK_ROUTES = {
     "apps.core.tasks.send_otp_sms_task": {"queue": "emails"},
     "apps.core.tasks.send_otp_verification_task": {"queue": "emails"},
     "apps.core.tasks.send_welcome_email_task": {"queue": "emails"},
+    "apps.core.tasks.generate_image_variants_task": {"queue": "exports"},
     "apps.payments.tasks.*": {"queue": "payments"},
     "apps.reports.tasks.*": {"queue": "exports"},
     "apps.messaging.tasks.*": {"queue": "emails"},
     "apps.tickets.tasks.*": {"queue": "exports"},
+    "apps.events.tasks.render_flyer_task": {"queue": "exports"},
 }
 
 AUTH_PASSWORD_VALIDATORS = [
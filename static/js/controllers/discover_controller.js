@@ -1,65 +1,47 @@
 import { Controller } from "https://unpkg.com/@hotwired/stimulus@3.2.2/dist/stimulus.js"
 
 export default class extends Controller {
-    static targets = ["searchInput", "locationInput", "categoryButton", "dateSelect", "eventsList", "emptyState"]
+    static targets = ["searchInput", "locationInput", "categoryButton", "dateSelect", "eventsList", "emptyState", "loadMore"]
+    static values = { url: String, next: String }
 
     connect() {
         this.searchQuery = '';
         this.locationQuery = '';
         this.selectedCategory = '';
         this.selectedDate = 'all';
-        this.filteredEvents = [];
-        this.allEvents = [];
-        this.categories = [];
+        this.request = null;
 
-        this.loadData();
-        this.filterEvents();
         this.initLucide();
     }
 
-    loadData() {
-        const eventsEl = document.getElementById('events-data');
-        const categoriesEl = document.getElementById('categories-data');
-
-        if (eventsEl && eventsEl.textContent) {
-            try {
-                this.allEvents = JSON.parse(eventsEl.textContent);
-            } catch (error) {
-                this.allEvents = [];
-            }
-        }
-
-        if (categoriesEl && categoriesEl.textContent) {
-            try {
-                this.categories = JSON.parse(categoriesEl.textContent);
-            } catch (error) {
-                this.categories = [];
-            }
-        }
-    }
-
     search(event) {
-        this.searchQuery = event.target.value;
+        this.searchQuery = event.target.value.trim();
         clearTimeout(this.searchTimeout);
-        this.searchTimeout = setTimeout(() => this.filterEvents(), 300);
+        this.searchTimeout = setTimeout(() => this.fetchEvents(), 300);
     }
 
     searchLocation(event) {
-        this.locationQuery = event.target.value;
+        this.locationQuery = event.target.value.trim();
         clearTimeout(this.locationTimeout);
-        this.locationTimeout = setTimeout(() => this.filterEvents(), 300);
+        this.locationTimeout = setTimeout(() => this.fetchEvents(), 300);
     }
 
     selectCategory(event) {
         const slug = event.currentTarget.dataset.slug;
         this.selectedCategory = this.selectedCategory === slug ? '' : slug;
         this.updateCategoryButtons();
-        this.filterEvents();
+        this.fetchEvents();
     }
 
     selectDate(event) {
         this.selectedDate = event.target.value;
-        this.filterEvents();
+        this.fetchEvents();
+    }
+
+    loadMore() {
+        if (this.nextValue) {
+            this.fetchEvents(this.nextValue);
+        }
     }
 
     updateCategoryButtons() {
@@ -77,146 +59,150 @@ export default class extends Controller {
         });
     }
 
-    filterEvents() {
-        let events = [...this.allEvents];
+    buildParams(after) {
+        const params = new URLSearchParams();
+        if (this.searchQuery) params.set('q', this.searchQuery);
+        if (this.locationQuery) params.set('city', this.locationQuery);
+        if (this.selectedCategory) params.set('category', this.selectedCategory);
 
-        if (this.searchQuery) {
-            const query = this.searchQuery.toLowerCase();
-            events = events.filter(e =>
-                e.title.toLowerCase().includes(query) ||
-                (e.description && e.description.toLowerCase().includes(query))
-            );
+        const range = this.dateRange(this.selectedDate);
+        if (range) {
+            params.set('date_from', range[0]);
+            params.set('date_to', range[1]);
         }
+        if (after) params.set('after', after);
+        return params;
+    }
 
-        if (this.locationQuery) {
-            const loc = this.locationQuery.toLowerCase();
-            events = events.filter(e =>
-                (e.location && e.location.toLowerCase().includes(loc)) ||
-                (e.city && e.city.toLowerCase().includes(loc))
-            );
-        }
+    dateRange(dateFilter) {
+        const today = new Date();
+        today.setHours(0, 0, 0, 0);
+
+        switch (dateFilter) {
+            case 'today':
+                return [this.isoDate(today), this.isoDate(today)];
+
+            case 'week': {
+                const dayOfWeek = today.getDay();
+                const daysToMonday = dayOfWeek === 0 ? 6 : dayOfWeek - 1;
+                const startOfWeek = new Date(today);
+                startOfWeek.setDate(today.getDate() - daysToMonday);
+                const endOfWeek = new Date(startOfWeek);
+                endOfWeek.setDate(startOfWeek.getDate() + 6);
+                return [this.isoDate(startOfWeek), this.isoDate(endOfWeek)];
+            }
 
-        if (this.selectedCategory) {
-            events = events.filter(e => e.category_slug === this.selectedCategory);
-        }
+            case 'month': {
+                const startOfMonth = new Date(today.getFullYear(), today.getMonth(), 1);
+                const endOfMonth = new Date(today.getFullYear(), today.getMonth() + 1, 0);
+                return [this.isoDate(startOfMonth), this.isoDate(endOfMonth)];
+            }
 
-        if (this.selectedDate !== 'all') {
-            events = this.filterByDate(events, this.selectedDate);
+            default:
+                return null;
         }
-
-        this.filteredEvents = events;
-        this.renderEvents();
     }
 
-    filterByDate(events, dateFilter) {
-        const now = new Date();
-        now.setHours(0, 0, 0, 0);
-
-        return events.filter(e => {
-            const eventDate = new Date(e.start_at);
-            eventDate.setHours(0, 0, 0, 0);
-
-            switch (dateFilter) {
-                case 'today':
-                    return eventDate.getTime() === now.getTime();
-
-                case 'week':
-                    const dayOfWeek = now.getDay();
-                    const daysToMonday = dayOfWeek === 0 ? 6 : dayOfWeek - 1;
-                    const startOfWeek = new Date(now);
-                    startOfWeek.setDate(now.getDate() - daysToMonday);
-                    const endOfWeek = new Date(startOfWeek);
-                    endOfWeek.setDate(startOfWeek.getDate() + 6);
-                    endOfWeek.setHours(23, 59, 59, 999);
-                    return eventDate >= startOfWeek && eventDate <= endOfWeek;
-
-                case 'month':
-                    const startOfMonth = new Date(now.getFullYear(), now.getMonth(), 1);
-                    const endOfMonth = new Date(now.getFullYear(), now.getMonth() + 1, 0);
-                    endOfMonth.setHours(23, 59, 59, 999);
-                    return eventDate >= startOfMonth && eventDate <= endOfMonth;
-
-                default:
-                    return true;
-            }
-        });
+    isoDate(date) {
+        const month = String(date.getMonth() + 1).padStart(2, '0');
+        const day = String(date.getDate()).padStart(2, '0');
+        return `${date.getFullYear()}-${month}-${day}`;
     }
 
-    getEventStatus(event) {
-        const now = new Date();
-        const startAt = new Date(event.start_at);
-        const endAt = new Date(event.end_at);
-
-        if (now >= startAt && now <= endAt) {
-            return {
-                status: 'live',
-                label: 'Live Now',
-                class: 'badge badge-danger animate-pulse'
-            };
-        }
-
-        if (now > endAt) {
-            return {
-                status: 'passed',
-                label: 'Ended',
-                class: 'badge badge-default'
-            };
+    async fetchEvents(after = null) {
+        if (this.request) this.request.abort();
+        this.request = new AbortController();
+
+        try {
+            const response = await fetch(`${this.urlValue}?${this.buildParams(after)}`, {
+                headers: { 'Accept': 'application/json' },
+                signal: this.request.signal,
+            });
+            if (!response.ok) return;
+            const data = await response.json();
+            this.renderEvents(data, Boolean(after));
+        } catch (error) {
+            if (error.name !== 'AbortError') throw error;
         }
-
-        const diff = startAt - now;
-        const minutes = Math.floor(diff / 60000);
-        const hours = Math.floor(minutes / 60);
-        const days = Math.floor(hours / 24);
-        const months = Math.floor(days / 30);
-
-        let timeLabel;
-        if (months > 0) {
-            timeLabel = months === 1 ? 'in 1 month' : `in ${months} months`;
-        } else if (days > 0) {
-            timeLabel = days === 1 ? 'in 1 day' : `in ${days} days`;
-        } else if (hours > 0) {
-            timeLabel = hours === 1 ? 'in 1 hour' : `in ${hours} hours`;
-        } else {
-            timeLabel = minutes === 1 ? 'in 1 minute' : `in ${minutes} minutes`;
-        }
-
-        return {
-            status: 'upcoming',
-            label: timeLabel,
-            class: 'badge badge-success'
-        };
     }
 
-    renderEvents() {
+    renderEvents(data, append) {
         if (!this.hasEventsListTarget) return;
 
-        const eventCount = this.filteredEvents.length;
         const countEl = this.element.querySelector('[data-discover-count]');
         if (countEl) {
-            countEl.textContent = eventCount;
+            countEl.textContent = data.total;
         }
 
-        const cards = this.eventsListTarget.querySelectorAll('[data-event-id]');
-        let visibleCount = 0;
-
-        cards.forEach(card => {
-            const eventId = parseInt(card.dataset.eventId);
-            const isVisible = this.filteredEvents.some(e => e.id === eventId);
-            card.classList.toggle('hidden', !isVisible);
-            if (isVisible) visibleCount++;
-        });
-
-        if (this.hasEventsListTarget) {
-            this.eventsListTarget.classList.toggle('hidden', visibleCount === 0);
+        const html = data.results.map(event => this.cardHtml(event)).join('');
+        if (append) {
+            this.eventsListTarget.insertAdjacentHTML('beforeend', html);
+        } else {
+            this.eventsListTarget.innerHTML = html;
         }
 
+        this.nextValue = data.next || '';
+        const visibleCount = this.eventsListTarget.children.length;
+
+        this.eventsListTarget.classList.toggle('hidden', visibleCount === 0);
         if (this.hasEmptyStateTarget) {
             this.emptyStateTarget.classList.toggle('hidden', visibleCount > 0);
         }
+        if (this.hasLoadMoreTarget) {
+            this.loadMoreTarget.classList.toggle('hidden', !this.nextValue);
+        }
 
         this.initLucide();
     }
 
+    cardHtml(event) {
+        const escape = value => String(value ?? '').replace(/[&<>"']/g, char => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[char]);
+
+        const sizes = '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw';
+        const sources = (event.cover_sources || []).map(source => `
+                    <source type="${escape(source.type)}" srcset="${escape(source.srcset)}" sizes="${sizes}">`).join('');
+        const srcset = event.cover_srcset ? ` srcset="${escape(event.cover_srcset)}" sizes="${sizes}"` : '';
+        const cover = event.cover_image ? `
+            <div class="w-full h-48 overflow-hidden rounded-t-xl">
+                <picture class="contents">${sources}
+                    <img src="${escape(event.cover_image)}"${srcset} alt="${escape(event.title)}" class="w-full h-full object-cover" loading="lazy">
+                </picture>
+            </div>` : '';
+        const category = event.category_name ? `
+            <div class="badge badge-default"><span>${escape(event.category_name)}</span></div>` : '';
+        let price = '';
+        if (event.min_price > 0) {
+            price = `<span class="text-sm font-semibold text-foreground">${escape(event.min_price)} XAF</span>`;
+        } else if (event.is_free) {
+            price = `<span class="text-sm font-semibold text-success">Free</span>`;
+        }
+
+        return `
+            <a href="${escape(event.url)}" class="card hover:shadow-lg transition-shadow no-underline" data-event-id="${event.id}">
+                ${cover}
+                <div class="p-6">
+                    <div class="flex items-start justify-between mb-3">
+                        <div class="flex gap-2 flex-wrap">${category}</div>
+                        ${price}
+                    </div>
+                    <h3 class="font-semibold text-lg mb-2 text-foreground">${escape(event.title)}</h3>
+                    <div class="text-sm text-muted-foreground mb-4 line-clamp-2">${event.headline || escape(event.short_description)}</div>
+                    <div class="flex items-center gap-4 text-sm text-muted-foreground">
+                        <span class="flex items-center gap-1">
+                            <i data-lucide="clock" class="w-4 h-4"></i>
+                            <span>${escape(event.date_formatted)}</span>
+                        </span>
+                        <span class="flex items-center gap-1">
+                            <i data-lucide="map-pin" class="w-4 h-4"></i>
+                            <span>${escape(event.location_short)}</span>
+                        </span>
+                    </div>
+                </div>
+            </a>`;
+    }
+
     initLucide() {
         requestAnimationFrame(() => {
             if (typeof lucide !== 'undefined') {
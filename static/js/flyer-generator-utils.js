@@ -69,3 +69,18 @@ window.shareFlyer = function () {
     const text = document.querySelector('[data-share-text]')?.dataset.shareText || 'Check out my flyer!';
     return window.FlyerGeneratorUtils.shareFlyer(null, eventSlug, title, text);
 };
+
+document.addEventListener('htmx:beforeRequest', function (event) {
+    if (event.detail.elt.id === 'flyer-form') {
+        window.hideGenerationError();
+    }
+});
+
+document.addEventListener('htmx:responseError', function (event) {
+    if (event.detail.elt.id !== 'flyer-form') return;
+    let message = window.FlyerGeneratorTranslations?.generationFailed || 'Could not generate your flyer. Please try again.';
+    try {
+        message = JSON.parse(event.detail.xhr.responseText).error || message;
+    } catch (error) { }
+    window.showGenerationError(message);
+});